@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ClientesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.clientes'
+
+    def ready(self):
+        from backend.cache import conectar_invalidacion
+        from .models import Cliente
+        conectar_invalidacion(Cliente)
@@ -0,0 +1,198 @@
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, CharField, FloatField, Func, Q, Value, When
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains, Exact
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from backend.cache import versiones
+from .models import Cliente
+
+# Fracción de trigramas del término que deben coincidir en el índice en memoria
+UMBRAL_COINCIDENCIA = 0.6
+
+_extension_trigramas = {}
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Pérez' y 'perez' se buscan igual."""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def trigramas(texto, relleno=True):
+    texto = f' {texto} ' if relleno else texto
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def usa_pg_trgm(alias):
+    """
+    True si la base es PostgreSQL con pg_trgm y la función clientes_normalizar()
+    (unaccent), que crean las migraciones 0002 y 0003.
+    """
+    if alias not in _extension_trigramas:
+        conexion = connections[alias]
+        instalada = False
+        if conexion.vendor == 'postgresql':
+            with conexion.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm' "
+                    "AND EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'clientes_normalizar')"
+                )
+                instalada = cursor.fetchone() is not None
+        _extension_trigramas[alias] = instalada
+    return _extension_trigramas[alias]
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido trigrama -> ids de cliente, para bases sin pg_trgm (SQLite
+    en desarrollo y pruebas). Se reconstruye cuando cambia la versión de Cliente
+    que mantienen las señales de backend/cache.py. Sin una caché compartida esa
+    versión solo ve las escrituras de este proceso, así que además se recarga
+    cada BUSQUEDA_INDICE_TTL segundos.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.cargado_en = None
+        self.datos = ({}, {})  # (índice, textos), se reemplazan juntos
+        self._lock = threading.Lock()
+
+    def cargar(self):
+        indice, textos = {}, {}
+        filas = Cliente.objects.values_list('id', 'nombre', 'documento', 'email', 'telefono')
+        for id_, *campos in filas.iterator(chunk_size=5000):
+            campos = [normalizar(c) for c in campos]
+            textos[id_] = campos
+            for campo in campos:
+                for trigrama in trigramas(campo):
+                    indice.setdefault(trigrama, []).append(id_)
+        return indice, textos
+
+    def vencido(self, version):
+        if self.cargado_en is None or version != self.version:
+            return True
+        if getattr(settings, 'CACHE_COMPARTIDA', False):
+            return False
+        ttl = getattr(settings, 'BUSQUEDA_INDICE_TTL', 60)
+        return bool(ttl) and time.monotonic() - self.cargado_en > ttl
+
+    def actualizar(self):
+        [version] = versiones(Cliente)
+        if not self.vencido(version):
+            return
+        # Reconstruye una sola petición; mientras tanto las demás buscan en el
+        # índice anterior en lugar de esperar (solo la primera carga bloquea)
+        if not self._lock.acquire(blocking=self.cargado_en is None):
+            return
+        try:
+            if self.vencido(version):
+                self.datos = self.cargar()
+                self.version, self.cargado_en = version, time.monotonic()
+        finally:
+            self._lock.release()
+
+    def buscar(self, termino, limite):
+        """Devuelve [(id, puntaje)] de mayor a menor puntaje, como máximo `limite`."""
+        self.actualizar()
+        indice, textos = self.datos
+        termino = normalizar(termino)
+        buscados = trigramas(termino, relleno=False)
+        conteo = Counter()
+        for trigrama in buscados:
+            # Un id cuenta una vez por trigrama aunque aparezca en varios campos
+            conteo.update(set(indice.get(trigrama, ())))
+
+        minimo = UMBRAL_COINCIDENCIA * len(buscados)
+        resultados = []
+        for id_, coincidencias in conteo.items():
+            if coincidencias < minimo:
+                continue
+            puntaje = coincidencias / len(buscados)
+            campos = textos[id_]
+            if termino in campos:
+                puntaje += 1
+            elif any(palabra.startswith(termino) for c in campos for palabra in c.split()):
+                puntaje += 0.5
+            resultados.append((id_, round(puntaje, 4)))
+        resultados.sort(key=lambda r: (-r[1], r[0]))
+        return resultados[:limite]
+
+
+indice = IndiceTrigramas()
+
+
+class Normalizado(Func):
+    """clientes_normalizar() de la migración 0003: lo mismo que normalizar() en PostgreSQL."""
+    function = 'clientes_normalizar'
+    output_field = CharField()
+
+
+def _buscar_postgres(queryset, termino):
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # Cada condición usa un índice: GIN de trigramas (nombre normalizado, email en
+    # minúsculas, teléfono) o el índice *_like que Django crea para el documento único
+    nombre, email = normalizar(termino), termino.lower()
+    coincide = (
+        TrigramWordSimilar(Normalizado('nombre'), Value(nombre))
+        | Contains(Lower('email'), email)
+        | Q(telefono__contains=termino)
+        | Q(documento__startswith=termino)
+    )
+    rango = Case(
+        When(Q(documento=termino) | Exact(Lower('email'), email) | Q(telefono=termino), then=Value(2.0)),
+        default=TrigramWordSimilarity(nombre, Normalizado('nombre')),
+        output_field=FloatField()
+    )
+    return queryset.filter(coincide).annotate(rango=rango).order_by('-rango', 'id')
+
+
+def _buscar_indice(queryset, termino):
+    limite = getattr(settings, 'BUSQUEDA_CLIENTES_MAXIMO', 200)
+    resultados = indice.buscar(termino, limite)
+    if not resultados:
+        return queryset.none()
+    rango = Case(*(When(id=id_, then=Value(p)) for id_, p in resultados), output_field=FloatField())
+    return queryset.filter(id__in=[id_ for id_, _ in resultados]).annotate(rango=rango).order_by('-rango', 'id')
+
+
+def buscar_clientes(queryset, termino):
+    """Filtra y ordena por relevancia (`rango`) los clientes que coinciden con el término."""
+    termino = ' '.join(termino.split())[:100]
+    if len(termino) < 3:
+        # Muy corto para trigramas: solo prefijos
+        return queryset.filter(
+            Q(nombre__istartswith=termino) | Q(documento__startswith=termino) | Q(telefono__startswith=termino)
+        )
+    if usa_pg_trgm(queryset.db):
+        return _buscar_postgres(queryset, termino)
+    return _buscar_indice(queryset, termino)
+
+
+class BusquedaClientesFilter(filters.BaseFilterBackend):
+    """
+    ?search= para clientes: por nombre (tolerante a errores de tipeo), documento,
+    email o teléfono, ordenado por relevancia.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        termino = request.query_params.get(self.search_param, '')
+        if not termino.strip():
+            return queryset
+        return buscar_clientes(queryset, termino)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param, 'required': False, 'in': 'query',
+            'description': 'Nombre, documento, email o teléfono', 'schema': {'type': 'string'},
+        }]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Índices GIN de trigramas para la búsqueda de clientes (app/clientes/busqueda.py).
+# Solo en PostgreSQL con pg_trgm disponible; en otro caso se usa el índice en memoria.
+
+INDICES = {
+    'cliente_nombre_trgm_idx': 'nombre',
+    'cliente_email_trgm_idx': 'email',
+    'cliente_telefono_trgm_idx': 'telefono',
+}
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for nombre, columna in INDICES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON clientes_cliente USING gin ({columna} gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
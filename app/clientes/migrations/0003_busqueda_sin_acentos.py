@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# La búsqueda en PostgreSQL compara como normalizar() en app/clientes/busqueda.py:
+# el nombre en minúsculas y sin acentos (unaccent) y el email en minúsculas. Los
+# índices de trigramas pasan a ser sobre esas expresiones. unaccent() no es
+# IMMUTABLE, así que se envuelve en una función que sí lo es para poder indexarla.
+
+INDICES = {
+    'cliente_nombre_norm_trgm_idx': 'clientes_normalizar(nombre)',
+    'cliente_email_lower_trgm_idx': 'lower(email)',
+}
+ANTERIORES = {
+    'cliente_nombre_trgm_idx': 'nombre',
+    'cliente_email_trgm_idx': 'email',
+}
+
+
+def _instalada(cursor, extension):
+    cursor.execute('SELECT extnamespace::regnamespace::text FROM pg_extension WHERE extname = %s', [extension])
+    fila = cursor.fetchone()
+    return fila[0] if fila else None
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if _instalada(cursor, 'pg_trgm') is None:
+            return
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    with schema_editor.connection.cursor() as cursor:
+        esquema = _instalada(cursor, 'unaccent')
+    schema_editor.execute(
+        'CREATE OR REPLACE FUNCTION clientes_normalizar(text) RETURNS text AS '
+        f"$$ SELECT lower({esquema}.unaccent('{esquema}.unaccent'::regdictionary, $1)) $$ "
+        'LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE'
+    )
+    for nombre in ANTERIORES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+    for nombre, expresion in INDICES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON clientes_cliente USING gin ({expresion} gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+    schema_editor.execute('DROP FUNCTION IF EXISTS clientes_normalizar(text)')
+    with schema_editor.connection.cursor() as cursor:
+        if _instalada(cursor, 'pg_trgm') is None:
+            return
+    for nombre, columna in ANTERIORES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON clientes_cliente USING gin ({columna} gin_trgm_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_busqueda_trigramas'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -5,3 +5,15 @@ class ClienteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Cliente
         fields = '__all__'
+
+
+class ClienteCargaMasivaSerializer(ClienteSerializer):
+    """
+    Sin los validadores de unicidad: en la carga masiva los conflictos de
+    documento/email se resuelven por lote en ClienteViewSet.resolver_lote.
+    """
+    class Meta(ClienteSerializer.Meta):
+        extra_kwargs = {
+            'documento': {'validators': []},
+            'email': {'validators': []},
+        }
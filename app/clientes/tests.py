@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -158,3 +159,162 @@ class ClienteAPITestCase(APITestCase):
         response = self.client.get(f"{self.url_base}?search=5551234")
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['documento'], '12345678')
+
+
+class ClienteCargaMasivaTestCase(APITestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(username='admin', password='adminpass', rol='administrador')
+        self.client.force_authenticate(user=self.admin)
+        self.existente = Cliente.objects.create(
+            nombre='Juan Pérez', documento='12345678', email='juan@example.com', telefono='5551234'
+        )
+
+    def test_carga_json_con_errores_por_fila(self):
+        filas = [
+            {'nombre': 'Ana', 'documento': '1', 'email': 'ana@example.com', 'telefono': '1'},
+            {'nombre': 'Sin email', 'documento': '2', 'telefono': '2'},
+            {'nombre': 'Juan Nuevo', 'documento': '12345678', 'email': 'juan@example.com', 'telefono': '3'},
+            {'nombre': 'Roba email', 'documento': '4', 'email': 'juan@example.com', 'telefono': '4'},
+            {'nombre': 'Ana otra vez', 'documento': '1', 'email': 'ana2@example.com', 'telefono': '5'},
+        ]
+        response = self.client.post('/api/clientes/bulk/', filas, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['creados'], 1)
+        self.assertEqual([e['fila'] for e in response.data['errores']], [1, 2, 3, 4])
+        self.assertIn('email', response.data['errores'][0]['errores'])
+
+        # Con conflicto=actualizar el documento existente se modifica
+        response = self.client.post('/api/clientes/bulk/?conflicto=actualizar', filas[2:3], format='json')
+        self.assertEqual(response.data['actualizados'], 1)
+        self.existente.refresh_from_db()
+        self.assertEqual(self.existente.nombre, 'Juan Nuevo')
+
+    def test_carga_ndjson_por_lotes(self):
+        import json
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        cuerpo = '\n'.join(json.dumps({
+            'nombre': f'Cliente {i}', 'documento': f'doc-{i}', 'email': f'c{i}@example.com', 'telefono': str(i)
+        }) for i in range(2500))
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/api/clientes/bulk/', cuerpo, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['creados'], 2500)
+        self.assertEqual(Cliente.objects.count(), 2501)
+        self.assertLess(len(consultas), 30)
+
+        response = self.client.post('/api/clientes/bulk/', {'nombre': 'no es lista'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_carga_ndjson_excedida_se_corta_al_leer(self):
+        cuerpo = '\n'.join(f'{{"nombre": "C{i}", "documento": "x{i}"}}' for i in range(10))
+        with self.settings(CARGA_MASIVA_MAXIMO=3):
+            response = self.client.post('/api/clientes/bulk/', cuerpo, content_type='application/x-ndjson')
+        # Lo corta el parser (ParseError -> 'detail'), no la vista después de leerlo todo
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('como máximo 3 filas', response.data['detail'])
+        self.assertEqual(Cliente.objects.count(), 1)
+
+
+class ClienteBusquedaTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.ana = Cliente.objects.create(nombre='Ana Pérez', documento='1001', email='ana@example.com', telefono='5550001')
+        self.mariana = Cliente.objects.create(nombre='Mariana López', documento='1002', email='mlopez@example.com', telefono='5550002')
+        Cliente.objects.create(nombre='Carlos Ruiz', documento='1003', email='carlos@example.com', telefono='5550003')
+
+    def buscar(self, termino):
+        response = self.client.get('/api/clientes/', {'search': termino})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [c['id'] for c in response.data]
+
+    def test_ordena_por_relevancia(self):
+        # 'Ana' empieza una palabra en Ana Pérez y solo aparece dentro de Mariana
+        self.assertEqual(self.buscar('ana'), [self.ana.id, self.mariana.id])
+        self.assertEqual(self.buscar('perez'), [self.ana.id])
+        self.assertEqual(self.buscar('1002'), [self.mariana.id])
+        self.assertEqual(self.buscar('zzzz'), [])
+
+    def test_tolera_errores_de_tipeo_y_ve_cambios(self):
+        self.assertEqual(self.buscar('Mariena Lopez'), [self.mariana.id])
+        self.mariana.delete()
+        nueva = Cliente.objects.create(nombre='Marina Sosa', documento='2001', email='ms@example.com', telefono='1')
+        self.assertEqual(self.buscar('marina'), [nueva.id])
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'hotel'},
+        'otro_worker': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'otro-worker'},
+    })
+    def test_ve_clientes_creados_en_otro_worker(self):
+        import time
+        from unittest import mock
+        from backend.cache import invalidar
+
+        self.buscar('carlos')
+        # Otro worker con su propia caché (locmem): su señal no llega a esta versión
+        with self.settings(RESPUESTAS_CACHE_ALIAS='otro_worker'):
+            nueva = Cliente.objects.create(nombre='Rosaura Vidal', documento='4001', email='rv@example.com', telefono='4')
+        self.assertNotIn(nueva.id, self.buscar('rosaura vidal'))
+        with mock.patch('app.clientes.busqueda.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertEqual(self.buscar('rosaura vidal'), [nueva.id])
+
+        # Con caché compartida no hay recarga periódica: basta la versión que incrementa el otro worker
+        with self.settings(CACHE_COMPARTIDA=True):
+            [otra] = Cliente.objects.bulk_create([
+                Cliente(nombre='Teodora Quiroga', documento='4002', email='tq@example.com', telefono='5')
+            ])
+            self.assertNotIn(otra.id, self.buscar('teodora quiroga'))
+            invalidar(Cliente)
+            self.assertEqual(self.buscar('teodora quiroga'), [otra.id])
+
+
+class ClienteBusquedaMayusculasYAcentosTestCase(APITestCase):
+    terminos = ('perez', 'PÉREZ', 'Jose Perez', 'juan@mail.com', 'JUAN@MAIL')
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.jose = Cliente.objects.create(nombre='José Pérez', documento='3001', email='jose@example.com', telefono='1')
+        self.juan = Cliente.objects.create(nombre='Juan Gómez', documento='3002', email='Juan@Mail.com', telefono='2')
+
+    def test_ignora_mayusculas_y_acentos(self):
+        for termino, esperado in zip(self.terminos, (self.jose, self.jose, self.jose, self.juan, self.juan)):
+            response = self.client.get('/api/clientes/', {'search': termino})
+            self.assertEqual([c['id'] for c in response.data], [esperado.id], termino)
+
+    def test_postgres_coincide_con_el_indice_en_memoria(self):
+        from .busqueda import _buscar_indice, _buscar_postgres, usa_pg_trgm
+
+        if not usa_pg_trgm('default'):
+            self.skipTest('Requiere PostgreSQL con pg_trgm y unaccent')
+        for termino in self.terminos:
+            self.assertEqual(
+                set(_buscar_postgres(Cliente.objects.all(), termino).values_list('id', flat=True)),
+                set(_buscar_indice(Cliente.objects.all(), termino).values_list('id', flat=True)),
+                termino
+            )
+
+
+class ClienteCamposTestCase(APITestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(username='admin', password='adminpass', rol='administrador')
+        self.client.force_authenticate(user=self.admin)
+        self.cliente = Cliente.objects.create(
+            nombre='Juan Pérez', documento='12345678', email='juan@example.com', telefono='5551234'
+        )
+
+    def test_listado_y_detalle_con_campos_pedidos(self):
+        response = self.client.get('/api/clientes/?fields=id,nombre')
+        self.assertEqual(response.data, [{'id': self.cliente.id, 'nombre': 'Juan Pérez'}])
+
+        response = self.client.get(f'/api/clientes/{self.cliente.id}/?exclude=email,telefono')
+        self.assertEqual(set(response.data), {'id', 'nombre', 'documento'})
+
+    def test_escrituras_ignoran_los_campos(self):
+        response = self.client.patch(
+            f'/api/clientes/{self.cliente.id}/?fields=id', {'telefono': '1'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['telefono'], '1')
@@ -1,16 +1,64 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets
 from .models import Cliente
-from .serializers import ClienteSerializer
+from .serializers import ClienteSerializer, ClienteCargaMasivaSerializer
 from drf_spectacular.utils import extend_schema
+from backend.campos import CamposMixin
+from backend.carga_masiva import CargaMasivaMixin
+from backend.cache import cache_respuesta
+from backend.condicional import CondicionalMixin
+from .busqueda import BusquedaClientesFilter
 
 @extend_schema(tags=['Clientes'])
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(CondicionalMixin, CamposMixin, CargaMasivaMixin, viewsets.ModelViewSet):
     """
     API para gestionar clientes: crear, listar, editar, eliminar.
     """
     queryset = Cliente.objects.all().order_by('nombre')
     serializer_class = ClienteSerializer
+    bulk_serializer_class = ClienteCargaMasivaSerializer
 
-    # Permitir búsqueda por nombre, documento, email o teléfono
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['nombre', 'documento', 'email', 'telefono']
+    # Permitir búsqueda por nombre, documento, email o teléfono (ordenada por relevancia)
+    filter_backends = [BusquedaClientesFilter]
+
+    @cache_respuesta(Cliente)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def resolver_lote(self, validas, resultado):
+        """
+        El documento identifica al cliente en la carga masiva. Si ya existe,
+        ?conflicto=actualizar lo modifica, ?conflicto=omitir lo salta y por
+        defecto se informa como error. Un email de otro cliente siempre es error.
+        """
+        conflicto = self.request.query_params.get('conflicto', 'error')
+        documentos = {datos['documento'] for _, _, datos in validas}
+        emails = {datos['email'] for _, _, datos in validas}
+        por_documento = Cliente.objects.in_bulk(documentos, field_name='documento')
+        duenos_email = dict(Cliente.objects.filter(email__in=emails).values_list('email', 'documento'))
+
+        nuevos, actualizados = [], []
+        vistos_documento, vistos_email = set(), set()
+        for fila, _, datos in validas:
+            documento, email = datos['documento'], datos['email']
+            error = None
+            if documento in vistos_documento or email in vistos_email:
+                error = {'non_field_errors': ['Documento o email repetido dentro de la carga.']}
+            elif duenos_email.get(email, documento) != documento:
+                error = {'email': ['Ya existe un cliente con este email.']}
+            elif documento in por_documento and conflicto not in ('actualizar', 'omitir'):
+                error = {'documento': ['Ya existe un cliente con este documento.']}
+            vistos_documento.add(documento)
+            vistos_email.add(email)
+
+            if error:
+                resultado['errores'].append({'fila': fila, 'errores': error})
+            elif documento not in por_documento:
+                nuevos.append(Cliente(**datos))
+            elif conflicto == 'omitir':
+                resultado['omitidos'] += 1
+            else:
+                existente = por_documento[documento]
+                for campo, valor in datos.items():
+                    setattr(existente, campo, valor)
+                actualizados.append(existente)
+        return nuevos, actualizados, ['nombre', 'email', 'telefono']
@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import Habitacion
+from .models import Habitacion, EstadoHabitacion
 
 admin.site.register(Habitacion)
+admin.site.register(EstadoHabitacion)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 class HabitacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.habitaciones'
+
+    def ready(self):
+        from backend.cache import conectar_invalidacion
+        from .models import Habitacion
+        from . import signals  # noqa: F401
+        conectar_invalidacion(Habitacion)
@@ -0,0 +1,251 @@
+import bisect
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from backend.cache import versiones
+
+logger = logging.getLogger(__name__)
+
+ESTADOS_VIVOS = ('pendiente', 'activa')
+
+
+def _max_acumulado(fines):
+    maximos = []
+    actual = None
+    for fin in fines:
+        actual = fin if actual is None or fin > actual else actual
+        maximos.append(actual)
+    return maximos
+
+
+class MotorDisponibilidad:
+    """
+    Índice en memoria de los intervalos reservados (pendiente/activa) por habitación.
+
+    Cada habitación guarda sus reservas ordenadas por fecha de inicio junto con
+    el máximo acumulado de las fechas de fin, de modo que saber si un rango está
+    libre cuesta una búsqueda binaria en lugar de recorrer la tabla de reservas.
+
+    Las reservas de este proceso se aplican al confirmarse (registrar/liberar).
+    Las de otros workers se ven al recargar: con una caché compartida
+    (CACHE_COMPARTIDA) en cuanto cambia la versión de Reserva de
+    backend/cache.py; sin ella, al vencer el TTL.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._habitaciones = {}  # habitacion_id -> (inicios, max_fines, [(inicio, fin, reserva_id)])
+        self._reservas = {}  # reserva_id -> (habitacion_id, inicio, fin)
+        self._cargado_en = None
+        self._version = None
+
+    @property
+    def cargado(self):
+        return self._cargado_en is not None
+
+    def _version_actual(self):
+        """Versión de Reserva en la caché compartida, o None si la caché es por proceso."""
+        if not getattr(settings, 'CACHE_COMPARTIDA', False):
+            return None
+        from app.reservas.models import Reserva
+
+        return versiones(Reserva)[0]
+
+    def _expirado(self):
+        if not self.cargado:
+            return True
+        version = self._version_actual()
+        if version is not None and version != self._version:
+            return True
+        ttl = self.ttl if self.ttl is not None else getattr(settings, 'DISPONIBILIDAD_TTL', 300)
+        return bool(ttl) and time.monotonic() - self._cargado_en > ttl
+
+    def _leer_bd(self):
+        from app.reservas.models import Reserva
+
+        return Reserva.objects.filter(estado__in=ESTADOS_VIVOS).values_list(
+            'id', 'habitacion_id', 'fecha_inicio', 'fecha_fin'
+        )
+
+    def cargar(self):
+        """Reconstruye el índice completo a partir de la base de datos."""
+        # La versión se lee antes que la base: una escritura intermedia fuerza otra recarga
+        version = self._version_actual()
+        por_habitacion = {}
+        reservas = {}
+        for reserva_id, habitacion_id, inicio, fin in self._leer_bd():
+            por_habitacion.setdefault(habitacion_id, []).append((inicio, fin, reserva_id))
+            reservas[reserva_id] = (habitacion_id, inicio, fin)
+
+        habitaciones = {h: self._indexar(intervalos) for h, intervalos in por_habitacion.items()}
+        with self._lock:
+            self._habitaciones = habitaciones
+            self._reservas = reservas
+            self._cargado_en = time.monotonic()
+            self._version = version
+
+    def invalidar(self):
+        with self._lock:
+            self._habitaciones = {}
+            self._reservas = {}
+            self._cargado_en = None
+
+    def _indexar(self, intervalos):
+        intervalos = sorted(intervalos)
+        inicios = [i[0] for i in intervalos]
+        return inicios, _max_acumulado([i[1] for i in intervalos]), intervalos
+
+    def _asegurar_vigente(self):
+        if not self._expirado():
+            return
+        if self.cargado:
+            diferencias = self.verificar()
+            if any(diferencias.values()):
+                logger.warning('Motor de disponibilidad desincronizado: %s', diferencias)
+        self.cargar()
+
+    # Actualizaciones incrementales
+
+    def registrar(self, reserva):
+        """Agrega o actualiza una reserva; si dejó de estar viva se libera."""
+        if not self.cargado:
+            return
+        if reserva.estado not in ESTADOS_VIVOS:
+            self.liberar(reserva.id)
+            return
+        with self._lock:
+            self._quitar(reserva.id)
+            self._reservas[reserva.id] = (reserva.habitacion_id, reserva.fecha_inicio, reserva.fecha_fin)
+            _, _, intervalos = self._habitaciones.get(reserva.habitacion_id, ((), (), []))
+            nuevos = list(intervalos) + [(reserva.fecha_inicio, reserva.fecha_fin, reserva.id)]
+            self._habitaciones[reserva.habitacion_id] = self._indexar(nuevos)
+
+    def liberar(self, reserva_id):
+        if not self.cargado:
+            return
+        with self._lock:
+            self._quitar(reserva_id)
+
+    def _quitar(self, reserva_id):
+        datos = self._reservas.pop(reserva_id, None)
+        if datos is None:
+            return
+        habitacion_id = datos[0]
+        _, _, intervalos = self._habitaciones[habitacion_id]
+        restantes = [i for i in intervalos if i[2] != reserva_id]
+        if restantes:
+            self._habitaciones[habitacion_id] = self._indexar(restantes)
+        else:
+            del self._habitaciones[habitacion_id]
+
+    # Consultas
+
+    def esta_libre(self, habitacion_id, fecha_inicio, fecha_fin):
+        self._asegurar_vigente()
+        indice = self._habitaciones.get(habitacion_id)
+        return indice is None or not self._solapa(indice, fecha_inicio, fecha_fin)
+
+    def habitaciones_ocupadas(self, fecha_inicio, fecha_fin):
+        """IDs de habitaciones con alguna reserva viva que se solapa con [inicio, fin)."""
+        self._asegurar_vigente()
+        return {
+            habitacion_id
+            for habitacion_id, indice in list(self._habitaciones.items())
+            if self._solapa(indice, fecha_inicio, fecha_fin)
+        }
+
+    @staticmethod
+    def _solapa(indice, fecha_inicio, fecha_fin):
+        inicios, max_fines, _ = indice
+        # Reservas que empiezan antes del fin del rango; basta con que la que
+        # termina más tarde de ellas termine después del inicio del rango.
+        pos = bisect.bisect_left(inicios, fecha_fin)
+        return pos > 0 and max_fines[pos - 1] > fecha_inicio
+
+    # Verificación
+
+    def verificar(self):
+        """Compara el índice con la base de datos y devuelve las diferencias."""
+        en_bd = {r[0]: (r[1], r[2], r[3]) for r in self._leer_bd()}
+        en_memoria = dict(self._reservas)
+        return {
+            'faltantes': sorted(set(en_bd) - set(en_memoria)),
+            'sobrantes': sorted(set(en_memoria) - set(en_bd)),
+            'distintas': sorted(r for r in set(en_bd) & set(en_memoria) if en_bd[r] != en_memoria[r]),
+        }
+
+
+motor = MotorDisponibilidad()
+
+
+def habitaciones_ocupadas(fecha_inicio, fecha_fin):
+    """
+    IDs de habitaciones ocupadas en el rango. Usa el motor en memoria si está
+    habilitado (DISPONIBILIDAD_EN_MEMORIA) y recurre a la base de datos si no.
+    """
+    if getattr(settings, 'DISPONIBILIDAD_EN_MEMORIA', False):
+        try:
+            return motor.habitaciones_ocupadas(fecha_inicio, fecha_fin)
+        except Exception:
+            logger.exception('Fallo el motor de disponibilidad; se consulta la base de datos')
+            motor.invalidar()
+
+    return set(reservas_que_ocupan(fecha_inicio, fecha_fin).values_list('habitacion_id', flat=True))
+
+
+def reservas_que_ocupan(fecha_inicio, fecha_fin):
+    """Reservas vivas que se solapan con [fecha_inicio, fecha_fin)."""
+    from app.reservas.models import Reserva
+
+    return Reserva.objects.filter(
+        fecha_inicio__lt=fecha_fin,
+        fecha_fin__gt=fecha_inicio,
+        estado__in=ESTADOS_VIVOS
+    )
+
+
+# Matriz de ocupación
+
+def matriz_ocupacion(fecha_inicio, fecha_fin):
+    """
+    Ocupación de cada habitación en [fecha_inicio, fecha_fin) como un entero
+    usado de bitset: el bit i vale 1 si el día fecha_inicio + i está reservado.
+
+    Las reservas que se solapan con el rango se leen en una sola consulta y
+    cada una se marca con una única operación OR sobre el entero (un desplazamiento
+    de una máscara de unos), sin recorrer los días uno por uno.
+    """
+    dias = (fecha_fin - fecha_inicio).days
+    base = fecha_inicio.toordinal()
+    ocupacion = {}
+    # Sin .iterator(): en PostgreSQL el cursor de servidor es más lento para decenas de miles de filas
+    reservas = reservas_que_ocupan(fecha_inicio, fecha_fin).values_list('habitacion_id', 'fecha_inicio', 'fecha_fin')
+    for habitacion_id, inicio, fin in reservas:
+        desde = inicio.toordinal() - base
+        hasta = fin.toordinal() - base
+        if desde < 0:
+            desde = 0
+        if hasta > dias:
+            hasta = dias
+        # Bits [desde, hasta) en uno
+        ocupacion[habitacion_id] = ocupacion.get(habitacion_id, 0) | ((1 << hasta) - (1 << desde))
+    return ocupacion
+
+
+def tramos(mascara):
+    """Codificación por tramos del bitset: [[día inicial, cantidad de días], ...]."""
+    resultado = []
+    posicion = 0
+    while mascara:
+        ceros = (mascara & -mascara).bit_length() - 1
+        mascara >>= ceros
+        posicion += ceros
+        unos = (~mascara & (mascara + 1)).bit_length() - 1
+        resultado.append([posicion, unos])
+        mascara >>= unos
+        posicion += unos
+    return resultado
@@ -0,0 +1,141 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Value, When
+
+from backend.cache import invalidar_al_confirmar
+
+# Estado de la reserva -> contador de EstadoHabitacion
+CONTADORES = {'pendiente': 'pendientes', 'activa': 'activas'}
+
+# Estados que se derivan de las reservas; 'mantenimiento' solo se cambia a mano
+ESTADOS_DERIVADOS = ('disponible', 'ocupada')
+
+
+def _modelos(Habitacion, EstadoHabitacion):
+    if Habitacion is None:
+        from .models import Habitacion
+    if EstadoHabitacion is None:
+        from .models import EstadoHabitacion
+    return Habitacion, EstadoHabitacion
+
+
+def mover(anterior, actual):
+    """
+    Aplica a la proyección el paso de una reserva de `anterior` a `actual`
+    (diccionarios con habitacion_id y estado, o None si no existía / ya no existe).
+    """
+    deltas = {}
+    for reserva, signo in ((anterior, -1), (actual, 1)):
+        campo = reserva and CONTADORES.get(reserva['estado'])
+        if campo:
+            cambios = deltas.setdefault(reserva['habitacion_id'], {})
+            cambios[campo] = cambios.get(campo, 0) + signo
+    for habitacion_id, cambios in deltas.items():
+        cambios = {campo: n for campo, n in cambios.items() if n}
+        if cambios:
+            ajustar(habitacion_id, **cambios)
+
+
+def ajustar(habitacion_id, pendientes=0, activas=0):
+    """Suma los contadores de la habitación con un UPDATE atómico y rederiva su estado."""
+    from .models import EstadoHabitacion
+
+    cambios = {
+        campo: F(campo) + n for campo, n in (('pendientes', pendientes), ('activas', activas)) if n
+    }
+    if EstadoHabitacion.objects.filter(habitacion_id=habitacion_id).update(**cambios):
+        sincronizar([habitacion_id])
+        return
+    # Sin fila todavía: se cuenta desde Reserva, que ya incluye este cambio
+    try:
+        with transaction.atomic():
+            reconstruir([habitacion_id])
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT
+        EstadoHabitacion.objects.filter(habitacion_id=habitacion_id).update(**cambios)
+        sincronizar([habitacion_id])
+
+
+def trasladar(conteos, desde, hacia):
+    """
+    Versión en bloque de mover() para reservas cambiadas con update():
+    `conteos` es {habitacion_id: reservas que pasaron de `desde` a `hacia`}.
+    Hace un UPDATE por cada cantidad distinta y una sola derivación del estado.
+    """
+    from .models import EstadoHabitacion
+
+    por_cantidad = {}
+    for habitacion_id, n in conteos.items():
+        por_cantidad.setdefault(n, []).append(habitacion_id)
+    for n, ids in por_cantidad.items():
+        cambios = {}
+        for estado, signo in ((desde, -n), (hacia, n)):
+            campo = CONTADORES.get(estado)
+            if campo:
+                cambios[campo] = F(campo) + signo
+        if not cambios:
+            continue
+        if EstadoHabitacion.objects.filter(habitacion_id__in=ids).update(**cambios) < len(ids):
+            faltantes = set(ids) - set(
+                EstadoHabitacion.objects.filter(habitacion_id__in=ids).values_list('habitacion_id', flat=True)
+            )
+            with transaction.atomic():
+                reconstruir(faltantes)
+    sincronizar(list(conteos))
+
+
+def sincronizar(ids=None, Habitacion=None, EstadoHabitacion=None):
+    """
+    Deriva Habitacion.estado de la proyección: 'ocupada' con alguna reserva
+    viva y 'disponible' sin ninguna. Es un UPDATE de una sola columna que solo
+    toca las filas cuyo estado cambia y nunca las que están en mantenimiento.
+    """
+    Habitacion, EstadoHabitacion = _modelos(Habitacion, EstadoHabitacion)
+
+    vivas = EstadoHabitacion.objects.filter(habitacion=OuterRef('pk')).filter(
+        Q(pendientes__gt=0) | Q(activas__gt=0)
+    )
+    derivado = Case(When(Exists(vivas), then=Value('ocupada')), default=Value('disponible'))
+    habitaciones = Habitacion.objects.filter(estado__in=ESTADOS_DERIVADOS)
+    if ids is not None:
+        habitaciones = habitaciones.filter(pk__in=ids)
+    cambiadas = habitaciones.alias(derivado=derivado).exclude(estado=F('derivado')).update(estado=derivado)
+    if cambiadas:
+        # update() no emite señales: las respuestas en caché se invalidan aquí
+        invalidar_al_confirmar(Habitacion)
+    return cambiadas
+
+
+def reconstruir(ids=None, Habitacion=None, EstadoHabitacion=None, Reserva=None):
+    """Recalcula la proyección (de todas las habitaciones o de `ids`) a partir de Reserva."""
+    Habitacion, EstadoHabitacion = _modelos(Habitacion, EstadoHabitacion)
+    if Reserva is None:
+        from app.reservas.models import Reserva
+
+    habitaciones = Habitacion.objects.all()
+    reservas = Reserva.objects.filter(estado__in=CONTADORES)
+    filas = EstadoHabitacion.objects.all()
+    if ids is not None:
+        habitaciones = habitaciones.filter(pk__in=ids)
+        reservas = reservas.filter(habitacion_id__in=ids)
+        filas = filas.filter(habitacion_id__in=ids)
+
+    conteos = {
+        c['habitacion_id']: c
+        for c in reservas.values('habitacion_id').annotate(
+            pendientes=Count('id', filter=Q(estado='pendiente')),
+            activas=Count('id', filter=Q(estado='activa')),
+        ).order_by()
+    }
+
+    with transaction.atomic():
+        filas.delete()
+        nuevas = EstadoHabitacion.objects.bulk_create([
+            EstadoHabitacion(
+                habitacion_id=habitacion_id,
+                pendientes=conteos.get(habitacion_id, {}).get('pendientes', 0),
+                activas=conteos.get(habitacion_id, {}).get('activas', 0),
+            )
+            for habitacion_id in habitaciones.values_list('pk', flat=True).iterator()
+        ], batch_size=1000)
+        cambiadas = sincronizar(ids, Habitacion, EstadoHabitacion)
+    return len(nuevas), cambiadas
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app.habitaciones.estado import reconstruir
+
+
+class Command(BaseCommand):
+    help = 'Recalcula EstadoHabitacion a partir de las reservas y rederiva Habitacion.estado.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('habitaciones', nargs='*', type=int, help='IDs de habitación (por defecto, todas)')
+
+    def handle(self, *args, **options):
+        filas, cambiadas = reconstruir(options['habitaciones'] or None)
+        self.stdout.write(self.style.SUCCESS(
+            f'{filas} habitaciones reconstruidas, {cambiadas} con el estado corregido.'
+        ))
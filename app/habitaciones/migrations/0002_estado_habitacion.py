@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habitaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadoHabitacion',
+            fields=[
+                ('habitacion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='proyeccion', serialize=False, to='habitaciones.habitacion')),
+                ('pendientes', models.IntegerField(default=0)),
+                ('activas', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
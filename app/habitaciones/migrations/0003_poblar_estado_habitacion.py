@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def poblar(apps, schema_editor):
+    from app.habitaciones.estado import reconstruir
+
+    reconstruir(Habitacion=apps.get_model('habitaciones', 'Habitacion'),
+                EstadoHabitacion=apps.get_model('habitaciones', 'EstadoHabitacion'),
+                Reserva=apps.get_model('reservas', 'Reserva'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habitaciones', '0002_estado_habitacion'),
+        ('reservas', '0004_notificacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
@@ -13,3 +13,19 @@ class Habitacion(models.Model):
 
     def __str__(self):
         return f'Habitación {self.id} - {self.tipo}'
+
+
+class EstadoHabitacion(models.Model):
+    """
+    Reservas vivas (pendientes y activas) de cada habitación. Se mantiene con
+    señales sobre Reserva (ver estado.py) y se puede reconstruir con
+    `reconstruir_estado_habitaciones`; Habitacion.estado se deriva de aquí.
+    """
+    habitacion = models.OneToOneField(
+        Habitacion, on_delete=models.CASCADE, primary_key=True, related_name='proyeccion'
+    )
+    pendientes = models.IntegerField(default=0)
+    activas = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.habitacion}: {self.pendientes} pendientes, {self.activas} activas'
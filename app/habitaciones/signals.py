@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app.reservas.models import Reserva
+from backend import senales
+from .estado import mover
+from .models import Habitacion
+
+CAMPOS_ESTADO = ('habitacion_id', 'estado')
+
+
+def _valores(reserva):
+    return {campo: getattr(reserva, campo) for campo in CAMPOS_ESTADO}
+
+
+@receiver(pre_save, sender=Reserva)
+def recordar_reserva_anterior(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._estado_anterior = None
+    if raw or not instance.pk or senales.suspendidas():
+        return
+    if update_fields is not None and not {'estado', 'habitacion', 'habitacion_id'} & set(update_fields):
+        # Guardado parcial que no cambia la habitación ni el estado
+        instance._estado_anterior = _valores(instance)
+        return
+    instance._estado_anterior = sender.objects.filter(pk=instance.pk).values(*CAMPOS_ESTADO).first()
+
+
+@receiver(post_save, sender=Reserva)
+def actualizar_estado_habitacion(sender, instance, raw=False, **kwargs):
+    if raw or senales.suspendidas():
+        return
+    anterior = getattr(instance, '_estado_anterior', None)
+    actual = _valores(instance)
+    if anterior != actual:
+        mover(anterior, actual)
+
+
+@receiver(post_delete, sender=Reserva)
+def descontar_estado_habitacion(sender, instance, origin=None, **kwargs):
+    # Al borrar la habitación sus reservas caen en cascada junto con la proyección
+    if senales.suspendidas() or isinstance(origin, Habitacion) or getattr(origin, 'model', None) is Habitacion:
+        return
+    mover(_valores(instance), None)
@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -123,3 +124,324 @@ class HabitacionAPITestCase(APITestCase):
         # Extra 2: fechas en formato incorrecto
         response = self.client.get(url, {'fecha_inicio': '2024/01/01', 'fecha_fin': '2024-01-05'})
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MotorDisponibilidadTestCase(APITestCase):
+    def setUp(self):
+        from .disponibilidad import MotorDisponibilidad
+
+        self.motor = MotorDisponibilidad(ttl=0)
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.cliente = Cliente.objects.create(
+            nombre='Cliente Motor',
+            documento='55550000',
+            email='motor@prueba.com',
+            telefono='5550000'
+        )
+        self.h1 = Habitacion.objects.create(tipo='Simple', estado='disponible', precio=50.00)
+        self.h2 = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+        self.hoy = date.today()
+        self.reserva = Reserva.objects.create(
+            cliente=self.cliente,
+            habitacion=self.h1,
+            fecha_inicio=self.hoy + timedelta(days=2),
+            fecha_fin=self.hoy + timedelta(days=5),
+            estado='pendiente'
+        )
+        Reserva.objects.create(
+            cliente=self.cliente,
+            habitacion=self.h2,
+            fecha_inicio=self.hoy,
+            fecha_fin=self.hoy + timedelta(days=1),
+            estado='cancelada'
+        )
+        self.motor.cargar()
+
+    def test_consulta_coincide_con_la_base_de_datos(self):
+        d = lambda n: self.hoy + timedelta(days=n)
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(3), d(4)), {self.h1.id})
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(0), d(2)), set())
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(5), d(7)), set())
+        self.assertFalse(self.motor.esta_libre(self.h1.id, d(4), d(6)))
+        self.assertTrue(self.motor.esta_libre(self.h2.id, d(0), d(1)))
+
+    def test_actualizacion_incremental_y_verificacion(self):
+        d = lambda n: self.hoy + timedelta(days=n)
+        nueva = Reserva.objects.create(
+            cliente=self.cliente,
+            habitacion=self.h2,
+            fecha_inicio=d(10),
+            fecha_fin=d(12),
+        )
+        self.assertEqual(self.motor.verificar()['faltantes'], [nueva.id])
+
+        self.motor.registrar(nueva)
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(11), d(13)), {self.h2.id})
+
+        self.reserva.estado = 'finalizada'
+        self.reserva.save()
+        self.motor.registrar(self.reserva)
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(3), d(4)), set())
+        self.assertFalse(any(self.motor.verificar().values()))
+
+    @override_settings(CACHE_COMPARTIDA=True)
+    def test_recarga_con_reservas_de_otro_proceso(self):
+        from backend.cache import invalidar
+
+        d = lambda n: self.hoy + timedelta(days=n)
+        self.motor.cargar()
+        # Otro worker: sin registrar() en este proceso, solo incrementa la versión compartida
+        Reserva.objects.bulk_create([Reserva(cliente=self.cliente, habitacion=self.h2,
+                                             fecha_inicio=d(20), fecha_fin=d(22))])
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(20), d(21)), set())
+        invalidar(Reserva)
+        self.assertEqual(self.motor.habitaciones_ocupadas(d(20), d(21)), {self.h2.id})
+        self.assertFalse(self.motor.esta_libre(self.h2.id, d(21), d(23)))
+
+    def test_disponibles_con_motor_habilitado(self):
+        from django.test import override_settings
+        from .disponibilidad import motor
+
+        motor.invalidar()
+        fecha_inicio = (self.hoy + timedelta(days=3)).strftime('%Y-%m-%d')
+        fecha_fin = (self.hoy + timedelta(days=4)).strftime('%Y-%m-%d')
+        with override_settings(DISPONIBILIDAD_EN_MEMORIA=True):
+            response = self.client.get('/api/habitaciones/disponibles/', {
+                'fecha_inicio': fecha_inicio,
+                'fecha_fin': fecha_fin
+            })
+        motor.invalidar()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([h['id'] for h in response.data], [self.h2.id])
+
+
+class HabitacionCargaMasivaTestCase(APITestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(username='admin', password='adminpass', rol='administrador')
+        self.client.force_authenticate(user=self.admin)
+        self.habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=100.00)
+
+    def test_crea_y_actualiza_en_una_peticion(self):
+        filas = [
+            {'tipo': 'Simple', 'estado': 'disponible', 'precio': '40.00'},
+            {'id': self.habitacion.id, 'tipo': 'Suite', 'estado': 'mantenimiento', 'precio': '120.00'},
+            {'id': 999999, 'tipo': 'Doble', 'estado': 'disponible', 'precio': '60.00'},
+            {'tipo': 'Doble', 'estado': 'reparación', 'precio': '60.00'},
+        ]
+        response = self.client.post('/api/habitaciones/bulk/', filas, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['creados'], response.data['actualizados']), (1, 1))
+        self.assertEqual([e['fila'] for e in response.data['errores']], [2, 3])
+        self.habitacion.refresh_from_db()
+        self.assertEqual(self.habitacion.estado, 'mantenimiento')
+        self.assertEqual(Habitacion.objects.count(), 2)
+
+
+@override_settings(RESPUESTAS_CACHE_TIMEOUT=300)
+class HabitacionCacheTestCase(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=100.00)
+
+    def test_listado_en_cache_e_invalidacion(self):
+        primera = self.client.get('/api/habitaciones/', {'b': '1', 'a': '2'})
+        segunda = self.client.get('/api/habitaciones/', {'a': '2', 'b': '1'})
+        self.assertEqual((primera['X-Cache'], segunda['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(segunda.data, primera.data)
+
+        Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+        tercera = self.client.get('/api/habitaciones/', {'a': '2', 'b': '1'})
+        self.assertEqual(tercera['X-Cache'], 'MISS')
+        self.assertEqual(len(tercera.data), 2)
+
+    def test_disponibles_se_invalida_con_reservas(self):
+        hoy = date.today()
+        parametros = {
+            'fecha_inicio': hoy.strftime('%Y-%m-%d'),
+            'fecha_fin': (hoy + timedelta(days=2)).strftime('%Y-%m-%d')
+        }
+        self.assertEqual(len(self.client.get('/api/habitaciones/disponibles/', parametros).data), 1)
+        self.assertEqual(self.client.get('/api/habitaciones/disponibles/', parametros)['X-Cache'], 'HIT')
+
+        cliente = Cliente.objects.create(nombre='Cache', documento='77770000', email='cache@prueba.com', telefono='1')
+        Reserva.objects.create(cliente=cliente, habitacion=self.habitacion,
+                               fecha_inicio=hoy, fecha_fin=hoy + timedelta(days=1))
+        response = self.client.get('/api/habitaciones/disponibles/', parametros)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data, [])
+
+
+@override_settings(RESPUESTAS_CONDICIONALES=True)
+class HabitacionCondicionalTestCase(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=100.00)
+        self.url = f'/api/habitaciones/{self.habitacion.pk}/'
+
+    def test_listado_sin_cambios_responde_304_sin_consultas(self):
+        primera = self.client.get('/api/habitaciones/')
+        self.assertEqual(primera.status_code, status.HTTP_200_OK)
+        self.assertTrue(primera.has_header('ETag'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/habitaciones/', HTTP_IF_NONE_MATCH=primera['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], primera['ETag'])
+        self.assertEqual(response.content, b'')
+
+        Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+        response = self.client.get('/api/habitaciones/', HTTP_IF_NONE_MATCH=primera['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], primera['ETag'])
+        self.assertEqual(len(response.data), 2)
+
+    def test_detalle_con_if_modified_since(self):
+        import time
+        from unittest import mock
+
+        # Last-Modified solo se envía cuando terminó el segundo de la última escritura
+        with mock.patch('backend.condicional.time.time', return_value=time.time() + 2):
+            primera = self.client.get(self.url)
+            response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=primera['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=primera['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_del_detalle_no_depende_de_fields(self):
+        etag = self.client.get(self.url, {'fields': 'id,precio'})['ETag']
+        self.assertEqual(self.client.get(self.url)['ETag'], etag)
+        response = self.client.patch(self.url, {'precio': '120.00'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_match_desactualizado_responde_412(self):
+        etag = self.client.get(self.url)['ETag']
+        Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+
+        response = self.client.patch(self.url, {'precio': '120.00'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.habitacion.refresh_from_db()
+        self.assertEqual(self.habitacion.precio, 100)
+
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'precio': '120.00'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+
+class OcupacionTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.cliente = Cliente.objects.create(nombre='Ocupa', documento='88880000', email='o@prueba.com', telefono='1')
+        self.h1 = Habitacion.objects.create(tipo='Simple', estado='disponible', precio=50.00)
+        self.h2 = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=80.00)
+        self.inicio = date(2030, 1, 1)
+        d = lambda n: self.inicio + timedelta(days=n)
+        # Empieza antes del rango, dos reservas contiguas y una cancelada
+        for habitacion, desde, hasta, estado in [
+            (self.h1, d(-2), d(2), 'activa'),
+            (self.h1, d(5), d(7), 'pendiente'),
+            (self.h1, d(7), d(8), 'pendiente'),
+            (self.h2, d(3), d(4), 'cancelada'),
+        ]:
+            Reserva.objects.create(cliente=self.cliente, habitacion=habitacion,
+                                   fecha_inicio=desde, fecha_fin=hasta, estado=estado)
+
+    def test_bitset_y_tramos(self):
+        from .disponibilidad import tramos
+
+        parametros = {'fecha_inicio': '2030-01-01', 'fecha_fin': '2030-01-11'}
+        response = self.client.get('/api/habitaciones/ocupacion/', parametros)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dias'], 10)
+        ocupacion = {h['id']: int(h['ocupacion'], 16) for h in response.data['habitaciones']}
+        self.assertEqual(ocupacion, {self.h1.id: 0b11100011, self.h2.id: 0})
+        self.assertEqual(tramos(ocupacion[self.h1.id]), [[0, 2], [5, 3]])
+
+        response = self.client.get('/api/habitaciones/ocupacion/', {**parametros, 'formato': 'tramos'})
+        self.assertEqual(response.data['habitaciones'][0]['ocupacion'], [[0, 2], [5, 3]])
+
+    def test_rango_invalido(self):
+        for parametros in [
+            {'fecha_inicio': '2030-01-10', 'fecha_fin': '2030-01-01'},
+            {'fecha_inicio': '2030-01-01', 'fecha_fin': '2040-01-01'},
+            {'fecha_inicio': '2030-01-01', 'fecha_fin': '2030-01-05', 'formato': 'csv'},
+        ]:
+            response = self.client.get('/api/habitaciones/ocupacion/', parametros)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EstadoHabitacionTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.cliente = Cliente.objects.create(nombre='Estado', documento='66660000', email='e@prueba.com', telefono='1')
+        self.habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=100.00)
+        self.hoy = date.today()
+
+    def _reservar(self, dias, estado='pendiente'):
+        return Reserva.objects.create(cliente=self.cliente, habitacion=self.habitacion, estado=estado,
+                                      fecha_inicio=self.hoy + timedelta(days=dias),
+                                      fecha_fin=self.hoy + timedelta(days=dias + 1))
+
+    def _estado(self):
+        from .models import EstadoHabitacion
+
+        self.habitacion.refresh_from_db()
+        proyeccion = EstadoHabitacion.objects.get(habitacion=self.habitacion)
+        return self.habitacion.estado, proyeccion.pendientes, proyeccion.activas
+
+    def test_transiciones_derivan_el_estado(self):
+        primera = self._reservar(1)
+        segunda = self._reservar(5)
+        self.assertEqual(self._estado(), ('ocupada', 2, 0))
+
+        response = self.client.post(f'/api/reservas/{primera.id}/checkin/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._estado(), ('ocupada', 1, 1))
+
+        # Con otra reserva viva la habitación sigue ocupada tras el check-out
+        self.client.post(f'/api/reservas/{primera.id}/checkout/')
+        self.assertEqual(self._estado(), ('ocupada', 1, 0))
+
+        self.client.delete(f'/api/reservas/{segunda.id}/')
+        self.assertEqual(self._estado(), ('disponible', 0, 0))
+
+    def test_checkin_no_reescribe_la_habitacion(self):
+        reserva = self._reservar(0)
+        # SAVEPOINT, SELECT ... FOR UPDATE, UPDATE condicional de la reserva,
+        # UPDATE de los contadores, UPDATE de Habitacion.estado y RELEASE
+        with self.assertNumQueries(6):
+            self.client.post(f'/api/reservas/{reserva.id}/checkin/')
+        self.assertEqual(self._estado(), ('ocupada', 0, 1))
+
+    def test_mantenimiento_no_se_deriva(self):
+        reserva = self._reservar(1)
+        Habitacion.objects.filter(pk=self.habitacion.pk).update(estado='mantenimiento')
+        reserva.delete()
+        self.assertEqual(self._estado(), ('mantenimiento', 0, 0))
+
+    def test_reconstruir_corrige_desvios(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        reserva = self._reservar(1)
+        # update() no emite señales: la proyección queda desfasada
+        Reserva.objects.filter(pk=reserva.pk).update(estado='cancelada')
+        self.assertEqual(self._estado(), ('ocupada', 1, 0))
+
+        salida = StringIO()
+        call_command('reconstruir_estado_habitaciones', stdout=salida)
+        self.assertIn('1 con el estado corregido', salida.getvalue())
+        self.assertEqual(self._estado(), ('disponible', 0, 0))
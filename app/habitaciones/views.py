@@ -2,19 +2,29 @@ from rest_framework import viewsets, filters, status
 from rest_framework.response import Response
 from .models import Habitacion
 from .serializers import HabitacionSerializer
+from .disponibilidad import habitaciones_ocupadas, matriz_ocupacion, tramos
 from app.reservas.models import Reserva 
 from rest_framework.decorators import action
 from datetime import datetime
+from django.conf import settings
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_yasg import openapi
+from backend.campos import CamposMixin
+from backend.carga_masiva import CargaMasivaMixin
+from backend.cache import cache_respuesta
+from backend.condicional import CondicionalMixin
 
 @extend_schema(tags=['Habitaciones'])
-class HabitacionViewSet(viewsets.ModelViewSet):
+class HabitacionViewSet(CondicionalMixin, CamposMixin, CargaMasivaMixin, viewsets.ModelViewSet):
     queryset = Habitacion.objects.all().order_by('tipo')
     serializer_class = HabitacionSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['tipo', 'estado']
 
+    @cache_respuesta(Habitacion)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def destroy(self, request, *args, **kwargs):
         habitacion = self.get_object()
 
@@ -52,29 +62,84 @@ class HabitacionViewSet(viewsets.ModelViewSet):
         ]
     )
     @action(detail=False, methods=['get'], url_path='disponibles')
+    @cache_respuesta(Habitacion, Reserva)
     def disponibles(self, request):
-        fecha_inicio = request.query_params.get('fecha_inicio')
-        fecha_fin = request.query_params.get('fecha_fin')
+        fecha_inicio, fecha_fin, error = self._rango_fechas(request)
+        if error:
+            return error
+
+        # Buscar habitaciones que NO tienen reservas que se solapen
+        ocupadas = habitaciones_ocupadas(fecha_inicio, fecha_fin)
 
-        if not fecha_inicio or not fecha_fin:
-            return Response({'error': 'Debe proporcionar fecha_inicio y fecha_fin en formato YYYY-MM-DD'},
+        disponibles = self.proyectar(Habitacion.objects.exclude(id__in=ocupadas).filter(estado='disponible'))
+
+        serializer = self.get_serializer(disponibles, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        methods=['GET'],
+        parameters=[
+            OpenApiParameter(name='fecha_inicio', location=OpenApiParameter.QUERY,
+                             description="yyyy-MM-dd", type=str, required=True),
+            OpenApiParameter(name='fecha_fin', location=OpenApiParameter.QUERY,
+                             description="yyyy-MM-dd (excluido)", type=str, required=True),
+            OpenApiParameter(name='formato', location=OpenApiParameter.QUERY,
+                             description="bitset (por defecto) o tramos", type=str, required=False),
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='ocupacion')
+    @cache_respuesta(Habitacion, Reserva)
+    def ocupacion(self, request):
+        """
+        Matriz habitaciones × días del rango. Con formato=bitset cada habitación
+        trae un hexadecimal cuyo bit i indica si el día fecha_inicio + i está
+        reservado; con formato=tramos, una lista de [día inicial, cantidad de días].
+        """
+        fecha_inicio, fecha_fin, error = self._rango_fechas(request)
+        if error:
+            return error
+        formato = request.query_params.get('formato', 'bitset')
+        if formato not in ('bitset', 'tramos'):
+            return Response({'error': 'formato debe ser bitset o tramos'}, status=status.HTTP_400_BAD_REQUEST)
+        dias = (fecha_fin - fecha_inicio).days
+        maximo = getattr(settings, 'OCUPACION_MAXIMO_DIAS', 731)
+        if dias <= 0 or dias > maximo:
+            return Response({'error': f'El rango debe tener entre 1 y {maximo} días'},
                             status=status.HTTP_400_BAD_REQUEST)
 
+        ocupacion = matriz_ocupacion(fecha_inicio, fecha_fin)
+        codificar = tramos if formato == 'tramos' else (lambda mascara: format(mascara, 'x'))
+        habitaciones = [
+            {'id': id_, 'tipo': tipo, 'estado': estado, 'ocupacion': codificar(ocupacion.get(id_, 0))}
+            for id_, tipo, estado in Habitacion.objects.order_by('id').values_list('id', 'tipo', 'estado')
+        ]
+        return Response({
+            'fecha_inicio': fecha_inicio,
+            'fecha_fin': fecha_fin,
+            'dias': dias,
+            'formato': formato,
+            'habitaciones': habitaciones,
+        })
+
+    def _rango_fechas(self, request):
+        """Lee fecha_inicio y fecha_fin; devuelve (inicio, fin, respuesta de error o None)."""
         try:
-            fecha_inicio = datetime.strptime(fecha_inicio, "%Y-%m-%d").date()
-            fecha_fin = datetime.strptime(fecha_fin, "%Y-%m-%d").date()
-        except ValueError:
-            return Response({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'},
-                            status=status.HTTP_400_BAD_REQUEST)
+            fecha_inicio, fecha_fin = leer_rango(request.query_params)
+        except ValueError as exc:
+            return None, None, Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return fecha_inicio, fecha_fin, None
 
-        # Buscar habitaciones que NO tienen reservas que se solapen
-        habitaciones_ocupadas = Reserva.objects.filter(
-            fecha_inicio__lt=fecha_fin,
-            fecha_fin__gt=fecha_inicio,
-            estado__in=['pendiente', 'activa']
-        ).values_list('habitacion_id', flat=True)
 
-        disponibles = Habitacion.objects.exclude(id__in=habitaciones_ocupadas).filter(estado='disponible')
+def leer_rango(parametros):
+    """fecha_inicio y fecha_fin (YYYY-MM-DD) de los parámetros; ValueError con el mensaje para el cliente."""
+    fecha_inicio = parametros.get('fecha_inicio')
+    fecha_fin = parametros.get('fecha_fin')
 
-        serializer = self.get_serializer(disponibles, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+    if not fecha_inicio or not fecha_fin:
+        raise ValueError('Debe proporcionar fecha_inicio y fecha_fin en formato YYYY-MM-DD')
+
+    try:
+        return (datetime.strptime(fecha_inicio, "%Y-%m-%d").date(),
+                datetime.strptime(fecha_fin, "%Y-%m-%d").date())
+    except ValueError:
+        raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
@@ -0,0 +1,23 @@
+from backend.asincrono import respuesta_json, vista_async
+from .disponibilidad import reservas_que_ocupan
+from .models import Habitacion
+from .views import leer_rango
+
+CAMPOS_HABITACION = ('id', 'tipo', 'estado', 'precio')
+
+
+@vista_async()
+async def disponibles(request):
+    """Versión async de GET /api/habitaciones/disponibles/ (una sola consulta con subconsulta)."""
+    try:
+        fecha_inicio, fecha_fin = leer_rango(request.GET)
+    except ValueError as exc:
+        return respuesta_json({'error': str(exc)}, status=400)
+
+    ocupadas = reservas_que_ocupan(fecha_inicio, fecha_fin).values('habitacion_id')
+    habitaciones = (
+        Habitacion.objects.exclude(id__in=ocupadas).filter(estado='disponible')
+        .order_by('tipo').values(*CAMPOS_HABITACION)
+    )
+    # precio como texto, igual que HabitacionSerializer
+    return respuesta_json([{**h, 'precio': str(h['precio'])} async for h in habitaciones])
@@ -0,0 +1,252 @@
+import json
+import random
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from datetime import date, datetime, time as hora, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.clientes.models import Cliente
+from app.habitaciones.estado import reconstruir as reconstruir_estado
+from app.habitaciones.models import Habitacion
+from app.pagos.models import Pago
+from app.reportes.ingresos import reconstruir as reconstruir_ingresos
+from app.reservas.models import Reserva
+from app.usuarios.models import Usuario
+from backend.cache import invalidar
+from .carga import generar_carga
+from .perfilado import PERCENTILES, RegistroConsultas, percentil
+
+USUARIO_BENCHMARK = 'benchmark'
+PRECIOS = {'Simple': 60, 'Doble': 90, 'Suite': 150}
+TIPOS_PAGO = ('Efectivo', 'Tarjeta', 'Transferencia')
+
+
+# Datos sintéticos
+
+def generar_datos(habitaciones=50, clientes=200, anios=2, semilla=0):
+    """
+    Inserta en bloque `habitaciones`, `clientes` y `anios` años de estancias
+    seguidas de 1 a 5 noches por habitación (finalizadas con su pago, o
+    canceladas). Para hoy, la mitad de las habitaciones tiene un huésped
+    (activa), una de cada cuatro una reserva futura (pendiente) y el resto
+    queda libre para el escenario de reservar. Como bulk_create no emite
+    señales, al final reconstruye la proyección de habitaciones y los ingresos
+    diarios. Devuelve cuántas filas creó de cada modelo.
+    """
+    rnd = random.Random(semilla)
+    hoy = date.today()
+    marca = f'bench{time.time_ns() % 10**9}'
+
+    nuevas = Habitacion.objects.bulk_create([
+        Habitacion(tipo=tipo, estado='disponible', precio=PRECIOS[tipo])
+        for tipo in (rnd.choice(list(PRECIOS)) for _ in range(habitaciones))
+    ])
+    nuevos_clientes = Cliente.objects.bulk_create([
+        Cliente(nombre=f'Cliente {i}', documento=f'{marca}{i}', email=f'{marca}-{i}@example.com', telefono='0')
+        for i in range(clientes)
+    ])
+
+    reservas, pagos, fechas_pago = [], [], []
+
+    def reservar(habitacion, inicio, fin, estado):
+        reserva = Reserva(cliente=rnd.choice(nuevos_clientes), habitacion=habitacion,
+                          fecha_inicio=inicio, fecha_fin=fin, estado=estado)
+        if estado == 'finalizada':
+            reserva.pago = Pago(monto=PRECIOS[habitacion.tipo] * (fin - inicio).days,
+                                tipo_pago=rnd.choice(TIPOS_PAGO), estado='exitoso')
+            pagos.append(reserva.pago)
+            fechas_pago.append(timezone.make_aware(datetime.combine(fin, hora(11))))
+        reservas.append(reserva)
+
+    for indice, habitacion in enumerate(nuevas):
+        dia = hoy - timedelta(days=365 * anios)
+        while True:
+            fin = dia + timedelta(days=rnd.randint(1, 5))
+            if fin >= hoy - timedelta(days=1):
+                break
+            reservar(habitacion, dia, fin, 'cancelada' if rnd.random() < 0.15 else 'finalizada')
+            dia = fin + timedelta(days=rnd.randint(0, 3))
+        if indice % 2 == 0:
+            reservar(habitacion, hoy - timedelta(days=1), hoy + timedelta(days=2), 'activa')
+        elif indice % 4 == 1:
+            reservar(habitacion, hoy + timedelta(days=7), hoy + timedelta(days=10), 'pendiente')
+
+    Pago.objects.bulk_create(pagos, batch_size=2000)
+    # fecha es auto_now_add: se corrige después de insertar
+    for pago, fecha in zip(pagos, fechas_pago):
+        pago.fecha = fecha
+    Pago.objects.bulk_update(pagos, ['fecha'], batch_size=2000)
+    Reserva.objects.bulk_create(reservas, batch_size=2000)
+
+    reconstruir_estado([h.pk for h in nuevas])
+    reconstruir_ingresos()
+    invalidar(Habitacion, Cliente, Reserva, Pago)
+    return {
+        'habitaciones': len(nuevas),
+        'clientes': len(nuevos_clientes),
+        'reservas': len(reservas),
+        'pagos': len(pagos),
+    }
+
+
+def token_benchmark():
+    """Token de un administrador dedicado al benchmark (se crea si no existe)."""
+    usuario, creado = Usuario.objects.get_or_create(username=USUARIO_BENCHMARK, defaults={'rol': 'administrador'})
+    if creado:
+        usuario.set_unusable_password()
+        usuario.save(update_fields=['password'])
+    return Token.objects.get_or_create(user=usuario)[0].key
+
+
+# Escenarios
+
+def contexto():
+    """IDs de la base que usan los escenarios para armar sus peticiones."""
+    return {
+        'hoy': date.today(),
+        'libres': list(Habitacion.objects.filter(estado='disponible').values_list('id', flat=True)),
+        'clientes': list(Cliente.objects.values_list('id', flat=True)[:1000]),
+        'pendientes': list(Reserva.objects.filter(estado='pendiente').values_list('id', flat=True)[:5000]),
+        'activas': list(Reserva.objects.filter(estado='activa').values_list('id', flat=True)[:5000]),
+    }
+
+
+def _rango(c, rnd, desde, hasta):
+    inicio = c['hoy'] + timedelta(days=rnd.randint(desde, hasta))
+    return inicio, inicio + timedelta(days=rnd.randint(1, 7))
+
+
+def _disponibilidad(c, i, rnd):
+    inicio, fin = _rango(c, rnd, 0, 180)
+    return 'GET', f'/api/habitaciones/disponibles/?fecha_inicio={inicio}&fecha_fin={fin}', None
+
+
+def _reservar(c, i, rnd):
+    inicio, fin = _rango(c, rnd, 30, 365)
+    return 'POST', '/api/reservas/', {
+        'cliente': rnd.choice(c['clientes']),
+        'habitacion': c['libres'][i % len(c['libres'])],
+        'fecha_inicio': inicio,
+        'fecha_fin': fin,
+    }
+
+
+# Las escrituras consumen datos: cada habitación libre acepta una sola reserva
+# (luego queda ocupada, 400) y cada reserva un solo check-in/out (luego 409).
+# Los códigos de cada escenario quedan en 'estados'.
+ESCENARIOS = {
+    'disponibilidad': _disponibilidad,
+    'reservar': _reservar,
+    'checkin': lambda c, i, rnd: ('POST', f"/api/reservas/{c['pendientes'][i % len(c['pendientes'])]}/checkin/", None),
+    'checkout': lambda c, i, rnd: ('POST', f"/api/reservas/{c['activas'][i % len(c['activas'])]}/checkout/", None),
+    'pagos': lambda c, i, rnd: ('GET', '/api/pagos/?page_size=50', None),
+    'reporte_reservas': lambda c, i, rnd: (
+        'GET', f"/api/reportes/reservas/?fecha_inicio={c['hoy'] - timedelta(days=30)}&fecha_fin={c['hoy']}", None
+    ),
+    'reporte_ingresos': lambda c, i, rnd: (
+        'GET', f"/api/reportes/ingresos/?fecha_inicio={c['hoy'] - timedelta(days=365)}", None
+    ),
+}
+
+# Datos que necesita cada escenario; sin ellos se omite
+REQUISITOS = {'reservar': ('libres', 'clientes'), 'checkin': ('pendientes',), 'checkout': ('activas',)}
+
+
+def peticiones(nombre, c, cantidad, semilla=0):
+    """Lista de (método, ruta, cuerpo) del escenario, o None si faltan datos."""
+    if any(not c[clave] for clave in REQUISITOS.get(nombre, ())):
+        return None
+    rnd = random.Random(f'{semilla}-{nombre}')
+    return [ESCENARIOS[nombre](c, i, rnd) for i in range(cantidad)]
+
+
+# Ejecución
+
+def _resumen(latencias, estados, duracion, consultas=None):
+    latencias = sorted(latencias)
+    resultado = {
+        'peticiones': len(latencias),
+        'errores': sum(n for codigo, n in estados.items() if int(codigo) >= 400),
+        'por_segundo': round(len(latencias) / duracion, 1) if duracion else None,
+        'estados': {str(codigo): n for codigo, n in sorted(estados.items())},
+    }
+    for p in PERCENTILES:
+        valor = percentil(latencias, p)
+        resultado[f'p{p}_ms'] = round(valor, 3) if valor is not None else None
+    if consultas:
+        consultas = sorted(consultas)
+        resultado.update(consultas_p50=percentil(consultas, 50), consultas_p95=percentil(consultas, 95),
+                         consultas_max=consultas[-1])
+    return resultado
+
+
+def ejecutar_en_proceso(lista, token):
+    """
+    Ejecuta las peticiones una tras otra con el cliente de pruebas de DRF en
+    este proceso, contando las consultas SQL de cada una.
+    """
+    cliente = APIClient()
+    cliente.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+    latencias, consultas, estados = [], [], Counter()
+    inicio = time.perf_counter()
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for metodo, ruta, cuerpo in lista:
+            registro = RegistroConsultas()
+            t0 = time.perf_counter()
+            with connection.execute_wrapper(registro):
+                respuesta = cliente.generic(metodo, ruta, json.dumps(cuerpo, default=str) if cuerpo else '',
+                                            content_type='application/json')
+                if respuesta.streaming:
+                    b''.join(respuesta.streaming_content)
+            latencias.append((time.perf_counter() - t0) * 1000)
+            consultas.append(registro.cantidad)
+            estados[respuesta.status_code] += 1
+    return _resumen(latencias, estados, time.perf_counter() - inicio, consultas)
+
+
+def ejecutar_http(lista, base, token, concurrencia):
+    """
+    Ejecuta las peticiones contra un servidor ya levantado (p. ej. gunicorn)
+    con `concurrencia` conexiones keep-alive. Si el servidor tiene
+    PERFILADO_ACTIVO, agrega las consultas SQL que registró su perfilado
+    (del worker que responde a /api/monitoreo/perfil/).
+    """
+    cabeceras = {'Authorization': f'Token {token}'}
+    _perfil(base, cabeceras, 'DELETE')
+    resultado = generar_carga(
+        [(metodo, base + ruta, cuerpo) for metodo, ruta, cuerpo in lista], concurrencia, len(lista), cabeceras
+    )
+    perfil = _perfil(base, cabeceras, 'GET')
+    if perfil and perfil.get('endpoints'):
+        principal = max(perfil['endpoints'], key=lambda e: e['peticiones'])
+        resultado.update(consultas_p50=principal['consultas_p50'], consultas_p95=principal['consultas_p95'])
+    return resultado
+
+
+def _perfil(base, cabeceras, metodo):
+    peticion = urllib.request.Request(f'{base}/api/monitoreo/perfil/', method=metodo, headers=cabeceras)
+    try:
+        with urllib.request.urlopen(peticion, timeout=10) as respuesta:
+            cuerpo = respuesta.read()
+    except (urllib.error.URLError, OSError):
+        return None
+    return json.loads(cuerpo) if cuerpo else None
+
+
+def commit_actual():
+    """Commit de git del código medido (None fuera de un repositorio)."""
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
@@ -0,0 +1,88 @@
+import http.client
+import json
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from .perfilado import PERCENTILES, percentil
+
+
+def _conexion(url):
+    partes = urlsplit(url)
+    clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+    return clase(partes.netloc, timeout=60)
+
+
+def _peticion(objetivo):
+    """Una URL es un GET; también se acepta (método, url, cuerpo JSON o None)."""
+    if isinstance(objetivo, str):
+        return 'GET', objetivo, None
+    metodo, url, cuerpo = objetivo
+    return metodo, url, None if cuerpo is None else json.dumps(cuerpo, default=str)
+
+
+def generar_carga(urls, concurrencia, peticiones, cabeceras=None):
+    """
+    Lanza `peticiones` repartidas entre `concurrencia` hilos; cada hilo
+    mantiene su propia conexión keep-alive y recorre `urls` en orden (GET, o
+    tuplas (método, url, cuerpo) para escrituras). Devuelve throughput,
+    percentiles de latencia, conteo de errores y respuestas por código.
+    """
+    urls = [_peticion(u) for u in urls]
+    cabeceras = cabeceras or {}
+    latencias, errores = [], []
+    estados = Counter()
+    lock = threading.Lock()
+    turnos = iter(range(peticiones))
+
+    def trabajar():
+        propias, fallos, codigos = [], [], Counter()
+        conexion = _conexion(urls[0][1])
+        while True:
+            with lock:
+                turno = next(turnos, None)
+            if turno is None:
+                break
+            metodo, url, cuerpo = urls[turno % len(urls)]
+            partes = urlsplit(url)
+            ruta = partes.path + (f'?{partes.query}' if partes.query else '')
+            encabezados = {**cabeceras, 'Content-Type': 'application/json'} if cuerpo is not None else cabeceras
+            inicio = time.perf_counter()
+            try:
+                conexion.request(metodo, ruta, body=cuerpo, headers=encabezados)
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                codigos[respuesta.status] += 1
+                if respuesta.status >= 400:
+                    fallos.append(respuesta.status)
+            except (OSError, http.client.HTTPException) as exc:
+                fallos.append(type(exc).__name__)
+                conexion.close()
+                conexion = _conexion(url)
+            propias.append((time.perf_counter() - inicio) * 1000)
+        conexion.close()
+        with lock:
+            latencias.extend(propias)
+            errores.extend(fallos)
+            estados.update(codigos)
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=trabajar) for _ in range(concurrencia)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    resultado = {
+        'peticiones': len(latencias),
+        'errores': len(errores),
+        'por_segundo': round(len(latencias) / duracion, 1) if duracion else None,
+        'estados': {str(codigo): n for codigo, n in sorted(estados.items())},
+    }
+    for p in PERCENTILES:
+        valor = percentil(latencias, p)
+        resultado[f'p{p}_ms'] = round(valor, 3) if valor is not None else None
+    return resultado
@@ -0,0 +1,102 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.monitoreo import benchmark
+from app.monitoreo.perfilado import PERCENTILES
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark por escenarios (disponibilidad, reservar, check-in/out, pagos, reportes) '
+        'con el cliente de pruebas en proceso o contra un servidor levantado (gunicorn). '
+        'Reporta percentiles de latencia, throughput y consultas SQL por escenario.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modo', choices=('proceso', 'http'), default='proceso')
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base del servidor en modo http')
+        parser.add_argument('--token', help='Token de API (por defecto, el del usuario "benchmark")')
+        parser.add_argument('--escenarios', help=f'Separados por coma (por defecto: {",".join(benchmark.ESCENARIOS)})')
+        parser.add_argument('--peticiones', type=int, default=200, help='Por escenario')
+        parser.add_argument('--concurrencia', type=int, default=8, help='Solo en modo http')
+        parser.add_argument('--generar', action='store_true', help='Genera datos sintéticos antes de medir')
+        parser.add_argument('--habitaciones', type=int, default=50)
+        parser.add_argument('--clientes', type=int, default=200)
+        parser.add_argument('--anios', type=int, default=2, help='Años de reservas y pagos históricos')
+        parser.add_argument('--semilla', type=int, default=0)
+        parser.add_argument(
+            '--conservar', action='store_true',
+            help='En modo proceso, confirma los datos generados y las escrituras (por defecto se revierten)'
+        )
+        parser.add_argument('--salida', help='Archivo donde guardar el resultado en JSON')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+
+    def handle(self, *args, **options):
+        nombres = options['escenarios'].split(',') if options['escenarios'] else list(benchmark.ESCENARIOS)
+        desconocidos = set(nombres) - set(benchmark.ESCENARIOS)
+        if desconocidos:
+            raise CommandError(f'Escenarios desconocidos: {", ".join(sorted(desconocidos))}')
+
+        resultado = {
+            'commit': benchmark.commit_actual(),
+            'fecha': timezone.now().isoformat(),
+            'modo': options['modo'],
+            'base_de_datos': connection.vendor,
+        }
+        if options['modo'] == 'http':
+            # El servidor tiene que ver los datos: aquí todo se confirma
+            resultado['escenarios'] = self._medir(nombres, options, resultado)
+        else:
+            with transaction.atomic():
+                resultado['escenarios'] = self._medir(nombres, options, resultado)
+                if not options['conservar']:
+                    transaction.set_rollback(True)
+
+        if options['salida']:
+            with open(options['salida'], 'w') as archivo:
+                json.dump(resultado, archivo, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(resultado, indent=2))
+            return
+        self._imprimir(resultado, options)
+
+    def _medir(self, nombres, options, resultado):
+        if options['generar']:
+            resultado['datos'] = benchmark.generar_datos(
+                options['habitaciones'], options['clientes'], options['anios'], options['semilla']
+            )
+        token = options['token'] or benchmark.token_benchmark()
+        contexto = benchmark.contexto()
+        escenarios = {}
+        for nombre in nombres:
+            lista = benchmark.peticiones(nombre, contexto, options['peticiones'], options['semilla'])
+            if lista is None:
+                escenarios[nombre] = None
+            elif options['modo'] == 'http':
+                escenarios[nombre] = benchmark.ejecutar_http(
+                    lista, options['url'].rstrip('/'), token, options['concurrencia']
+                )
+            else:
+                escenarios[nombre] = benchmark.ejecutar_en_proceso(lista, token)
+        return escenarios
+
+    def _imprimir(self, resultado, options):
+        self.stdout.write(
+            f'{resultado["modo"]} ({resultado["base_de_datos"]}) commit {resultado["commit"] or "?"}, '
+            f'{options["peticiones"]} peticiones por escenario'
+        )
+        if 'datos' in resultado:
+            self.stdout.write('datos generados: ' + ', '.join(f'{n} {k}' for k, n in resultado['datos'].items()))
+        for nombre, r in resultado['escenarios'].items():
+            if r is None:
+                self.stdout.write(f'{nombre:<18} omitido: no hay datos para armar las peticiones')
+                continue
+            consultas = f'   consultas p50 {r["consultas_p50"]} p95 {r["consultas_p95"]}' if 'consultas_p50' in r else ''
+            self.stdout.write(
+                f'{nombre:<18} {r["por_segundo"]:>8.1f} pet/s  errores {r["errores"]:>4}   '
+                + '   '.join(f'p{p} {r[f"p{p}_ms"]:.1f} ms' for p in PERCENTILES)
+                + consultas
+            )
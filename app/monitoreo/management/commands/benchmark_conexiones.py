@@ -0,0 +1,103 @@
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from app.monitoreo.perfilado import PERCENTILES, percentil
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el costo de abrir una conexión a PostgreSQL por petición con '
+        'reutilizarla desde un pool, con varios hilos concurrentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=8)
+        parser.add_argument('--peticiones', type=int, default=400, help='Total por modo')
+        parser.add_argument('--consulta', default='SELECT 1')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+
+    def handle(self, *args, **options):
+        conexion = connections[options['database']]
+        if conexion.vendor != 'postgresql':
+            raise CommandError('El benchmark de conexiones requiere PostgreSQL.')
+        try:
+            import psycopg
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            raise CommandError('Instale psycopg[pool] (ver requirements.txt).')
+
+        # Mismos parámetros que usa Django (host, TLS, opciones)
+        parametros = conexion.get_connection_params()
+        parametros.pop('cursor_factory', None)
+        parametros.pop('server_side_binding', None)
+        parametros['autocommit'] = True
+        consulta = options['consulta']
+
+        def sin_pool():
+            with psycopg.connect(**parametros) as c:
+                c.execute(consulta).fetchall()
+
+        pool = ConnectionPool(
+            kwargs=parametros, min_size=options['hilos'], max_size=options['hilos'],
+            check=ConnectionPool.check_connection, open=True
+        )
+        pool.wait()
+
+        def con_pool():
+            with pool.connection() as c:
+                c.execute(consulta).fetchall()
+
+        try:
+            resultados = {
+                'sin_pool': self.medir(sin_pool, options['hilos'], options['peticiones']),
+                'pool': self.medir(con_pool, options['hilos'], options['peticiones']),
+            }
+        finally:
+            pool.close()
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+        self.stdout.write(f'{options["hilos"]} hilos, {options["peticiones"]} peticiones por modo\n')
+        for modo, r in resultados.items():
+            self.stdout.write(
+                f'{modo:<10} {r["por_segundo"]:>8.0f} pet/s   '
+                + '   '.join(f'p{p} {r[f"p{p}_ms"]:.2f} ms' for p in PERCENTILES)
+            )
+
+    def medir(self, operacion, hilos, peticiones):
+        latencias = []
+        lock = threading.Lock()
+        restantes = iter(range(peticiones))
+
+        def trabajar():
+            propias = []
+            while True:
+                with lock:
+                    if next(restantes, None) is None:
+                        break
+                inicio = time.perf_counter()
+                operacion()
+                propias.append((time.perf_counter() - inicio) * 1000)
+            with lock:
+                latencias.extend(propias)
+
+        inicio = time.perf_counter()
+        trabajadores = [threading.Thread(target=trabajar) for _ in range(hilos)]
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        duracion = time.perf_counter() - inicio
+
+        latencias.sort()
+        resultado = {'por_segundo': round(peticiones / duracion, 1), 'media_ms': round(statistics.mean(latencias), 3)}
+        for p in PERCENTILES:
+            resultado[f'p{p}_ms'] = round(percentil(latencias, p), 3)
+        return resultado
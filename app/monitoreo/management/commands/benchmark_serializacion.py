@@ -0,0 +1,95 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from app.pagos.models import Pago
+from app.pagos.serializers import PagoSerializer
+from app.reportes.serializers import ReporteReservaSerializer
+from app.reservas.models import Reserva
+from app.reservas.serializers import ReservaSerializer
+from backend.relaciones import anotar_relaciones
+from backend.serializacion import JSONRapidoRenderer, compilar
+
+# nombre -> (serializer, consulta del listado)
+OBJETIVOS = {
+    'reservas': (ReservaSerializer, lambda: Reserva.objects.order_by('-fecha_inicio', '-id')),
+    'pagos': (PagoSerializer, lambda: anotar_relaciones(Pago.objects.order_by('-fecha', '-id'), PagoSerializer)),
+    'reporte_reservas': (
+        ReporteReservaSerializer, lambda: Reserva.objects.select_related('cliente', 'habitacion').order_by('id')
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara por fila el ModelSerializer de DRF con el serializador compilado '
+        '(backend/serializacion.py) en los listados de reservas, pagos y el reporte '
+        'de reservas, y el JSONRenderer de DRF con el de orjson. Verifica que la '
+        'salida sea idéntica.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=1000, help='Filas leídas por listado')
+        parser.add_argument('--repeticiones', type=int, default=5, help='Se informa la mejor')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+
+    def handle(self, *args, **options):
+        resultados = {
+            nombre: self.comparar(serializer_class, consulta, options['filas'], options['repeticiones'])
+            for nombre, (serializer_class, consulta) in OBJETIVOS.items()
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+        for nombre, r in resultados.items():
+            if not r['filas']:
+                self.stdout.write(f'{nombre:<18} sin filas')
+                continue
+            self.stdout.write(
+                f'{nombre:<18} {r["filas"]:>6} filas   DRF {r["drf_us_por_fila"]:>7.1f} µs/fila   '
+                f'compilado {r["compilado_us_por_fila"]:>6.1f} µs/fila   x{r["aceleracion"]:<5}  '
+                f'JSON {r["json_drf_us_por_fila"]:.1f} -> {r["json_rapido_us_por_fila"]:.1f} µs/fila   '
+                f'{"idéntico" if r["identicos"] else "DISTINTO"}'
+            )
+
+    def comparar(self, serializer_class, consulta, filas, repeticiones):
+        compilado = compilar(serializer_class())
+
+        def drf():
+            return serializer_class(consulta()[:filas], many=True).data
+
+        def rapido():
+            return compilado.representar(consulta().values(*compilado.rutas)[:filas])
+
+        (tiempo_drf, datos_drf), (tiempo_rapido, datos_rapido) = (
+            self.medir(drf, repeticiones), self.medir(rapido, repeticiones)
+        )
+        (json_drf, bytes_drf), (json_rapido, bytes_rapido) = (
+            self.medir(lambda: JSONRenderer().render(datos_drf), repeticiones),
+            self.medir(lambda: JSONRapidoRenderer().render(datos_rapido), repeticiones),
+        )
+        n = len(datos_drf)
+        por_fila = lambda segundos: round(segundos / n * 1e6, 2) if n else None
+        return {
+            'filas': n,
+            'drf_us_por_fila': por_fila(tiempo_drf),
+            'compilado_us_por_fila': por_fila(tiempo_rapido),
+            'aceleracion': round(tiempo_drf / tiempo_rapido, 1) if n and tiempo_rapido else None,
+            'json_drf_us_por_fila': por_fila(json_drf),
+            'json_rapido_us_por_fila': por_fila(json_rapido),
+            'identicos': [dict(f) for f in datos_drf] == datos_rapido and bytes_drf == bytes_rapido,
+        }
+
+    @staticmethod
+    def medir(operacion, repeticiones):
+        """(mejor tiempo en segundos, resultado de la última ejecución)."""
+        mejor, resultado = None, None
+        for _ in range(max(1, repeticiones)):
+            inicio = time.perf_counter()
+            resultado = operacion()
+            transcurrido = time.perf_counter() - inicio
+            mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+        return mejor, resultado
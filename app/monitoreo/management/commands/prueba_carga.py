@@ -0,0 +1,44 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.monitoreo.carga import generar_carga
+from app.monitoreo.perfilado import PERCENTILES
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga HTTP contra uno o más despliegues ya levantados, p. ej. '
+        'WSGI (gunicorn backend.wsgi) frente a ASGI (uvicorn backend.asgi:application).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'objetivos', nargs='+', metavar='NOMBRE=URL[,URL...]',
+            help='wsgi=http://127.0.0.1:8000/api/reservas/ asgi=http://127.0.0.1:8001/api/async/reservas/'
+        )
+        parser.add_argument('--token', help='Token de API (cabecera Authorization)')
+        parser.add_argument('--concurrencia', type=int, default=32)
+        parser.add_argument('--peticiones', type=int, default=1000, help='Total por objetivo')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+
+    def handle(self, *args, **options):
+        cabeceras = {'Authorization': f'Token {options["token"]}'} if options['token'] else {}
+        resultados = {}
+        for objetivo in options['objetivos']:
+            nombre, _, urls = objetivo.partition('=')
+            if not urls:
+                raise CommandError(f'Objetivo inválido: {objetivo} (use NOMBRE=URL)')
+            resultados[nombre] = generar_carga(
+                urls.split(','), options['concurrencia'], options['peticiones'], cabeceras
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+        self.stdout.write(f'concurrencia {options["concurrencia"]}, {options["peticiones"]} peticiones por objetivo\n')
+        for nombre, r in resultados.items():
+            self.stdout.write(
+                f'{nombre:<12} {r["por_segundo"]:>8.1f} pet/s  errores {r["errores"]:>4}   '
+                + '   '.join(f'p{p} {r[f"p{p}_ms"]:.1f} ms' for p in PERCENTILES)
+            )
@@ -0,0 +1,44 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.monitoreo.perfilado import reporte
+
+
+class Command(BaseCommand):
+    help = 'Resume p50/p95/p99 por endpoint a partir del archivo JSONL del middleware de perfilado.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', nargs='?', help='Por defecto PERFILADO_ARCHIVO')
+        parser.add_argument('--json', action='store_true', help='Salida en JSON')
+        parser.add_argument('--limite', type=int, default=20, help='Endpoints a mostrar')
+
+    def handle(self, *args, **options):
+        ruta = options['archivo'] or settings.PERFILADO_ARCHIVO
+        if not ruta:
+            raise CommandError('Indique el archivo o defina PERFILADO_ARCHIVO.')
+        try:
+            with open(ruta, encoding='utf-8') as archivo:
+                registros = [json.loads(linea) for linea in archivo if linea.strip()]
+        except OSError as exc:
+            raise CommandError(f'No se pudo leer {ruta}: {exc}')
+
+        filas = reporte(registros)[:options['limite']]
+        if options['json']:
+            self.stdout.write(json.dumps(filas, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f'{len(registros)} peticiones\n')
+        self.stdout.write(
+            f'{"endpoint":<40} {"n":>6} {"ms p50/p95/p99":>24} {"sql p50/p95/p99":>18} {"ms sql p95":>10}'
+        )
+        for f in filas:
+            self.stdout.write(
+                f'{f["endpoint"][:40]:<40} {f["peticiones"]:>6} '
+                f'{f["duracion_ms_p50"]:>7.1f} {f["duracion_ms_p95"]:>7.1f} {f["duracion_ms_p99"]:>8.1f} '
+                f'{f["consultas_p50"]:>5} {f["consultas_p95"]:>5} {f["consultas_p99"]:>6} '
+                f'{f["tiempo_sql_ms_p95"]:>10.1f}'
+            )
+            for repetida in f['consultas_repetidas']:
+                self.stdout.write(f'    x{repetida["veces"]} {repetida["huella"][:120]}')
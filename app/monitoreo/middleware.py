@@ -0,0 +1,57 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .perfilado import RegistroConsultas, buffer
+
+
+def nombre_endpoint(request):
+    """Vista y acción resueltas: `HabitacionViewSet.list`, `ReporteIngresosView.get`, ..."""
+    match = request.resolver_match
+    if match is None:
+        return 'sin_resolver'
+    vista = match.func
+    clase = getattr(vista, 'cls', None)
+    if clase is None:
+        return match._func_path
+    acciones = getattr(vista, 'actions', None) or {}
+    metodo = request.method.lower()
+    return f'{clase.__name__}.{acciones.get(metodo, metodo)}'
+
+
+class PerfiladoMiddleware:
+    """
+    Registra por petición la latencia, la cantidad de consultas, el tiempo en
+    SQL y las consultas repetidas. Solo se activa con PERFILADO_ACTIVO=True;
+    si no, Django lo descarta al arrancar y no agrega ningún costo.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFILADO_ACTIVO', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(registro))
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        buffer.agregar({
+            'endpoint': nombre_endpoint(request),
+            'metodo': request.method,
+            'ruta': request.path,
+            'estado': response.status_code,
+            'duracion_ms': round(duracion * 1000, 3),
+            'consultas': registro.cantidad,
+            'tiempo_sql_ms': round(registro.tiempo * 1000, 3),
+            'repetidas': registro.repetidas(),
+            'momento': time.time(),
+        })
+        return response
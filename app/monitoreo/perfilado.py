@@ -0,0 +1,104 @@
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+
+# Literales y listas IN de largo variable se reemplazan para agrupar consultas iguales
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+
+PERCENTILES = (50, 95, 99)
+
+
+def huella(sql):
+    """Forma normalizada de una consulta: misma huella = misma consulta con otros valores."""
+    sql = _LITERALES.sub('?', sql)
+    sql = _LISTAS.sub('(...)', sql)
+    return ' '.join(sql.split())
+
+
+class RegistroConsultas:
+    """execute_wrapper que cuenta y cronometra las consultas de una petición."""
+
+    def __init__(self):
+        self.cantidad = 0
+        self.tiempo = 0.0
+        self.huellas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo += time.perf_counter() - inicio
+            self.cantidad += 1
+            self.huellas[huella(sql)] += 1
+
+    def repetidas(self):
+        """Consultas con la misma huella ejecutadas más de una vez (posible N+1)."""
+        return {h: n for h, n in self.huellas.items() if n > 1}
+
+
+class BufferPerfil:
+    """
+    Últimas N peticiones perfiladas de este proceso (buffer circular). Si
+    PERFILADO_ARCHIVO está definido cada registro también se agrega como una
+    línea JSON, para analizarlo fuera del proceso con `reporte_perfilado`.
+    """
+
+    def __init__(self, tamano=None, archivo=None):
+        self.registros = deque(maxlen=tamano or getattr(settings, 'PERFILADO_TAMANO', 5000))
+        self.archivo = archivo if archivo is not None else getattr(settings, 'PERFILADO_ARCHIVO', '')
+        self._lock = threading.Lock()
+
+    def agregar(self, registro):
+        self.registros.append(registro)
+        if self.archivo:
+            linea = json.dumps(registro, ensure_ascii=False) + '\n'
+            with self._lock, open(self.archivo, 'a', encoding='utf-8') as archivo:
+                archivo.write(linea)
+
+    def reiniciar(self):
+        self.registros.clear()
+
+    def reporte(self):
+        return reporte(list(self.registros))
+
+
+buffer = BufferPerfil()
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    if not valores:
+        return None
+    indice = max(0, -(-p * len(valores) // 100) - 1)
+    return valores[indice]
+
+
+def reporte(registros):
+    """Agrupa los registros por endpoint y calcula p50/p95/p99 de cada métrica."""
+    por_endpoint = defaultdict(list)
+    for registro in registros:
+        por_endpoint[registro['endpoint']].append(registro)
+
+    resultado = []
+    for endpoint, filas in por_endpoint.items():
+        fila = {'endpoint': endpoint, 'peticiones': len(filas)}
+        for metrica in ('duracion_ms', 'consultas', 'tiempo_sql_ms'):
+            valores = sorted(f[metrica] for f in filas)
+            for p in PERCENTILES:
+                fila[f'{metrica}_p{p}'] = percentil(valores, p)
+        repetidas = Counter()
+        for f in filas:
+            repetidas.update(f.get('repetidas', {}))
+        fila['consultas_repetidas'] = [
+            {'huella': h, 'veces': n} for h, n in repetidas.most_common(3)
+        ]
+        resultado.append(fila)
+    # Primero los endpoints que más SQL generan
+    resultado.sort(key=lambda f: (f['consultas_p95'], f['duracion_ms_p95']), reverse=True)
+    return resultado
@@ -0,0 +1,94 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app.habitaciones.models import Habitacion
+from app.usuarios.models import Usuario
+from .perfilado import buffer, huella, percentil
+
+
+class HuellaTestCase(SimpleTestCase):
+    def test_normaliza_literales_y_listas(self):
+        self.assertEqual(
+            huella('SELECT * FROM t WHERE id IN (%s, %s, %s) AND n = 5'),
+            huella('SELECT * FROM t WHERE id IN (%s)  AND n = 7').replace('(%s)', '(...)')
+        )
+        self.assertEqual(huella("SELECT 'a' , 10"), 'SELECT ? , ?')
+
+    def test_percentil(self):
+        valores = list(range(1, 101))
+        self.assertEqual([percentil(valores, p) for p in (50, 95, 99)], [50, 95, 99])
+        self.assertIsNone(percentil([], 50))
+
+
+@override_settings(PERFILADO_ACTIVO=True, PERFILADO_ARCHIVO='')
+class PerfiladoMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        buffer.reiniciar()
+        self.admin = Usuario.objects.create_user(username='admin', password='pass', rol='administrador')
+        self.client.force_authenticate(user=self.admin)
+        Habitacion.objects.create(tipo='Simple', estado='disponible', precio=50.00)
+
+    def test_registra_endpoint_y_consultas(self):
+        self.client.get('/api/habitaciones/')
+        registro = buffer.registros[-1]
+        self.assertEqual(registro['endpoint'], 'HabitacionViewSet.list')
+        self.assertEqual(registro['estado'], 200)
+        self.assertGreater(registro['consultas'], 0)
+
+        response = self.client.get('/api/monitoreo/perfil/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('HabitacionViewSet.list', [f['endpoint'] for f in response.data['endpoints']])
+
+    def test_solo_administrador(self):
+        recepcion = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=recepcion)
+        response = self.client.get('/api/monitoreo/perfil/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BenchmarkConexionesTestCase(TestCase):
+    def test_compara_sin_pool_y_con_pool(self):
+        if connection.vendor != 'postgresql':
+            with self.assertRaises(CommandError):
+                call_command('benchmark_conexiones', stdout=StringIO())
+            return
+        salida = StringIO()
+        call_command('benchmark_conexiones', hilos=2, peticiones=10, json=True, stdout=salida)
+        self.assertIn('"pool"', salida.getvalue())
+
+
+class BenchmarkApiTestCase(TestCase):
+    def test_escenarios_en_proceso_con_datos_generados(self):
+        salida = StringIO()
+        call_command('benchmark_api', generar=True, habitaciones=4, clientes=5, anios=1,
+                     peticiones=3, json=True, stdout=salida)
+        resultado = json.loads(salida.getvalue())
+
+        self.assertEqual(resultado['datos']['habitaciones'], 4)
+        self.assertEqual(set(resultado['escenarios']), {
+            'disponibilidad', 'reservar', 'checkin', 'checkout', 'pagos', 'reporte_reservas', 'reporte_ingresos'
+        })
+        for nombre in ('disponibilidad', 'pagos', 'reporte_reservas', 'reporte_ingresos'):
+            r = resultado['escenarios'][nombre]
+            self.assertEqual((r['peticiones'], r['errores']), (3, 0), nombre)
+            self.assertGreater(r['consultas_p50'], 0)
+        self.assertEqual(resultado['escenarios']['reservar']['estados']['201'], 1)
+        # Sin --conservar los datos y las escrituras se revierten
+        self.assertFalse(Habitacion.objects.exists())
+
+
+class BenchmarkSerializacionTestCase(TestCase):
+    def test_salida_compilada_identica(self):
+        from .benchmark import generar_datos
+
+        generar_datos(habitaciones=3, clientes=4, anios=1)
+        salida = StringIO()
+        call_command('benchmark_serializacion', filas=50, repeticiones=1, json=True, stdout=salida)
+        for nombre, resultado in json.loads(salida.getvalue()).items():
+            self.assertEqual(resultado['filas'], 50, nombre)
+            self.assertTrue(resultado['identicos'], nombre)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import PerfilEndpointsView
+
+urlpatterns = [
+    path('perfil/', PerfilEndpointsView.as_view()),
+]
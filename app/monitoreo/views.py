@@ -0,0 +1,29 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema
+
+from app.usuarios.permissions import IsAdministrador
+from backend import cache
+
+from .perfilado import buffer
+
+
+@extend_schema(tags=['Monitoreo'])
+class PerfilEndpointsView(APIView):
+    """
+    Percentiles por endpoint de las últimas peticiones perfiladas por este
+    proceso. DELETE vacía el buffer.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdministrador]
+
+    def get(self, request):
+        return Response({
+            'registros': len(buffer.registros),
+            'endpoints': buffer.reporte(),
+            'cache_respuestas': cache.estadisticas(),
+        })
+
+    def delete(self, request):
+        buffer.reiniciar()
+        return Response(status=204)
@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import Pago
+from .models import Pago, PagoHistorico
 
 admin.site.register(Pago)
+admin.site.register(PagoHistorico)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PagoHistorico',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('fecha', models.DateTimeField()),
+                ('tipo_pago', models.CharField(choices=[('Efectivo', 'Efectivo'), ('Tarjeta', 'Tarjeta'), ('Transferencia', 'Transferencia')], max_length=50)),
+                ('estado', models.CharField(choices=[('exitoso', 'Exitoso'), ('pendiente', 'Pendiente'), ('fallido', 'Fallido')], max_length=20)),
+                ('archivado', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fecha'], name='pago_historico_fecha_idx')],
+            },
+        ),
+    ]
@@ -20,3 +20,24 @@ class Pago(models.Model):
 
     def __str__(self):
         return f'Pago #{self.id} - {self.tipo_pago} - {self.estado}'
+
+
+class PagoHistorico(models.Model):
+    """
+    Archivo frío de pagos antiguos (ver app/reservas/archivo.py). Conserva el
+    ID original; los reportes lo leen junto con Pago cuando el rango lo pide.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    monto = models.DecimalField(max_digits=10, decimal_places=2)
+    fecha = models.DateTimeField()
+    tipo_pago = models.CharField(max_length=50, choices=Pago.TIPO_PAGO_CHOICES)
+    estado = models.CharField(max_length=20, choices=Pago.ESTADO_CHOICES)
+    archivado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fecha'], name='pago_historico_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f'Pago #{self.id} (archivado) - {self.tipo_pago} - {self.estado}'
@@ -1,14 +1,12 @@
 from rest_framework import serializers
 from .models import Pago
 from app.reservas.models import Reserva
+from backend.relaciones import IdInversoField
 
 class PagoSerializer(serializers.ModelSerializer):
-    reserva_id = serializers.SerializerMethodField()
+    # Se anota en la consulta del listado (ver RelacionesMixin)
+    reserva_id = IdInversoField(Reserva, 'pago')
 
     class Meta:
         model = Pago
         fields = ['id', 'monto', 'fecha', 'tipo_pago', 'estado', 'reserva_id']
-
-    def get_reserva_id(self, obj):
-        reserva = Reserva.objects.filter(pago=obj).first()
-        return reserva.id if reserva else None
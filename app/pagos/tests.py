@@ -116,3 +116,71 @@ class PagoAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['reserva_id'], reserva.id)
+
+
+class PagoConsultasTestCase(APITestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_user(username='admin', password='adminpass', rol='administrador')
+        self.client.force_authenticate(user=self.admin)
+        self.cliente = Cliente.objects.create(
+            nombre='Cliente Consultas',
+            documento='44443333',
+            email='consultas@test.com',
+            telefono='5555555'
+        )
+        self.habitacion = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=90.00)
+
+    def _crear_pagos(self, cantidad):
+        for _ in range(cantidad):
+            pago = Pago.objects.create(monto=100.00, tipo_pago='Tarjeta', estado='exitoso')
+            Reserva.objects.create(
+                cliente=self.cliente,
+                habitacion=self.habitacion,
+                fecha_inicio=date.today(),
+                fecha_fin=date.today() + timedelta(days=1),
+                estado='finalizada',
+                pago=pago
+            )
+
+    def _consultas_del_listado(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/pagos/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(consultas), response
+
+    def test_listado_con_numero_constante_de_consultas(self):
+        self._crear_pagos(2)
+        pocas, _ = self._consultas_del_listado()
+
+        self._crear_pagos(20)
+        muchas, response = self._consultas_del_listado()
+
+        self.assertEqual(pocas, muchas)
+        self.assertLessEqual(muchas, 3)
+        reservas = dict(Reserva.objects.values_list('pago_id', 'id'))
+        for pago in response.data:
+            self.assertEqual(pago['reserva_id'], reservas[pago['id']])
+
+    def test_campos_parciales_proyectan_la_consulta(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._crear_pagos(3)
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/pagos/?fields=id,monto')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([set(pago) for pago in response.data], [{'id', 'monto'}] * 3)
+        sql = consultas.captured_queries[-1]['sql']
+        self.assertIn('"monto"', sql)
+        self.assertNotIn('"tipo_pago"', sql)
+        self.assertNotIn('reservas_reserva', sql)
+
+        response = self.client.get('/api/pagos/?exclude=fecha,estado')
+        self.assertEqual(set(response.data[0]), {'id', 'monto', 'tipo_pago', 'reserva_id'})
+        self.assertIsNotNone(response.data[0]['reserva_id'])
+
+        response = self.client.get('/api/pagos/?fields=id,numero')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -3,9 +3,12 @@ from .models import Pago
 from .serializers import PagoSerializer
 from drf_spectacular.utils import extend_schema
 from app.reservas.models import Reserva
+from backend.campos import CamposMixin
+from backend.relaciones import RelacionesMixin
+from backend.serializacion import ListadoRapidoMixin
 
 @extend_schema(tags=['Pagos'])
-class PagoViewSet(viewsets.ModelViewSet):
+class PagoViewSet(CamposMixin, RelacionesMixin, ListadoRapidoMixin, viewsets.ModelViewSet):
     """
     API REST para gestionar pagos locales: efectivo, tarjeta, etc.
     """
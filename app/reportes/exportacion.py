@@ -0,0 +1,123 @@
+import csv
+import itertools
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+# Filas leídas por viaje a la base de datos y agrupadas por escritura
+TAMANO_BLOQUE = 2000
+
+# Columna del reporte -> ruta usada en .values_list()
+CAMPOS_REPORTE_RESERVAS = {
+    'cliente_nombre': 'cliente__nombre',
+    'habitacion_tipo': 'habitacion__tipo',
+    'fecha_inicio': 'fecha_inicio',
+    'fecha_fin': 'fecha_fin',
+    'estado': 'estado',
+}
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def _formato_csv(columnas):
+    """Devuelve (cabecera, función fila -> línea)."""
+    escritor = csv.writer(_Eco())
+    return escritor.writerow(columnas), escritor.writerow
+
+
+def _formato_ndjson(columnas):
+    return '', lambda fila: json.dumps(dict(zip(columnas, fila)), default=str, ensure_ascii=False) + '\n'
+
+
+def _en_bloques(cabecera, linea, filas):
+    bloque = [cabecera] if cabecera else []
+    for fila in filas:
+        bloque.append(linea(fila))
+        if len(bloque) >= TAMANO_BLOQUE:
+            yield ''.join(bloque)
+            bloque = []
+    if bloque:
+        yield ''.join(bloque)
+
+
+async def _en_bloques_async(cabecera, linea, filas):
+    bloque = [cabecera] if cabecera else []
+    async for fila in filas:
+        bloque.append(linea(fila.values()))
+        if len(bloque) >= TAMANO_BLOQUE:
+            yield ''.join(bloque)
+            bloque = []
+    if bloque:
+        yield ''.join(bloque)
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Solo se usa para respuestas no streaming (p. ej. errores)
+        if isinstance(data, dict):
+            return json.dumps(data, default=str, ensure_ascii=False)
+        columnas = list(data[0]) if data else []
+        cabecera, linea = _formato_csv(columnas)
+        return cabecera + ''.join(linea(f.values()) for f in data)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            return json.dumps(data, default=str, ensure_ascii=False)
+        return ''.join(json.dumps(f, default=str, ensure_ascii=False) + '\n' for f in data)
+
+
+FORMATOS_STREAMING = {
+    CSVRenderer.format: (_formato_csv, CSVRenderer.media_type),
+    NDJSONRenderer.format: (_formato_ndjson, NDJSONRenderer.media_type),
+}
+
+
+def respuesta_streaming(consultas, campos, formato, nombre_archivo, asincrono=False):
+    """
+    Exporta fila a fila sin instanciar modelos ni serializers: lee cada
+    queryset de `consultas` (uno o una lista, p. ej. tabla caliente y archivo)
+    con values_list().iterator(), uno detrás de otro, y escribe en bloques de
+    TAMANO_BLOQUE. Con asincrono=True (vistas async bajo ASGI) lee con aiterator().
+    """
+    if not isinstance(consultas, (list, tuple)):
+        consultas = [consultas]
+    formateador, media_type = FORMATOS_STREAMING[formato]
+    cabecera, linea = formateador(list(campos))
+    if asincrono:
+        # values() y no values_list(): en Django 5.2 values_list().aiterator() ejecuta la
+        # consulta de forma síncrona al empezar a iterar
+        filas = _encadenar_async([
+            consulta.values(*campos.values()).aiterator(chunk_size=TAMANO_BLOQUE) for consulta in consultas
+        ])
+        contenido = _en_bloques_async(cabecera, linea, filas)
+    else:
+        filas = itertools.chain.from_iterable(
+            consulta.values_list(*campos.values()).iterator(chunk_size=TAMANO_BLOQUE) for consulta in consultas
+        )
+        contenido = _en_bloques(cabecera, linea, filas)
+
+    respuesta = StreamingHttpResponse(contenido, content_type=f'{media_type}; charset=utf-8')
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_archivo}.{formato}"'
+    return respuesta
+
+
+async def _encadenar_async(iteradores):
+    for iterador in iteradores:
+        async for fila in iterador:
+            yield fila
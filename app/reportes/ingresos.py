@@ -0,0 +1,116 @@
+from collections import defaultdict
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def _clave(pago):
+    return {
+        'fecha': timezone.localdate(pago['fecha']),
+        'tipo_pago': pago['tipo_pago'],
+        'estado': pago['estado'],
+    }
+
+
+def acumular(pago, signo, IngresoDiario=None):
+    """Suma (signo=1) o resta (signo=-1) un pago en su fila diaria con un UPDATE atómico."""
+    if IngresoDiario is None:
+        from .models import IngresoDiario
+
+    clave = _clave(pago)
+    monto = Decimal(pago['monto']) * signo
+    actualizadas = IngresoDiario.objects.filter(**clave).update(
+        total=F('total') + monto, cantidad=F('cantidad') + signo
+    )
+    if actualizadas:
+        return
+    try:
+        with transaction.atomic():
+            IngresoDiario.objects.create(total=monto, cantidad=signo, **clave)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT
+        IngresoDiario.objects.filter(**clave).update(
+            total=F('total') + monto, cantidad=F('cantidad') + signo
+        )
+
+
+def reconstruir(desde=None, hasta=None, Pago=None, IngresoDiario=None, PagoHistorico=None):
+    """
+    Recalcula las filas diarias del rango [desde, hasta] a partir de Pago y de
+    los pagos archivados en PagoHistorico (los días cerrados incluyen ambos).
+    """
+    if Pago is None:
+        from app.pagos.models import Pago, PagoHistorico
+    if IngresoDiario is None:
+        from .models import IngresoDiario
+
+    filas = IngresoDiario.objects.all()
+    if desde:
+        filas = filas.filter(fecha__gte=desde)
+    if hasta:
+        filas = filas.filter(fecha__lte=hasta)
+
+    totales = {}
+    for modelo in filter(None, (Pago, PagoHistorico)):
+        pagos = modelo.objects.annotate(dia=TruncDate('fecha'))
+        if desde:
+            pagos = pagos.filter(dia__gte=desde)
+        if hasta:
+            pagos = pagos.filter(dia__lte=hasta)
+        for t in pagos.values('dia', 'tipo_pago', 'estado').annotate(suma=Sum('monto'), n=Count('id')).order_by():
+            suma, n = totales.get((t['dia'], t['tipo_pago'], t['estado']), (0, 0))
+            totales[t['dia'], t['tipo_pago'], t['estado']] = (suma + t['suma'], n + t['n'])
+
+    with transaction.atomic():
+        filas.delete()
+        nuevas = IngresoDiario.objects.bulk_create([
+            IngresoDiario(fecha=dia, tipo_pago=tipo_pago, estado=estado, total=suma, cantidad=n)
+            for (dia, tipo_pago, estado), (suma, n) in totales.items()
+        ], batch_size=1000)
+    return len(nuevas)
+
+
+def consultas_ingresos(fecha_inicio=None, fecha_fin=None, tipo_pago=None):
+    """
+    Consultas (sin ejecutar) que devuelven filas {'tipo_pago', 'total'} cuya
+    suma es el ingreso del rango: los días cerrados salen de IngresoDiario y
+    el día en curso directamente de Pago, con un rango sobre la columna indexada.
+    """
+    from app.pagos.models import Pago
+    from .models import IngresoDiario
+
+    hoy = timezone.localdate()
+    diarios = IngresoDiario.objects.filter(fecha__lt=hoy)
+    if fecha_inicio:
+        diarios = diarios.filter(fecha__gte=fecha_inicio)
+    if fecha_fin:
+        diarios = diarios.filter(fecha__lte=fecha_fin)
+    if tipo_pago:
+        diarios = diarios.filter(tipo_pago=tipo_pago)
+    consultas = [diarios.values('tipo_pago').annotate(total=Sum('total')).order_by()]
+
+    if (not fecha_inicio or fecha_inicio <= hoy) and (not fecha_fin or fecha_fin >= hoy):
+        inicio_hoy = timezone.make_aware(datetime.combine(hoy, time.min))
+        pagos = Pago.objects.filter(fecha__gte=inicio_hoy)
+        if tipo_pago:
+            pagos = pagos.filter(tipo_pago=tipo_pago)
+        consultas.append(pagos.values('tipo_pago').annotate(total=Sum('monto')).order_by())
+    return consultas
+
+
+def resumen_ingresos(filas):
+    """Respuesta del reporte de ingresos a partir de las filas de consultas_ingresos()."""
+    por_tipo = defaultdict(Decimal)
+    for fila in filas:
+        por_tipo[fila['tipo_pago']] += fila['total']
+
+    detalle = [{'tipo_pago': tipo, 'total': total} for tipo, total in sorted(por_tipo.items()) if total]
+    total = sum((d['total'] for d in detalle), Decimal(0)) or 0
+    return {
+        "total_general": total,
+        "detalle_por_tipo": detalle
+    }
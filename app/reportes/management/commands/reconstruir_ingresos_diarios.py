@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from app.reportes.ingresos import reconstruir
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la tabla de ingresos diarios (IngresoDiario) a partir de los pagos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=date.fromisoformat, help='YYYY-MM-DD (incluido)')
+        parser.add_argument('--hasta', type=date.fromisoformat, help='YYYY-MM-DD (incluido)')
+
+    def handle(self, *args, **options):
+        filas = reconstruir(options['desde'], options['hasta'])
+        self.stdout.write(self.style.SUCCESS(f'{filas} filas diarias reconstruidas.'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngresoDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('tipo_pago', models.CharField(max_length=50)),
+                ('estado', models.CharField(max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cantidad', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('fecha', 'tipo_pago', 'estado'), name='ingreso_diario_unico')],
+            },
+        ),
+    ]
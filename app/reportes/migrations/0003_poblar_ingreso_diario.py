@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def poblar(apps, schema_editor):
+    from app.reportes.ingresos import reconstruir
+
+    reconstruir(Pago=apps.get_model('pagos', 'Pago'),
+                IngresoDiario=apps.get_model('reportes', 'IngresoDiario'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagos', '0001_initial'),
+        ('reportes', '0002_ingreso_diario'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
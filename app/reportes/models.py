@@ -8,3 +8,23 @@ class Reporte(models.Model):
 
     def __str__(self):
         return f'{self.tipo} - {self.fecha_reporte}'
+
+
+class IngresoDiario(models.Model):
+    """
+    Total de pagos por día, tipo de pago y estado. Se mantiene con señales sobre
+    Pago (ver ingresos.py) y se puede reconstruir con `reconstruir_ingresos_diarios`.
+    """
+    fecha = models.DateField()
+    tipo_pago = models.CharField(max_length=50)
+    estado = models.CharField(max_length=20)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cantidad = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['fecha', 'tipo_pago', 'estado'], name='ingreso_diario_unico'),
+        ]
+
+    def __str__(self):
+        return f'{self.fecha} - {self.tipo_pago} - {self.estado}: {self.total}'
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app.pagos.models import Pago
+from backend import senales
+from .ingresos import acumular
+
+CAMPOS_INGRESO = ('fecha', 'tipo_pago', 'estado', 'monto')
+
+
+def _valores(pago):
+    return {campo: getattr(pago, campo) for campo in CAMPOS_INGRESO}
+
+
+@receiver(pre_save, sender=Pago)
+def recordar_pago_anterior(sender, instance, raw=False, **kwargs):
+    instance._ingreso_anterior = None
+    if instance.pk and not raw and not senales.suspendidas():
+        instance._ingreso_anterior = sender.objects.filter(pk=instance.pk).values(*CAMPOS_INGRESO).first()
+
+
+@receiver(post_save, sender=Pago)
+def actualizar_ingreso_diario(sender, instance, raw=False, **kwargs):
+    if raw or senales.suspendidas():
+        return
+    anterior = getattr(instance, '_ingreso_anterior', None)
+    actual = _valores(instance)
+    if anterior == actual:
+        return
+    if anterior:
+        acumular(anterior, -1)
+    acumular(actual, 1)
+
+
+@receiver(post_delete, sender=Pago)
+def descontar_ingreso_diario(sender, instance, **kwargs):
+    if senales.suspendidas():
+        return
+    acumular(_valores(instance), -1)
@@ -8,6 +8,7 @@ from app.clientes.models import Cliente
 from app.pagos.models import Pago
 from app.reportes.models import Reporte
 from datetime import date, timedelta
+from io import StringIO
 from rest_framework.authtoken.models import Token
 
 class ReporteAPITestCase(APITestCase):
@@ -105,3 +106,133 @@ class ReporteAPITestCase(APITestCase):
         response = self.client.get(f'/api/reportes/{self.reporte.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('usuario_detalle', response.data)
+
+    def test_reporte_reservas_exportacion_streaming(self):
+        import json
+
+        response = self.client.get('/api/reportes/reservas/', {'format': 'csv', 'estado': 'activa'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lineas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lineas[0], 'cliente_nombre,habitacion_tipo,fecha_inicio,fecha_fin,estado')
+        self.assertEqual(lineas[1].split(','), [
+            'Cliente Prueba', 'Doble', str(self.reserva.fecha_inicio), str(self.reserva.fecha_fin), 'activa'
+        ])
+
+        # NDJSON: una fila JSON por línea, igual a la salida del serializer
+        esperado = self.client.get('/api/reportes/reservas/').data
+        response = self.client.get('/api/reportes/reservas/', {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        filas = [json.loads(l) for l in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(filas, [dict(f) for f in esperado])
+
+    def test_ingresos_diarios_incrementales(self):
+        from decimal import Decimal
+        from django.core.management import call_command
+        from django.utils import timezone
+        from app.reportes.models import IngresoDiario
+
+        hoy = timezone.localdate()
+        fila = lambda: IngresoDiario.objects.get(fecha=hoy, tipo_pago='Tarjeta', estado='exitoso')
+        self.assertEqual((fila().total, fila().cantidad), (Decimal('200.00'), 1))
+
+        pago = Pago.objects.create(monto=50.00, tipo_pago='Tarjeta', estado='exitoso')
+        self.assertEqual((fila().total, fila().cantidad), (Decimal('250.00'), 2))
+
+        pago.estado = 'fallido'
+        pago.save()
+        self.assertEqual(fila().total, Decimal('200.00'))
+        self.assertEqual(IngresoDiario.objects.get(estado='fallido').total, Decimal('50.00'))
+
+        pago.delete()
+        self.assertEqual(IngresoDiario.objects.get(estado='fallido').cantidad, 0)
+
+        # Un pago de hace tres días (movido sin señales) aparece tras reconstruir
+        antiguo = Pago.objects.create(monto=80.00, tipo_pago='Efectivo', estado='exitoso')
+        Pago.objects.filter(pk=antiguo.pk).update(fecha=timezone.now() - timedelta(days=3))
+        call_command('reconstruir_ingresos_diarios', stdout=StringIO())
+
+        desde = (hoy - timedelta(days=5)).strftime('%Y-%m-%d')
+        response = self.client.get('/api/reportes/ingresos/', {'fecha_inicio': desde})
+        self.assertEqual(response.data['total_general'], 280)
+        self.assertEqual(response.data['detalle_por_tipo'], [
+            {'tipo_pago': 'Efectivo', 'total': Decimal('80.00')},
+            {'tipo_pago': 'Tarjeta', 'total': Decimal('200.00')},
+        ])
+
+        hasta = (hoy - timedelta(days=1)).strftime('%Y-%m-%d')
+        response = self.client.get('/api/reportes/ingresos/', {'fecha_inicio': desde, 'fecha_fin': hasta})
+        self.assertEqual(response.data['total_general'], 80)
+
+        response = self.client.get('/api/reportes/ingresos/', {'fecha_inicio': '2024/01/01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_reportes_async_igual_que_sync(self):
+        import json
+        from asgiref.sync import sync_to_async
+
+        cabeceras = {'Authorization': f'Token {self.token.key}'}
+        esperado = await sync_to_async(lambda: self.client.get('/api/reportes/ingresos/').json())()
+        response = await self.async_client.get('/api/async/reportes/ingresos/', headers=cabeceras)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), esperado)
+
+        response = await self.async_client.get(
+            '/api/async/reportes/reservas/', {'format': 'ndjson'}, headers=cabeceras)
+        contenido = b''.join([bloque async for bloque in response.streaming_content])
+        filas = [json.loads(l) for l in contenido.decode().splitlines()]
+        self.assertEqual([f['estado'] for f in filas], ['activa'])
+
+
+class ArchivoHistoricoTestCase(APITestCase):
+    def setUp(self):
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        self.usuario = Usuario.objects.create_user(username='gerente', password='pass', rol='gerente')
+        self.client.force_authenticate(user=self.usuario)
+        cliente = Cliente.objects.create(nombre='Histórico', documento='40404040', email='h@hotel.com', telefono='1')
+        habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=120.00)
+        pago = Pago.objects.create(monto=300.00, tipo_pago='Efectivo', estado='exitoso')
+        Pago.objects.filter(pk=pago.pk).update(fecha=timezone.now().replace(year=2020, month=3, day=1))
+        call_command('reconstruir_ingresos_diarios', stdout=StringIO())
+        self.antigua = Reserva.objects.create(cliente=cliente, habitacion=habitacion, pago=pago,
+                                              fecha_inicio=date(2020, 3, 1), fecha_fin=date(2020, 3, 4),
+                                              estado='finalizada')
+        Reserva.objects.create(cliente=cliente, habitacion=habitacion, estado='activa',
+                               fecha_inicio=date.today(), fecha_fin=date.today() + timedelta(days=1))
+
+    def _ingresos_2020(self):
+        return self.client.get('/api/reportes/ingresos/', {
+            'fecha_inicio': '2020-01-01', 'fecha_fin': '2020-12-31'
+        }).data['total_general']
+
+    def test_archivar_y_reportar_caliente_mas_frio(self):
+        import json
+        from django.core.management import call_command
+        from app.pagos.models import PagoHistorico
+        from app.reservas.models import ReservaHistorica
+
+        antes = self.client.get('/api/reportes/reservas/').data
+        self.assertEqual(self._ingresos_2020(), 300)
+
+        salida = StringIO()
+        call_command('archivar_historicos', '--antes-de', '2021-01-01', '--json', stdout=salida)
+        resultado = json.loads(salida.getvalue())
+        self.assertEqual((resultado['reservas']['filas'], resultado['pagos']['filas']), (1, 1))
+        self.assertEqual(ReservaHistorica.objects.get().pago_id, self.antigua.pago_id)
+        self.assertEqual(PagoHistorico.objects.count(), 1)
+        self.assertFalse(Reserva.objects.filter(pk=self.antigua.pk).exists())
+
+        # Los reportes leen la tabla caliente y el archivo
+        self.assertEqual(sorted(map(dict, self.client.get('/api/reportes/reservas/').data), key=str),
+                         sorted(map(dict, antes), key=str))
+        response = self.client.get('/api/reportes/reservas/', {'fecha_fin': '2020-12-31', 'format': 'ndjson'})
+        filas = [json.loads(l) for l in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([f['fecha_inicio'] for f in filas], ['2020-03-01'])
+        self.assertEqual(len(self.client.get('/api/reportes/reservas/', {'estado': 'activa'}).data), 1)
+
+        # El archivo no descuenta ingresos y la reconstrucción los incluye
+        self.assertEqual(self._ingresos_2020(), 300)
+        call_command('reconstruir_ingresos_diarios', stdout=StringIO())
+        self.assertEqual(self._ingresos_2020(), 300)
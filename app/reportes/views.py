@@ -1,65 +1,104 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions
-from django.db.models import Sum
-from app.reservas.models import Reserva
-from app.pagos.models import Pago
+from rest_framework import permissions, status
+from datetime import date
+import itertools
+from app.reservas.models import Reserva, ReservaHistorica
+from app.reservas.archivo import ESTADOS_ARCHIVABLES, limite_archivo
 from app.usuarios.permissions import IsAdministrador, IsGerente
 from rest_framework import viewsets
+from rest_framework.settings import api_settings
 from .models import Reporte
+from .ingresos import consultas_ingresos, resumen_ingresos
+from .exportacion import (CSVRenderer, NDJSONRenderer, FORMATOS_STREAMING,
+                          CAMPOS_REPORTE_RESERVAS, respuesta_streaming)
 from .serializers import (ReporteSerializer, ReporteReservaSerializer, ReporteIngresoSerializer)
 from drf_spectacular.utils import extend_schema
+from backend.campos import CamposMixin
+from backend.relaciones import RelacionesMixin
+from backend.serializacion import obtener_compilado
 
 @extend_schema(tags=['Reportes'])
-class ReporteViewSet(viewsets.ModelViewSet):
+class ReporteViewSet(CamposMixin, RelacionesMixin, viewsets.ModelViewSet):
     queryset = Reporte.objects.all()
     serializer_class = ReporteSerializer
+    select_related_fields = ('usuario',)
 
-class ReporteReservasView(APIView):
-    permission_classes = [permissions.IsAuthenticated, IsAdministrador | IsGerente]
-
-    @extend_schema(tags=['Reportes'])
-    def get(self, request):
-        fecha_inicio = request.query_params.get('fecha_inicio')
-        fecha_fin = request.query_params.get('fecha_fin')
-        estado = request.query_params.get('estado')
+def consultas_reporte_reservas(parametros):
+    """
+    Consultas (sin ejecutar) de las reservas filtradas por fecha_inicio, fecha_fin
+    y estado: la tabla caliente y, solo si el rango o el estado pueden tocarlo,
+    el archivo ReservaHistorica (también lo usa la vista async).
+    """
+    fecha_inicio = parametros.get('fecha_inicio')
+    fecha_fin = parametros.get('fecha_fin')
+    estado = parametros.get('estado')
 
-        reservas = Reserva.objects.select_related('cliente', 'habitacion').all()
+    consultas = [Reserva.objects.select_related('cliente', 'habitacion').all()]
+    if _necesita_archivo(fecha_inicio, estado):
+        consultas.append(ReservaHistorica.objects.select_related('cliente', 'habitacion').all())
 
+    filtradas = []
+    for reservas in consultas:
         if fecha_inicio:
             reservas = reservas.filter(fecha_inicio__gte=fecha_inicio)
         if fecha_fin:
             reservas = reservas.filter(fecha_fin__lte=fecha_fin)
         if estado:
             reservas = reservas.filter(estado=estado)
+        filtradas.append(reservas)
+    return filtradas
 
-        serializer = ReporteReservaSerializer(reservas, many=True)
-        return Response(serializer.data)
 
+def _necesita_archivo(fecha_inicio, estado):
+    # En el archivo solo hay reservas finalizadas/canceladas que terminaron antes de su límite
+    if estado and estado not in ESTADOS_ARCHIVABLES:
+        return False
+    limite = limite_archivo()
+    if limite is None:
+        return False
+    try:
+        return not fecha_inicio or date.fromisoformat(fecha_inicio) < limite
+    except ValueError:
+        return True
 
-class ReporteIngresosView(APIView):
+
+class ReporteReservasView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsAdministrador | IsGerente]
+    # ?format=csv y ?format=ndjson exportan en streaming
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer, NDJSONRenderer]
 
     @extend_schema(tags=['Reportes'])
     def get(self, request):
-        fecha_inicio = request.query_params.get('fecha_inicio')
-        fecha_fin = request.query_params.get('fecha_fin')
-        tipo_pago = request.query_params.get('tipo_pago')
+        consultas = consultas_reporte_reservas(request.query_params)
 
-        pagos = Pago.objects.all()
+        formato = request.accepted_renderer.format
+        if formato in FORMATOS_STREAMING:
+            return respuesta_streaming(consultas, CAMPOS_REPORTE_RESERVAS, formato, 'reporte_reservas')
+
+        # Mismo resultado que ReporteReservaSerializer, desde .values() y sin instanciar modelos
+        compilado = obtener_compilado(ReporteReservaSerializer, ReporteReservaSerializer)
+        return Response(compilado.representar(itertools.chain.from_iterable(
+            consulta.values(*compilado.rutas).iterator() for consulta in consultas
+        )))
 
-        if fecha_inicio:
-            pagos = pagos.filter(fecha__date__gte=fecha_inicio)
-        if fecha_fin:
-            pagos = pagos.filter(fecha__date__lte=fecha_fin)
-        if tipo_pago:
-            pagos = pagos.filter(tipo_pago=tipo_pago)
 
-        total = pagos.aggregate(total_ingresos=Sum('monto'))['total_ingresos'] or 0
+class ReporteIngresosView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsAdministrador | IsGerente]
+
+    @extend_schema(tags=['Reportes'])
+    def get(self, request):
+        tipo_pago = request.query_params.get('tipo_pago')
+        try:
+            fecha_inicio = self._fecha(request.query_params.get('fecha_inicio'))
+            fecha_fin = self._fecha(request.query_params.get('fecha_fin'))
+        except ValueError:
+            return Response({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-        detalle = pagos.values('tipo_pago').annotate(total=Sum('monto'))
+        consultas = consultas_ingresos(fecha_inicio, fecha_fin, tipo_pago)
+        return Response(resumen_ingresos(fila for consulta in consultas for fila in consulta))
 
-        return Response({
-            "total_general": total,
-            "detalle_por_tipo": list(detalle)
-        })
+    @staticmethod
+    def _fecha(valor):
+        return date.fromisoformat(valor) if valor else None
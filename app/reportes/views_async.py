@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+
+from app.usuarios.permissions import IsAdministrador, IsGerente
+from backend.asincrono import respuesta_json, vista_async
+from .exportacion import CAMPOS_REPORTE_RESERVAS, FORMATOS_STREAMING, respuesta_streaming
+from .ingresos import consultas_ingresos, resumen_ingresos
+from .views import ReporteIngresosView, consultas_reporte_reservas
+
+
+@vista_async(IsAdministrador | IsGerente)
+async def reporte_reservas(request):
+    """Versión async de GET /api/reportes/reservas/ (?format=csv|ndjson en streaming)."""
+    consultas = await sync_to_async(consultas_reporte_reservas)(request.GET)
+
+    formato = request.GET.get('format')
+    if formato in FORMATOS_STREAMING:
+        return respuesta_streaming(consultas, CAMPOS_REPORTE_RESERVAS, formato, 'reporte_reservas', asincrono=True)
+
+    filas = []
+    for consulta in consultas:
+        filas += [dict(zip(CAMPOS_REPORTE_RESERVAS, fila))
+                  async for fila in consulta.values_list(*CAMPOS_REPORTE_RESERVAS.values())]
+    return respuesta_json(filas)
+
+
+@vista_async(IsAdministrador | IsGerente)
+async def reporte_ingresos(request):
+    """Versión async de GET /api/reportes/ingresos/."""
+    try:
+        fecha_inicio = ReporteIngresosView._fecha(request.GET.get('fecha_inicio'))
+        fecha_fin = ReporteIngresosView._fecha(request.GET.get('fecha_fin'))
+    except ValueError:
+        return respuesta_json({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'}, status=400)
+
+    consultas = consultas_ingresos(fecha_inicio, fecha_fin, request.GET.get('tipo_pago'))
+    return respuesta_json(resumen_ingresos([fila for consulta in consultas async for fila in consulta]))
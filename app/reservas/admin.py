@@ -1,4 +1,6 @@
 from django.contrib import admin
-from .models import Reserva
+from .models import Reserva, ReservaHistorica, Notificacion
 
 admin.site.register(Reserva)
+admin.site.register(ReservaHistorica)
+admin.site.register(Notificacion)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ReservasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.reservas'
+
+    def ready(self):
+        from backend.cache import conectar_invalidacion
+        from .models import Reserva
+        conectar_invalidacion(Reserva)
@@ -0,0 +1,87 @@
+import time
+from datetime import datetime, time as hora
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from app.pagos.models import Pago, PagoHistorico
+from backend import senales
+from backend.cache import invalidar_al_confirmar
+from .models import Reserva, ReservaHistorica
+
+# Solo se archivan reservas que ya no pueden cambiar de estado
+ESTADOS_ARCHIVABLES = ('finalizada', 'cancelada')
+
+CAMPOS_RESERVA = ('id', 'cliente_id', 'habitacion_id', 'pago_id', 'fecha_inicio', 'fecha_fin', 'estado')
+CAMPOS_PAGO = ('id', 'monto', 'fecha', 'tipo_pago', 'estado')
+
+
+def reservas_archivables(corte):
+    """Reservas finalizadas o canceladas que terminaron antes de `corte`."""
+    return Reserva.objects.filter(estado__in=ESTADOS_ARCHIVABLES, fecha_fin__lt=corte)
+
+
+def pagos_archivables(corte):
+    """Pagos anteriores a `corte` que ya no referencia ninguna reserva de la tabla caliente."""
+    inicio_corte = timezone.make_aware(datetime.combine(corte, hora.min))
+    return Pago.objects.filter(fecha__lt=inicio_corte).exclude(
+        Exists(Reserva.objects.filter(pago=OuterRef('pk')))
+    )
+
+
+def _mover(candidatas, destino, campos, tamano_lote):
+    """
+    Copia las filas de `candidatas` a `destino` y las borra del origen, en lotes
+    por clave primaria. Cada lote es una transacción: o queda en el archivo o
+    sigue en la tabla caliente. Devuelve (filas movidas, lotes).
+    """
+    origen = candidatas.model
+    movidas = lotes = 0
+    ultimo = 0
+    while True:
+        with transaction.atomic():
+            filas = list(
+                candidatas.filter(pk__gt=ultimo).order_by('pk').select_for_update().values(*campos)[:tamano_lote]
+            )
+            if not filas:
+                break
+            ids = [fila['id'] for fila in filas]
+            destino.objects.bulk_create([destino(**fila) for fila in filas])
+            # Sin señales: el archivo no cambia los ingresos diarios ni el estado de
+            # las habitaciones; la caché se invalida una vez por lote
+            with senales.suspender():
+                origen.objects.filter(pk__in=ids).delete()
+            invalidar_al_confirmar(origen)
+        movidas += len(ids)
+        lotes += 1
+        ultimo = ids[-1]
+    return movidas, lotes
+
+
+def archivar(corte, tamano_lote=1000):
+    """
+    Mueve al archivo frío las reservas finalizadas/canceladas que terminaron
+    antes de `corte` y, después, los pagos anteriores a `corte` que ya no
+    referencia ninguna reserva caliente. Las notificaciones de las reservas
+    archivadas quedan sin reserva (on_delete=SET_NULL). Devuelve por tabla
+    cuántas filas movió, en cuántos lotes y los segundos empleados.
+    """
+    resultado = {}
+    for nombre, candidatas, destino, campos in (
+        ('reservas', reservas_archivables(corte), ReservaHistorica, CAMPOS_RESERVA),
+        ('pagos', pagos_archivables(corte), PagoHistorico, CAMPOS_PAGO),
+    ):
+        inicio = time.perf_counter()
+        movidas, lotes = _mover(candidatas, destino, campos, tamano_lote)
+        resultado[nombre] = {
+            'filas': movidas,
+            'lotes': lotes,
+            'segundos': round(time.perf_counter() - inicio, 3),
+        }
+    return resultado
+
+
+def limite_archivo():
+    """Última fecha_fin archivada (None si el archivo está vacío); después de ella todo está en Reserva."""
+    return ReservaHistorica.objects.order_by('-fecha_fin').values_list('fecha_fin', flat=True).first()
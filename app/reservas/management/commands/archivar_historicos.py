@@ -0,0 +1,32 @@
+import json
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.reservas.archivo import archivar
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve las reservas finalizadas/canceladas y los pagos antiguos a las tablas de archivo '
+        '(ReservaHistorica, PagoHistorico) en lotes. Los reportes siguen incluyéndolos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--antes-de', type=date.fromisoformat,
+                            help='YYYY-MM-DD (por defecto, hoy menos ARCHIVO_DIAS)')
+        parser.add_argument('--lote', type=int, default=1000, help='Filas por transacción')
+        parser.add_argument('--json', action='store_true', help='Imprimir el resultado en JSON')
+
+    def handle(self, *args, **options):
+        corte = options['antes_de'] or date.today() - timedelta(days=getattr(settings, 'ARCHIVO_DIAS', 730))
+        resultado = archivar(corte, options['lote'])
+        if options['json']:
+            self.stdout.write(json.dumps(resultado))
+            return
+        for tabla, datos in resultado.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{tabla}: {datos['filas']} filas anteriores a {corte} archivadas en {datos['lotes']} lotes "
+                f"({datos['segundos']} s)."
+            ))
@@ -0,0 +1,121 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app.clientes.models import Cliente
+from app.habitaciones.models import Habitacion
+from app.reservas.models import Reserva
+
+ESTADOS_VIVOS = ['pendiente', 'activa']
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide planes de consulta y latencia de las búsquedas por rango de fechas de Reserva '
+        'con y sin los índices compuestos. Todo corre dentro de una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generar', type=int, default=0,
+                            help='Reservas sintéticas a insertar antes de medir (se revierten al terminar).')
+        parser.add_argument('--repeticiones', type=int, default=50)
+        parser.add_argument('--sin-planes', action='store_true', help='No imprimir EXPLAIN.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['generar']:
+                self._generar(options['generar'])
+
+            consultas = self._consultas()
+            despues = self._medir(consultas, 'con índices', options)
+
+            self._eliminar_indices()
+            antes = self._medir(consultas, 'sin índices', options)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write('\nLatencia (ms)            mediana antes -> después')
+        for nombre in consultas:
+            self.stdout.write(
+                f'{nombre:<24} {antes[nombre]:>13.3f} -> {despues[nombre]:.3f}'
+            )
+
+    def _consultas(self):
+        hoy = date.today()
+        inicio, fin = hoy + timedelta(days=10), hoy + timedelta(days=14)
+        habitacion_id = Habitacion.objects.values_list('id', flat=True).first()
+        return {
+            # ReservaSerializer.validate
+            'solapamiento': lambda: Reserva.objects.filter(
+                habitacion_id=habitacion_id, estado__in=ESTADOS_VIVOS,
+                fecha_inicio__lt=fin, fecha_fin__gt=inicio,
+            ),
+            # HabitacionViewSet.disponibles
+            'disponibles': lambda: Habitacion.objects.exclude(id__in=Reserva.objects.filter(
+                fecha_inicio__lt=fin, fecha_fin__gt=inicio, estado__in=ESTADOS_VIVOS,
+            ).values_list('habitacion_id', flat=True)).filter(estado='disponible'),
+            # ReporteReservasView
+            'reporte': lambda: Reserva.objects.select_related('cliente', 'habitacion').filter(
+                fecha_inicio__gte=hoy - timedelta(days=30), fecha_fin__lte=hoy, estado='finalizada',
+            ),
+        }
+
+    def _medir(self, consultas, etapa, options):
+        resultado = {}
+        for nombre, consulta in consultas.items():
+            if not options['sin_planes']:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n== {nombre} ({etapa})'))
+                self.stdout.write(self._plan(consulta(), etapa))
+            tiempos = []
+            for _ in range(options['repeticiones']):
+                t0 = time.perf_counter()
+                list(consulta())
+                tiempos.append((time.perf_counter() - t0) * 1000)
+            resultado[nombre] = statistics.median(tiempos)
+        return resultado
+
+    def _plan(self, queryset, etapa):
+        # El comentario cambia el texto de la sentencia para que SQLite no
+        # reutilice un plan preparado antes de eliminar los índices.
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} /* {etapa} */', params)
+            return '\n'.join(' '.join(str(c) for c in fila) for fila in cursor.fetchall())
+
+    def _eliminar_indices(self):
+        tabla = Reserva._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Las FK diferidas de las filas generadas impiden alterar la tabla
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            for indice in Reserva._meta.indexes:
+                cursor.execute(f'DROP INDEX IF EXISTS "{indice.name}"')
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ALTER TABLE {tabla} DROP CONSTRAINT IF EXISTS reserva_sin_solapamiento')
+
+    def _generar(self, cantidad):
+        habitaciones = Habitacion.objects.bulk_create([
+            Habitacion(tipo=random.choice(['Simple', 'Doble', 'Suite']), estado='disponible', precio=100)
+            for _ in range(max(cantidad // 200, 1))
+        ])
+        cliente = Cliente.objects.create(
+            nombre='Benchmark', documento=f'bench-{time.time_ns() % 10**12}',
+            email=f'bench{time.time_ns()}@example.com', telefono='0',
+        )
+        reservas = []
+        inicio_historia = date.today() - timedelta(days=365 * 5)
+        for habitacion in habitaciones:
+            dia = inicio_historia
+            for _ in range(cantidad // len(habitaciones)):
+                noches = random.randint(1, 5)
+                fin = dia + timedelta(days=noches)
+                estado = random.choice(['finalizada', 'cancelada']) if fin < date.today() else 'pendiente'
+                reservas.append(Reserva(cliente=cliente, habitacion=habitacion,
+                                        fecha_inicio=dia, fecha_fin=fin, estado=estado))
+                dia = fin + timedelta(days=random.randint(0, 2))
+        Reserva.objects.bulk_create(reservas, batch_size=5000)
+        self.stdout.write(f'Generadas {len(reservas)} reservas en {len(habitaciones)} habitaciones.')
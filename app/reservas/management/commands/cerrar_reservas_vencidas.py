@@ -0,0 +1,30 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from app.reservas.servicios import cerrar_vencidas
+
+ETIQUETAS = {'checkout': 'finalizadas', 'cancelar': 'canceladas'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Finaliza las reservas activas cuya fecha de fin ya pasó y cancela las pendientes '
+        'cuya fecha de inicio ya pasó. Pensado para cron (una vez por noche).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', type=date.fromisoformat, help='YYYY-MM-DD de referencia (hoy por defecto)')
+        parser.add_argument('--lote', type=int, default=1000, help='Reservas por UPDATE')
+        parser.add_argument('--json', action='store_true', help='Imprimir el resultado en JSON')
+
+    def handle(self, *args, **options):
+        resultado = cerrar_vencidas(options['fecha'], options['lote'])
+        if options['json']:
+            self.stdout.write(json.dumps(resultado))
+            return
+        for accion, datos in resultado.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{datos['reservas']} {ETIQUETAS[accion]} en {datos['lotes']} lotes ({datos['segundos']} s)."
+            ))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.reservas.notificaciones import enviar_pendientes
+
+
+class Command(BaseCommand):
+    help = 'Envía los correos pendientes de la bandeja de salida (Notificacion) por lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, help='Correos por conexión SMTP (NOTIFICACIONES_LOTE)')
+        parser.add_argument('--continuo', action='store_true', help='Seguir esperando nuevos correos')
+        parser.add_argument('--intervalo', type=float, default=5.0, help='Segundos entre consultas en modo continuo')
+
+    def handle(self, *args, **options):
+        total_enviadas = total_fallidas = 0
+        while True:
+            enviadas, fallidas = enviar_pendientes(options['lote'])
+            total_enviadas += enviadas
+            total_fallidas += fallidas
+            if enviadas or fallidas:
+                continue
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
+        self.stdout.write(self.style.SUCCESS(f'{total_enviadas} enviadas, {total_fallidas} con error.'))
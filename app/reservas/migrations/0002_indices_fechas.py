@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0001_initial'),
+        ('habitaciones', '0001_initial'),
+        ('pagos', '0001_initial'),
+        ('reservas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['habitacion', 'estado', 'fecha_inicio', 'fecha_fin'], name='reserva_hab_estado_fechas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(condition=models.Q(('estado__in', ['pendiente', 'activa'])), fields=['habitacion', 'fecha_inicio', 'fecha_fin'], name='reserva_viva_hab_fechas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(condition=models.Q(('estado__in', ['pendiente', 'activa'])), fields=['fecha_inicio', 'fecha_fin'], name='reserva_viva_fechas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['fecha_inicio', 'estado'], name='reserva_inicio_estado_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+# Restricción de exclusión: dos reservas vivas de la misma habitación no pueden
+# solaparse. Solo existe en PostgreSQL con la extensión btree_gist disponible;
+# en otro caso la validación queda en ReservaSerializer.
+
+CREAR = """
+ALTER TABLE reservas_reserva
+    ADD CONSTRAINT reserva_sin_solapamiento
+    EXCLUDE USING gist (
+        habitacion_id WITH =,
+        daterange(fecha_inicio, fecha_fin, '[)') WITH &&
+    ) WHERE (estado IN ('pendiente', 'activa'));
+"""
+
+ELIMINAR = """
+ALTER TABLE reservas_reserva DROP CONSTRAINT IF EXISTS reserva_sin_solapamiento;
+"""
+
+# Pares de reservas vivas que violarían la restricción (mismo criterio que daterange '[)')
+SOLAPADAS = """
+SELECT a.habitacion_id, a.id, b.id
+FROM reservas_reserva a
+JOIN reservas_reserva b
+    ON b.habitacion_id = a.habitacion_id AND b.id > a.id
+    AND a.fecha_inicio < b.fecha_fin AND b.fecha_inicio < a.fecha_fin
+WHERE a.estado IN ('pendiente', 'activa') AND b.estado IN ('pendiente', 'activa')
+    AND a.fecha_inicio < a.fecha_fin AND b.fecha_inicio < b.fecha_fin
+ORDER BY a.habitacion_id, a.id, b.id
+"""
+
+
+def comprobar_solapamientos(connection):
+    """
+    La validación anterior, sin bloqueo, pudo dejar pasar reservas solapadas.
+    Con alguna, ADD CONSTRAINT fallaría con un error de exclusión poco claro
+    (y una restricción EXCLUDE no admite NOT VALID): se detiene la migración
+    indicando qué reservas hay que cancelar o corregir antes de reintentarla.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(SOLAPADAS)
+        pares = cursor.fetchall()
+    if pares:
+        detalle = '\n'.join(
+            f'  habitación {habitacion}: reservas {a} y {b}' for habitacion, a, b in pares[:50]
+        )
+        resto = f'\n  ... y {len(pares) - 50} pares más' if len(pares) > 50 else ''
+        raise RuntimeError(
+            f'Hay {len(pares)} pares de reservas pendientes/activas solapadas en la misma habitación; '
+            f'cancele o corrija una de cada par y vuelva a ejecutar migrate:\n{detalle}{resto}'
+        )
+
+
+def crear_restriccion(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'")
+        if cursor.fetchone() is None:
+            return
+    comprobar_solapamientos(schema_editor.connection)
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(CREAR)
+
+
+def eliminar_restriccion(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ELIMINAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0002_indices_fechas'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_restriccion, eliminar_restriccion),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_busqueda_trigramas'),
+        ('habitaciones', '0003_poblar_estado_habitacion'),
+        ('reservas', '0004_notificacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservaHistorica',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('pago_id', models.BigIntegerField(blank=True, null=True)),
+                ('fecha_inicio', models.DateField()),
+                ('fecha_fin', models.DateField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('activa', 'Activa'), ('finalizada', 'Finalizada'), ('cancelada', 'Cancelada')], max_length=20)),
+                ('archivada', models.DateTimeField(auto_now_add=True)),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clientes.cliente')),
+                ('habitacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='habitaciones.habitacion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fecha_inicio', 'estado'], name='reserva_hist_inicio_idx'), models.Index(fields=['fecha_fin'], name='reserva_hist_fin_idx')],
+            },
+        ),
+    ]
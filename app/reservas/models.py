@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from app.clientes.models import Cliente
 from app.habitaciones.models import Habitacion
@@ -19,5 +20,83 @@ class Reserva(models.Model):
     fecha_fin = models.DateField()
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['habitacion', 'estado', 'fecha_inicio', 'fecha_fin'],
+                name='reserva_hab_estado_fechas_idx',
+            ),
+            # Índices parciales: solo las reservas vivas participan en los solapamientos
+            models.Index(
+                fields=['habitacion', 'fecha_inicio', 'fecha_fin'],
+                name='reserva_viva_hab_fechas_idx',
+                condition=models.Q(estado__in=['pendiente', 'activa']),
+            ),
+            models.Index(
+                fields=['fecha_inicio', 'fecha_fin'],
+                name='reserva_viva_fechas_idx',
+                condition=models.Q(estado__in=['pendiente', 'activa']),
+            ),
+            # Reportes por rango de fechas
+            models.Index(fields=['fecha_inicio', 'estado'], name='reserva_inicio_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"Reserva de {self.cliente.nombre} en {self.habitacion} ({self.fecha_inicio} - {self.fecha_fin})"
+
+
+class ReservaHistorica(models.Model):
+    """
+    Archivo frío de reservas finalizadas o canceladas (ver archivo.py). Conserva
+    el ID original y guarda el pago como ID simple porque también puede estar
+    archivado; los reportes lo leen junto con Reserva cuando el rango lo pide.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    cliente = models.ForeignKey(Cliente, on_delete=models.CASCADE, related_name='+')
+    habitacion = models.ForeignKey(Habitacion, on_delete=models.CASCADE, related_name='+')
+    pago_id = models.BigIntegerField(null=True, blank=True)
+    fecha_inicio = models.DateField()
+    fecha_fin = models.DateField()
+    estado = models.CharField(max_length=20, choices=Reserva.ESTADO_CHOICES)
+    archivada = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fecha_inicio', 'estado'], name='reserva_hist_inicio_idx'),
+            # Límite del archivo: los reportes lo consultan para saber si hace falta leerlo
+            models.Index(fields=['fecha_fin'], name='reserva_hist_fin_idx'),
+        ]
+
+    def __str__(self):
+        return f"Reserva #{self.id} archivada ({self.fecha_inicio} - {self.fecha_fin})"
+
+
+class Notificacion(models.Model):
+    """
+    Bandeja de salida de correos. Se escribe en la misma transacción que la
+    reserva y la envía el comando `enviar_notificaciones`, fuera de la petición.
+    """
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('enviada', 'Enviada'),
+        ('fallida', 'Fallida'),
+    ]
+
+    reserva = models.ForeignKey(Reserva, on_delete=models.SET_NULL, null=True, blank=True)
+    asunto = models.CharField(max_length=200)
+    mensaje = models.TextField()
+    destinatarios = models.JSONField(default=list)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    intentos = models.PositiveIntegerField(default=0)
+    proximo_intento = models.DateTimeField(default=timezone.now)
+    ultimo_error = models.TextField(blank=True)
+    creada = models.DateTimeField(auto_now_add=True)
+    enviada_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento'], name='notificacion_pendiente_idx'),
+        ]
+
     def __str__(self):
-        return f"Reserva de {self.cliente.nombre} en {self.habitacion} ({self.fecha_inicio} - {self.fecha_fin})"
\ No newline at end of file
+        return f"{self.asunto} ({self.estado})"
@@ -0,0 +1,124 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notificacion
+
+logger = logging.getLogger(__name__)
+
+
+def encolar_confirmacion(reserva):
+    """Agrega el correo de confirmación a la bandeja de salida (en la transacción en curso)."""
+    return Notificacion.objects.create(
+        reserva=reserva,
+        asunto='Confirmación de reserva',
+        mensaje=(
+            f'Se ha registrado una reserva para la habitación "{reserva.habitacion}" '
+            f'del {reserva.fecha_inicio} al {reserva.fecha_fin}.'
+        ),
+        destinatarios=list(settings.NOTIFICACIONES_DESTINATARIOS),
+    )
+
+
+def _espera(intentos):
+    """Backoff exponencial con jitter, acotado a NOTIFICACIONES_ESPERA_MAXIMA segundos."""
+    base = getattr(settings, 'NOTIFICACIONES_ESPERA_BASE', 60)
+    maxima = getattr(settings, 'NOTIFICACIONES_ESPERA_MAXIMA', 3600)
+    return timedelta(seconds=min(base * 2 ** (intentos - 1), maxima) * random.uniform(0.5, 1.0))
+
+
+def _reclamar(tamano_lote):
+    """
+    Toma un lote de notificaciones vencidas en una transacción corta: las
+    filas se bloquean con SKIP LOCKED solo para arrendarlas, adelantando
+    proximo_intento NOTIFICACIONES_ARRIENDO segundos y sumando el intento.
+    Si el proceso muere a mitad del envío, vuelven a la cola al vencer el
+    arriendo (y un correo con un fallo persistente agota sus intentos).
+    """
+    arriendo = timedelta(seconds=getattr(settings, 'NOTIFICACIONES_ARRIENDO', 600))
+    with transaction.atomic():
+        lote = list(
+            Notificacion.objects.select_for_update(skip_locked=True)
+            .filter(estado='pendiente', proximo_intento__lte=timezone.now())
+            .order_by('proximo_intento', 'id')[:tamano_lote]
+        )
+        if lote:
+            Notificacion.objects.filter(id__in=[n.id for n in lote]).update(
+                intentos=F('intentos') + 1, proximo_intento=timezone.now() + arriendo
+            )
+    for notificacion in lote:
+        notificacion.intentos += 1
+    return lote
+
+
+def enviar_pendientes(tamano_lote=None):
+    """
+    Envía un lote de notificaciones vencidas por una única conexión SMTP.
+    El lote se reclama y los resultados se guardan en transacciones cortas;
+    el envío ocurre fuera de ellas, sin bloqueos ni una conexión a la base
+    ociosa en transacción. Varios workers pueden vaciar la bandeja a la vez
+    sin enviar dos veces el mismo correo. Devuelve (enviadas, fallidas).
+    """
+    tamano_lote = tamano_lote or getattr(settings, 'NOTIFICACIONES_LOTE', 50)
+    max_intentos = getattr(settings, 'NOTIFICACIONES_MAX_INTENTOS', 5)
+    enviadas = fallidas = 0
+
+    lote = _reclamar(tamano_lote)
+    if not lote:
+        return 0, 0
+
+    intentadas = set()
+    conexion = get_connection(fail_silently=False)
+    try:
+        conexion.open()
+        for notificacion in lote:
+            intentadas.add(notificacion.id)
+            mensaje = EmailMessage(
+                subject=notificacion.asunto,
+                body=notificacion.mensaje,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=notificacion.destinatarios,
+                connection=conexion,
+            )
+            try:
+                conexion.send_messages([mensaje])
+            except Exception as exc:
+                fallidas += 1
+                logger.warning('No se pudo enviar la notificación %s: %s', notificacion.id, exc)
+                notificacion.ultimo_error = str(exc)[:1000]
+                if notificacion.intentos >= max_intentos:
+                    notificacion.estado = 'fallida'
+                else:
+                    notificacion.proximo_intento = timezone.now() + _espera(notificacion.intentos)
+                # La sesión SMTP puede haber quedado inutilizable
+                conexion.close()
+                conexion.open()
+            else:
+                enviadas += 1
+                notificacion.estado = 'enviada'
+                notificacion.enviada_en = timezone.now()
+                notificacion.ultimo_error = ''
+    except Exception as exc:
+        # No se pudo (re)abrir la conexión: se reprograma lo que quedó pendiente
+        logger.warning('Servidor de correo no disponible: %s', exc)
+        for notificacion in lote:
+            if notificacion.estado == 'pendiente':
+                if notificacion.id not in intentadas:
+                    # No llegó a enviarse: el intento reclamado no cuenta
+                    notificacion.intentos -= 1
+                notificacion.ultimo_error = str(exc)[:1000]
+                notificacion.proximo_intento = timezone.now() + _espera(max(notificacion.intentos, 1))
+    finally:
+        conexion.close()
+
+    with transaction.atomic():
+        Notificacion.objects.bulk_update(
+            lote, ['estado', 'intentos', 'proximo_intento', 'ultimo_error', 'enviada_en']
+        )
+    return enviadas, fallidas
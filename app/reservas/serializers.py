@@ -1,7 +1,13 @@
+from contextlib import contextmanager
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from .models import Reserva
 from datetime import date
 
+# Restricción de exclusión creada en PostgreSQL (migración 0003)
+RESTRICCION_SOLAPAMIENTO = 'reserva_sin_solapamiento'
+MENSAJE_SOLAPAMIENTO = "La habitación ya está reservada en ese período."
+
 class ReservaSerializer(serializers.ModelSerializer):
     # Campo adicional solo para entrada
     tipo_pago = serializers.CharField(write_only=True, required=False, default='Efectivo')
@@ -36,25 +42,49 @@ class ReservaSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"La habitación '{habitacion}' no está disponible actualmente.")
 
         # Validación 3: solapamiento de fechas para la misma habitación
-        reservas_solapadas = Reserva.objects.filter(
-            habitacion=habitacion,
-            estado__in=['pendiente', 'activa'],
-            fecha_inicio__lt=fecha_fin,
-            fecha_fin__gt=fecha_inicio,
-        )
-
         # Si estás editando una reserva existente, exclúyela
-        if self.instance:
-            reservas_solapadas = reservas_solapadas.exclude(id=self.instance.id)
-
-        if reservas_solapadas.exists():
-            raise serializers.ValidationError("La habitación ya está reservada en ese período.")
+        if reservas_solapadas(habitacion, fecha_inicio, fecha_fin, self.instance).exists():
+            raise serializers.ValidationError(MENSAJE_SOLAPAMIENTO)
 
         return data
 
     def create(self, validated_data):
         # Extraemos tipo_pago para no pasarlo a Reserva.objects.create
         tipo_pago = validated_data.pop('tipo_pago', 'Efectivo')
-        reserva = Reserva.objects.create(**validated_data)
+        with detectar_solapamiento():
+            reserva = Reserva.objects.create(**validated_data)
         reserva.tipo_pago = tipo_pago  # solo si lo quieres almacenar temporalmente (opcional)
-        return reserva
\ No newline at end of file
+        return reserva
+
+    def update(self, instance, validated_data):
+        with detectar_solapamiento():
+            return super().update(instance, validated_data)
+
+
+def reservas_solapadas(habitacion, fecha_inicio, fecha_fin, excluir=None):
+    """Reservas vivas de la habitación que se solapan con [fecha_inicio, fecha_fin)."""
+    reservas = Reserva.objects.filter(
+        habitacion=habitacion,
+        estado__in=['pendiente', 'activa'],
+        fecha_inicio__lt=fecha_fin,
+        fecha_fin__gt=fecha_inicio,
+    )
+    if excluir is not None:
+        reservas = reservas.exclude(id=excluir.id)
+    return reservas
+
+
+@contextmanager
+def detectar_solapamiento():
+    """
+    Ejecuta la escritura en un savepoint y traduce la violación de la
+    restricción de exclusión (la carrera que la validación previa no ve)
+    en un error de validación.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as exc:
+        if RESTRICCION_SOLAPAMIENTO in str(exc):
+            raise serializers.ValidationError(MENSAJE_SOLAPAMIENTO) from exc
+        raise
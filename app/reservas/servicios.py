@@ -0,0 +1,192 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from app.habitaciones.disponibilidad import ESTADOS_VIVOS, motor
+from app.habitaciones.estado import trasladar
+from app.habitaciones.models import Habitacion
+from backend.cache import invalidar_al_confirmar
+from .models import Reserva
+from .notificaciones import encolar_confirmacion
+from .serializers import MENSAJE_SOLAPAMIENTO, reservas_solapadas
+
+logger = logging.getLogger(__name__)
+
+# Acción -> (estado requerido, estado final)
+TRANSICIONES = {
+    'checkin': ('pendiente', 'activa'),
+    'checkout': ('activa', 'finalizada'),
+    'cancelar': ('pendiente', 'cancelada'),
+}
+
+# Reservas vencidas a una fecha: activas cuya salida ya pasó y pendientes
+# cuya llegada ya pasó (acción, filtro contra la fecha)
+VENCIDAS = (
+    ('checkout', 'fecha_fin__lt'),
+    ('cancelar', 'fecha_inicio__lt'),
+)
+
+# PostgreSQL: serialization_failure, deadlock_detected, lock_not_available
+CODIGOS_REINTENTABLES = {'40001', '40P01', '55P03'}
+
+
+class MetricasContencion:
+    """Contadores de contención del flujo de reserva (por proceso)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self._valores = {
+                'reservas_creadas': 0,
+                'rechazadas_por_solapamiento': 0,
+                'reintentos': 0,
+                'reintentos_agotados': 0,
+                'espera_bloqueo_ms_total': 0.0,
+                'espera_bloqueo_ms_max': 0.0,
+            }
+
+    def sumar(self, clave, cantidad=1):
+        with self._lock:
+            self._valores[clave] += cantidad
+
+    def registrar_espera(self, ms):
+        with self._lock:
+            self._valores['espera_bloqueo_ms_total'] += ms
+            self._valores['espera_bloqueo_ms_max'] = max(self._valores['espera_bloqueo_ms_max'], ms)
+
+    def resumen(self):
+        with self._lock:
+            return dict(self._valores)
+
+
+metricas = MetricasContencion()
+
+
+def es_reintentable(exc):
+    causa = exc.__cause__
+    codigo = getattr(causa, 'pgcode', None) or getattr(causa, 'sqlstate', None)
+    if codigo in CODIGOS_REINTENTABLES:
+        return True
+    # SQLite: "database is locked" / "database table is locked"
+    return 'locked' in str(exc)
+
+
+def crear_reserva(serializer):
+    """
+    Guarda la reserva validada por `serializer` en una transacción que bloquea
+    la fila de la habitación (SELECT ... FOR UPDATE), de modo que las reservas
+    de una misma habitación se serializan y la comprobación de solapamiento
+    bajo el bloqueo no puede quedar obsoleta. Ante fallos de serialización o
+    bloqueos reintenta con backoff exponencial acotado. La notificación de
+    confirmación queda en la bandeja de salida dentro de la misma transacción.
+    """
+    max_intentos = getattr(settings, 'RESERVAS_MAX_INTENTOS', 5)
+    espera_base = getattr(settings, 'RESERVAS_ESPERA_BASE', 0.02)
+    datos = serializer.validated_data
+
+    for intento in range(1, max_intentos + 1):
+        try:
+            with transaction.atomic():
+                inicio = time.perf_counter()
+                habitacion = Habitacion.objects.select_for_update().get(pk=datos['habitacion'].pk)
+                metricas.registrar_espera((time.perf_counter() - inicio) * 1000)
+
+                if habitacion.estado.lower() != 'disponible':
+                    raise serializers.ValidationError(
+                        f"La habitación '{habitacion}' no está disponible actualmente.")
+                if reservas_solapadas(habitacion, datos['fecha_inicio'], datos['fecha_fin']).exists():
+                    metricas.sumar('rechazadas_por_solapamiento')
+                    raise serializers.ValidationError(MENSAJE_SOLAPAMIENTO)
+
+                serializer.instance = None
+                # La señal de Reserva cuenta la reserva en EstadoHabitacion y
+                # marca la habitación como ocupada con un UPDATE de una columna
+                reserva = serializer.save(habitacion=habitacion)
+
+                # El correo se envía fuera de la petición (ver enviar_notificaciones)
+                encolar_confirmacion(reserva)
+        except DatabaseError as exc:
+            if not es_reintentable(exc):
+                raise
+            if intento == max_intentos:
+                metricas.sumar('reintentos_agotados')
+                raise
+            metricas.sumar('reintentos')
+            espera = min(espera_base * 2 ** (intento - 1), 1.0)
+            logger.info('Contención al reservar la habitación %s; reintento %s', datos['habitacion'].pk, intento)
+            time.sleep(espera * random.uniform(0.5, 1.0))
+        else:
+            metricas.sumar('reservas_creadas')
+            return reserva
+
+
+def transicionar(reservas, accion):
+    """
+    Aplica la transición `accion` (ver TRANSICIONES) a las reservas del queryset
+    que siguen en el estado requerido y devuelve sus IDs. Las filas se bloquean
+    y se cambian con un único UPDATE condicional (WHERE estado = requerido), así
+    que dos transiciones simultáneas sobre la misma reserva no pisan una a la
+    otra: la segunda no encuentra la fila en el estado de partida.
+    """
+    desde, hacia = TRANSICIONES[accion]
+    with transaction.atomic():
+        filas = list(
+            reservas.select_for_update().filter(estado=desde).order_by().values_list('id', 'habitacion_id')
+        )
+        if not filas:
+            return []
+        ids = [reserva_id for reserva_id, _ in filas]
+        Reserva.objects.filter(pk__in=ids, estado=desde).update(estado=hacia)
+
+        # update() no emite señales: proyección de habitaciones, caché y motor a mano
+        trasladar(Counter(habitacion_id for _, habitacion_id in filas), desde, hacia)
+        invalidar_al_confirmar(Reserva)
+        if hacia not in ESTADOS_VIVOS:
+            transaction.on_commit(lambda: _liberar(ids))
+    return ids
+
+
+def cerrar_vencidas(fecha=None, tamano_lote=1000):
+    """
+    Finaliza las reservas activas con fecha_fin anterior a `fecha` (hoy por
+    defecto) y cancela las pendientes con fecha_inicio anterior. Recorre cada
+    grupo en lotes por clave primaria; cada lote es una transacción corta con
+    un UPDATE condicional que también libera sus habitaciones. Devuelve por
+    acción cuántas reservas cambió, en cuántos lotes y los segundos empleados.
+    """
+    fecha = fecha or date.today()
+    resultado = {}
+    for accion, filtro in VENCIDAS:
+        desde, _ = TRANSICIONES[accion]
+        vencidas = Reserva.objects.filter(estado=desde, **{filtro: fecha}).order_by('pk')
+        inicio = time.perf_counter()
+        ultimo = 0
+        cambiadas = lotes = 0
+        while True:
+            ids = list(vencidas.filter(pk__gt=ultimo).values_list('pk', flat=True)[:tamano_lote])
+            if not ids:
+                break
+            cambiadas += len(transicionar(Reserva.objects.filter(pk__in=ids), accion))
+            lotes += 1
+            ultimo = ids[-1]
+        resultado[accion] = {
+            'reservas': cambiadas,
+            'lotes': lotes,
+            'segundos': round(time.perf_counter() - inicio, 3),
+        }
+    return resultado
+
+
+def _liberar(ids):
+    for reserva_id in ids:
+        motor.liberar(reserva_id)
@@ -1,15 +1,24 @@
 from django.urls import reverse
 from rest_framework import status
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from unittest import skipUnless
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
 from rest_framework.test import APITestCase
 from unittest.mock import patch
 from datetime import date, timedelta
+from io import StringIO
+from smtplib import SMTPException
 
 from app.clientes.models import Cliente
 from app.habitaciones.models import Habitacion
-from app.reservas.models import Reserva
+from app.reservas.models import Reserva, Notificacion
 from app.pagos.models import Pago
 from rest_framework.authtoken.models import Token
 from app.usuarios.models import Usuario
+from app.reservas.servicios import metricas
 
 class ReservaAPITestCase(APITestCase):
     def setUp(self):
@@ -135,7 +144,7 @@ class ReservaAPITestCase(APITestCase):
         )
         url = reverse('reserva-checkin', args=[reserva.id])
         response = self.client.post(url)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
 
     def test_checkout_valido(self):
         reserva = Reserva.objects.create(
@@ -165,4 +174,465 @@ class ReservaAPITestCase(APITestCase):
         )
         url = reverse('reserva-checkout', args=[reserva.id])
         response = self.client.post(url)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+
+class MigracionSolapamientoTestCase(APITestCase):
+    def test_migracion_lista_las_reservas_solapadas(self):
+        import importlib
+        from django.db import IntegrityError, transaction
+
+        migracion = importlib.import_module('app.reservas.migrations.0003_reserva_sin_solapamiento')
+        cliente = Cliente.objects.create(nombre='Migración', documento='60606060', email='m@correo.com', telefono='1')
+        habitacion = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00)
+        d = lambda n: date.today() + timedelta(days=n)
+        datos = dict(cliente=cliente, habitacion=habitacion)
+        Reserva.objects.create(fecha_inicio=d(1), fecha_fin=d(3), estado='pendiente', **datos)
+        Reserva.objects.create(fecha_inicio=d(3), fecha_fin=d(5), estado='activa', **datos)
+        Reserva.objects.create(fecha_inicio=d(2), fecha_fin=d(4), estado='cancelada', **datos)
+        migracion.comprobar_solapamientos(connection)
+
+        try:
+            with transaction.atomic():
+                solapada = Reserva.objects.create(fecha_inicio=d(2), fecha_fin=d(4), estado='pendiente', **datos)
+        except IntegrityError:
+            self.skipTest('La restricción ya existe: no se pueden crear reservas solapadas')
+        with self.assertRaisesMessage(RuntimeError, f'habitación {habitacion.id}: reservas') as error:
+            migracion.comprobar_solapamientos(connection)
+        self.assertIn(f'y {solapada.id}', str(error.exception))
+        self.assertIn('2 pares', str(error.exception))
+
+
+class BenchmarkIndicesTestCase(APITestCase):
+    def test_benchmark_revierte_los_datos_generados(self):
+        salida = StringIO()
+        call_command('benchmark_indices', generar=400, repeticiones=1, stdout=salida)
+        self.assertIn('sin índices', salida.getvalue())
+        self.assertEqual(Reserva.objects.count(), 0)
+        self.assertEqual(Habitacion.objects.count(), 0)
+
+
+class PaginacionCursorTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='paginador', password='pass')
+        self.client.force_authenticate(user=self.usuario)
+        cliente = Cliente.objects.create(nombre='Paginado', documento='10101010', email='p@correo.com', telefono='1')
+        habitacion = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00)
+        # Fechas repetidas para forzar el desempate por id
+        for i in range(7):
+            inicio = date.today() + timedelta(days=i // 2)
+            Reserva.objects.create(cliente=cliente, habitacion=habitacion, fecha_inicio=inicio,
+                                   fecha_fin=inicio + timedelta(days=1), estado='finalizada')
+
+    def _siguiente(self, response, rel):
+        import re
+
+        enlace = re.search(rf'<([^>]+)>; rel="{rel}"', response.get('Link', ''))
+        return enlace.group(1) if enlace else None
+
+    def test_recorre_todas_las_paginas_en_ambos_sentidos(self):
+        esperado = list(Reserva.objects.order_by('-fecha_inicio', '-id').values_list('id', flat=True))
+
+        response = self.client.get('/api/reservas/', {'page_size': 3, 'count': 'true'})
+        self.assertEqual(response['X-Total-Count'], '7')
+        vistos = [r['id'] for r in response.data]
+        paginas = [response]
+        while self._siguiente(response, 'next'):
+            response = self.client.get(self._siguiente(response, 'next'))
+            self.assertNotIn('X-Total-Count', response)
+            vistos += [r['id'] for r in response.data]
+            paginas.append(response)
+        self.assertEqual(vistos, esperado)
+        self.assertEqual(len(paginas), 3)
+
+        anterior = self.client.get(self._siguiente(paginas[-1], 'prev'))
+        self.assertEqual([r['id'] for r in anterior.data], [r['id'] for r in paginas[1].data])
+        self.assertIsNone(self._siguiente(paginas[0], 'prev'))
+
+    def test_cursor_invalido(self):
+        response = self.client.get('/api/reservas/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_con_valores_invalidos(self):
+        import base64
+        import json
+
+        for posicion in (['no-fecha', 1], [None, 1], ['2024-01-01', 'x']):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': posicion, 'r': 0}).encode()).decode()
+            response = self.client.get('/api/reservas/', {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, posicion)
+
+    def test_orden_por_columna_anulable(self):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from backend.paginacion import PaginacionCursor
+
+        # Algunas reservas con pago y otras sin (pago NULL)
+        reservas = list(Reserva.objects.order_by('id'))
+        for reserva, monto in zip(reservas[::2], (300, 100, 200)):
+            reserva.pago = Pago.objects.create(monto=monto)
+            reserva.save()
+
+        for orden in (('pago', 'id'), ('-pago', 'id')):
+            for valores in (False, True):
+                consulta = Reserva.objects.order_by(*orden)
+                if valores:
+                    consulta = consulta.values('id', 'pago')
+                # NULL al final en ambos sentidos; el desempate por id es ascendente
+                signo = 1 if orden[0] == 'pago' else -1
+                esperado = [r.id for r in sorted(reservas, key=lambda r: (r.pago_id is None, signo * (r.pago_id or 0), r.id))]
+
+                paginador, url, paginas = PaginacionCursor(), '/api/reservas/?page_size=2', []
+                while url:
+                    pagina = paginador.paginate_queryset(consulta, Request(APIRequestFactory().get(url)))
+                    paginas.append((url, [f['id'] if valores else f.id for f in pagina]))
+                    url = paginador.get_next_link()
+                self.assertEqual([i for _, ids in paginas for i in ids], esperado, (orden, valores))
+
+                # El enlace "prev" de la última página vuelve a la penúltima
+                url = paginas[-1][0]
+                paginador.paginate_queryset(consulta, Request(APIRequestFactory().get(url)))
+                anterior = paginador.paginate_queryset(
+                    consulta, Request(APIRequestFactory().get(paginador.get_previous_link())))
+                self.assertEqual([f['id'] if valores else f.id for f in anterior], paginas[-2][1])
+
+    def test_listado_compilado_igual_al_serializer(self):
+        from rest_framework.renderers import JSONRenderer
+        from app.reservas.serializers import ReservaSerializer
+
+        esperado = ReservaSerializer(Reserva.objects.order_by('-fecha_inicio', '-id'), many=True).data
+        response = self.client.get('/api/reservas/')
+        self.assertEqual(response.data, [dict(fila) for fila in esperado])
+        self.assertEqual(response.content, JSONRenderer().render(esperado))
+
+        response = self.client.get('/api/reservas/', {'fields': 'id,fecha_fin', 'page_size': 2})
+        self.assertEqual(response.data, [{'id': f['id'], 'fecha_fin': f['fecha_fin']} for f in esperado[:2]])
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ReservaConcurrenteTestCase(TransactionTestCase):
+    HILOS = 12
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='concurrente', password='pass', rol='recepcionista')
+        self.cliente = Cliente.objects.create(nombre='Concurrente', documento='20202020',
+                                              email='concurrente@correo.com', telefono='1')
+        self.habitaciones = [
+            Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00) for _ in range(3)
+        ]
+        metricas.reiniciar()
+
+    def _reservar(self, habitacion, resultados):
+        from django.db import connection
+        from rest_framework.test import APIClient
+
+        cliente_http = APIClient()
+        cliente_http.force_authenticate(user=self.usuario)
+        try:
+            response = cliente_http.post('/api/reservas/', {
+                'cliente': self.cliente.id,
+                'habitacion': habitacion.id,
+                'fecha_inicio': date.today() + timedelta(days=1),
+                'fecha_fin': date.today() + timedelta(days=3),
+            }, format='json')
+            resultados.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_sin_reservas_dobles_bajo_concurrencia(self):
+        import threading
+
+        resultados = []
+        hilos = [
+            threading.Thread(target=self._reservar, args=(self.habitaciones[i % 3], resultados))
+            for i in range(self.HILOS)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(resultados), self.HILOS)
+        self.assertEqual(resultados.count(status.HTTP_201_CREATED), 3)
+        self.assertEqual(resultados.count(status.HTTP_400_BAD_REQUEST), self.HILOS - 3)
+        for habitacion in self.habitaciones:
+            self.assertEqual(Reserva.objects.filter(habitacion=habitacion).count(), 1)
+        self.assertEqual(metricas.resumen()['reservas_creadas'], 3)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Fuera de SQLite lo cubre ReservaConcurrenteTestCase')
+@override_settings(RESERVAS_MAX_INTENTOS=50, RESERVAS_ESPERA_BASE=0.005)
+class ReservaConcurrenteSQLiteTestCase(TransactionTestCase):
+    """
+    La misma carrera en SQLite, que no tiene SELECT ... FOR UPDATE: los hilos
+    comparten la base en memoria y chocan con "database table is locked", que
+    crear_reserva reintenta. La validación previa del serializer (fuera del
+    reintento) se hace antes de lanzar los hilos.
+    """
+    HILOS = 12
+
+    def setUp(self):
+        self.cliente = Cliente.objects.create(nombre='Concurrente', documento='20202021',
+                                              email='concurrente-sqlite@correo.com', telefono='1')
+        self.habitaciones = [
+            Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00) for _ in range(3)
+        ]
+        metricas.reiniciar()
+
+    def _serializer(self, habitacion):
+        from app.reservas.serializers import ReservaSerializer
+
+        serializer = ReservaSerializer(data={
+            'cliente': self.cliente.id,
+            'habitacion': habitacion.id,
+            'fecha_inicio': date.today() + timedelta(days=1),
+            'fecha_fin': date.today() + timedelta(days=3),
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer
+
+    def _reservar(self, serializer, barrera, resultados):
+        from rest_framework.exceptions import ValidationError
+        from app.reservas.servicios import crear_reserva
+
+        barrera.wait()
+        try:
+            crear_reserva(serializer)
+            resultados.append('creada')
+        except ValidationError:
+            resultados.append('rechazada')
+        finally:
+            connection.close()
+
+    def test_sin_reservas_dobles_bajo_concurrencia(self):
+        import threading
+
+        serializers = [self._serializer(self.habitaciones[i % 3]) for i in range(self.HILOS)]
+        barrera, resultados = threading.Barrier(self.HILOS), []
+        hilos = [threading.Thread(target=self._reservar, args=(s, barrera, resultados)) for s in serializers]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(sorted(resultados), ['creada'] * 3 + ['rechazada'] * (self.HILOS - 3))
+        for habitacion in self.habitaciones:
+            self.assertEqual(Reserva.objects.filter(habitacion=habitacion).count(), 1)
+        resumen = metricas.resumen()
+        self.assertEqual(resumen['reservas_creadas'], 3)
+        self.assertGreater(resumen['reintentos'], 0)
+        self.assertEqual(resumen['reintentos_agotados'], 0)
+
+
+@override_settings(RESERVAS_MAX_INTENTOS=3, RESERVAS_ESPERA_BASE=0)
+class ReintentoReservaTestCase(APITestCase):
+    def setUp(self):
+        from app.reservas.serializers import ReservaSerializer
+
+        cliente = Cliente.objects.create(nombre='Reintento', documento='30303030', email='r@correo.com', telefono='1')
+        self.habitacion = Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00)
+        self.serializer = ReservaSerializer(data={
+            'cliente': cliente.id,
+            'habitacion': self.habitacion.id,
+            'fecha_inicio': date.today() + timedelta(days=1),
+            'fecha_fin': date.today() + timedelta(days=3),
+        })
+        self.serializer.is_valid(raise_exception=True)
+        metricas.reiniciar()
+
+    def _con_bloqueos(self, *efectos):
+        return patch.object(Habitacion.objects, 'select_for_update', side_effect=efectos)
+
+    def test_reintenta_bloqueos_y_crea(self):
+        from django.db import DatabaseError
+        from app.reservas.servicios import crear_reserva
+
+        bloqueo = DatabaseError('database is locked')
+        with self._con_bloqueos(bloqueo, bloqueo, Habitacion.objects.select_for_update()):
+            reserva = crear_reserva(self.serializer)
+        self.assertEqual(Reserva.objects.get().id, reserva.id)
+        resumen = metricas.resumen()
+        self.assertEqual((resumen['reintentos'], resumen['reintentos_agotados'], resumen['reservas_creadas']), (2, 0, 1))
+
+    def test_reintentos_agotados_y_errores_no_reintentables(self):
+        from django.db import DatabaseError
+        from app.reservas.servicios import crear_reserva
+
+        with self._con_bloqueos(*[DatabaseError('database is locked')] * 3), self.assertRaises(DatabaseError):
+            crear_reserva(self.serializer)
+        resumen = metricas.resumen()
+        self.assertEqual((resumen['reintentos'], resumen['reintentos_agotados']), (2, 1))
+
+        metricas.reiniciar()
+        with self._con_bloqueos(DatabaseError('disk I/O error')), self.assertRaises(DatabaseError):
+            crear_reserva(self.serializer)
+        self.assertEqual(metricas.resumen()['reintentos'], 0)
+        self.assertFalse(Reserva.objects.exists())
+
+
+class TransicionReservaTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.cliente = Cliente.objects.create(nombre='Transicion', documento='30303030',
+                                              email='transicion@correo.com', telefono='1')
+        self.hoy = date.today()
+        self.habitaciones = [
+            Habitacion.objects.create(tipo='Doble', estado='disponible', precio=100.00) for _ in range(3)
+        ]
+        self.reservas = [
+            Reserva.objects.create(cliente=self.cliente, habitacion=habitacion, estado='activa',
+                                   fecha_inicio=self.hoy - timedelta(days=2), fecha_fin=self.hoy + timedelta(days=i))
+            for i, habitacion in enumerate(self.habitaciones)
+        ]
+
+    def test_transicion_repetida_devuelve_409(self):
+        url = f'/api/reservas/{self.reservas[0].id}/checkout/'
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('error', response.data)
+        self.assertEqual(self.client.post('/api/reservas/999999/checkout/').status_code, status.HTTP_404_NOT_FOUND)
+
+        self.habitaciones[0].refresh_from_db()
+        self.assertEqual(self.habitaciones[0].estado, 'disponible')
+
+    def test_checkout_masivo(self):
+        url = '/api/reservas/checkout-masivo/'
+        # Por fecha: las que terminan hoy o antes
+        response = self.client.post(url, {'fecha_fin': self.hoy.isoformat()}, format='json')
+        self.assertEqual(response.data, {'finalizadas': [self.reservas[0].id]})
+
+        ids = [r.id for r in self.reservas]
+        response = self.client.post(url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'finalizadas': ids[1:], 'rechazadas': ids[:1]})
+        self.assertEqual(Reserva.objects.filter(estado='finalizada').count(), 3)
+        self.assertEqual(Habitacion.objects.filter(estado='disponible').count(), 3)
+
+        for datos in [{}, {'ids': 'x'}, {'fecha_fin': '2024/01/01'}]:
+            response = self.client.post(url, datos, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cierre_nocturno_de_vencidas(self):
+        import json
+
+        pendiente = Reserva.objects.create(cliente=self.cliente, habitacion=self.habitaciones[0],
+                                           fecha_inicio=self.hoy + timedelta(days=1),
+                                           fecha_fin=self.hoy + timedelta(days=3))
+        salida = StringIO()
+        fecha = (self.hoy + timedelta(days=2)).isoformat()
+        call_command('cerrar_reservas_vencidas', '--fecha', fecha, '--lote', '1', '--json', stdout=salida)
+        resultado = json.loads(salida.getvalue())
+        self.assertEqual((resultado['checkout']['reservas'], resultado['checkout']['lotes']), (2, 2))
+        self.assertEqual(resultado['cancelar']['reservas'], 1)
+
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, 'cancelada')
+        self.assertEqual(
+            list(Habitacion.objects.order_by('id').values_list('estado', flat=True)),
+            ['disponible', 'disponible', 'ocupada']
+        )
+
+
+class BackendCorreoCaido(BaseEmailBackend):
+    """Backend de prueba que rechaza todos los envíos."""
+
+    def send_messages(self, email_messages):
+        raise SMTPException('servidor no disponible')
+
+
+class BackendCorreoReentrante(BaseEmailBackend):
+    """Backend de prueba que, durante el envío, intenta vaciar la bandeja otra vez."""
+    durante_el_envio = []
+
+    def send_messages(self, email_messages):
+        from app.reservas.notificaciones import enviar_pendientes
+
+        self.durante_el_envio.append(
+            (enviar_pendientes(), list(Notificacion.objects.values_list('estado', 'intentos')))
+        )
+        return len(email_messages)
+
+
+class NotificacionReservaTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.client.force_authenticate(user=self.usuario)
+        self.cliente = Cliente.objects.create(nombre='Correo', documento='44440000', email='c@prueba.com', telefono='1')
+        self.habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=150.00)
+
+    def crear_reserva(self):
+        response = self.client.post('/api/reservas/', {
+            'cliente': self.cliente.id,
+            'habitacion': self.habitacion.id,
+            'fecha_inicio': date.today() + timedelta(days=1),
+            'fecha_fin': date.today() + timedelta(days=3),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_reserva_encola_y_el_worker_envia(self):
+        self.crear_reserva()
+        self.assertEqual(len(mail.outbox), 0)
+        notificacion = Notificacion.objects.get()
+        self.assertEqual(notificacion.estado, 'pendiente')
+
+        call_command('enviar_notificaciones', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(str(self.habitacion), mail.outbox[0].body)
+        notificacion.refresh_from_db()
+        self.assertEqual((notificacion.estado, notificacion.intentos), ('enviada', 1))
+
+    @override_settings(EMAIL_BACKEND='app.reservas.tests.BackendCorreoCaido', NOTIFICACIONES_MAX_INTENTOS=2)
+    def test_reintentos_con_backoff(self):
+        from django.utils import timezone
+
+        self.crear_reserva()
+        call_command('enviar_notificaciones', stdout=StringIO())
+        notificacion = Notificacion.objects.get()
+        self.assertEqual((notificacion.estado, notificacion.intentos), ('pendiente', 1))
+        self.assertGreater(notificacion.proximo_intento, timezone.now())
+        self.assertIn('servidor no disponible', notificacion.ultimo_error)
+
+        Notificacion.objects.update(proximo_intento=timezone.now())
+        call_command('enviar_notificaciones', stdout=StringIO())
+        notificacion.refresh_from_db()
+        self.assertEqual((notificacion.estado, notificacion.intentos), ('fallida', 2))
+
+
+    @override_settings(EMAIL_BACKEND='app.reservas.tests.BackendCorreoReentrante')
+    def test_lote_arrendado_durante_el_envio(self):
+        self.crear_reserva()
+        BackendCorreoReentrante.durante_el_envio.clear()
+        call_command('enviar_notificaciones', stdout=StringIO())
+        # Otro worker no vuelve a tomar el lote; el intento ya quedó registrado
+        self.assertEqual(BackendCorreoReentrante.durante_el_envio, [((0, 0), [('pendiente', 1)])])
+        self.assertEqual(Notificacion.objects.get().estado, 'enviada')
+
+
+class ReservaAsyncTestCase(APITestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='recepcion', password='pass', rol='recepcionista')
+        self.token = Token.objects.create(user=self.usuario)
+        cliente = Cliente.objects.create(nombre='Async', documento='33330000', email='a@prueba.com', telefono='1')
+        habitacion = Habitacion.objects.create(tipo='Suite', estado='disponible', precio=150.00)
+        for dias in range(5):
+            Reserva.objects.create(cliente=cliente, habitacion=habitacion,
+                                   fecha_inicio=date(2030, 1, 1) + timedelta(days=dias * 3),
+                                   fecha_fin=date(2030, 1, 2) + timedelta(days=dias * 3))
+
+    async def test_listado_async_igual_al_sincrono(self):
+        cabeceras = {'Authorization': f'Token {self.token.key}'}
+        parametros = {'page_size': 2, 'fecha_inicio': '2030-01-04', 'count': 'true'}
+        sincrona = await self.async_client.get('/api/reservas/', parametros, headers=cabeceras)
+        asincrona = await self.async_client.get('/api/async/reservas/', parametros, headers=cabeceras)
+        self.assertEqual(asincrona.status_code, status.HTTP_200_OK)
+        self.assertEqual(asincrona.json(), sincrona.json())
+        self.assertEqual(asincrona['X-Total-Count'], '4')
+        self.assertEqual(asincrona['Link'].replace('/async', ''), sincrona['Link'])
+
+    async def test_requiere_token_valido(self):
+        response = await self.async_client.get('/api/async/reservas/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get('/api/async/reservas/', headers={'Authorization': 'Token x'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
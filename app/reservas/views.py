@@ -2,18 +2,35 @@ from rest_framework import viewsets, filters, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.core.mail import send_mail
+from django.db import transaction
 from django.conf import settings
+from django.http import Http404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_yasg import openapi
+from datetime import date
 
 from .models import Reserva
 from .serializers import ReservaSerializer
 from .filters import ReservaFilter
+from .servicios import crear_reserva, metricas, transicionar
 from app.pagos.models import Pago
+from app.habitaciones.disponibilidad import motor
+from app.usuarios.permissions import IsAdministrador
+from backend.campos import CamposMixin
+from backend.condicional import CondicionalMixin
+from backend.serializacion import ListadoRapidoMixin
+
+MENSAJES_TRANSICION = {
+    'checkin': 'Check-in realizado correctamente.',
+    'checkout': 'Check-out realizado correctamente.',
+}
+ERRORES_TRANSICION = {
+    'checkin': 'Solo se puede hacer check-in si la reserva está pendiente.',
+    'checkout': 'Solo se puede hacer check-out si la reserva está activa.',
+}
 
 @extend_schema(tags=['Reservas'])
-class ReservaViewSet(viewsets.ModelViewSet):
+class ReservaViewSet(CondicionalMixin, CamposMixin, ListadoRapidoMixin, viewsets.ModelViewSet):
     queryset = Reserva.objects.all().order_by('-fecha_inicio')
     serializer_class = ReservaSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -35,7 +52,8 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         #tipo_pago = self.request.data.get('tipo_pago', 'Efectivo')
-        reserva = serializer.save()
+        # Bloquea la habitación, revalida el solapamiento y la marca como ocupada
+        reserva = crear_reserva(serializer)
 
         # # Crear el pago automáticamente
         # pago = Pago.objects.create(
@@ -47,50 +65,82 @@ class ReservaViewSet(viewsets.ModelViewSet):
         # reserva.pago = pago
         # reserva.save()
 
-        # Marcar habitación como ocupada
-        habitacion = reserva.habitacion
-        habitacion.estado = 'ocupada'
-        habitacion.save()
-
-        # Enviar correo de notificación
-        # send_mail(
-        #     subject='Confirmación de reserva y pago',
-        #     message=f'Se ha registrado una reserva para la habitación "{reserva.habitacion}" '
-        #             f'del {reserva.fecha_inicio} al {reserva.fecha_fin}.\n'
-        #             f'Monto: ${pago.monto} - Tipo de pago: {pago.tipo_pago}',
-        #     from_email=settings.DEFAULT_FROM_EMAIL,
-        #     recipient_list=['jloorm2003@gmail.com', 'jloorm4@gmail.com'],
-        #     fail_silently=True,
-        # )
+        transaction.on_commit(lambda: motor.registrar(reserva))
+
+        # El correo de confirmación quedó encolado en Notificacion junto con la
+        # reserva; lo envía `manage.py enviar_notificaciones`.
 
     def perform_destroy(self, instance):
-        habitacion = instance.habitacion
+        # La señal de Reserva descuenta la proyección y rederiva el estado de la habitación
+        reserva_id = instance.id
         instance.delete()
-        habitacion.estado = 'disponible'
-        habitacion.save()
+
+        transaction.on_commit(lambda: motor.liberar(reserva_id))
 
     @action(detail=True, methods=['post'])
     def checkin(self, request, pk=None):
-        reserva = self.get_object()
-        if reserva.estado != 'pendiente':
-            return Response({'error': 'Solo se puede hacer check-in si la reserva está pendiente.'},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        reserva.estado = 'activa'
-        reserva.save()
-        reserva.habitacion.estado = 'ocupada'
-        reserva.habitacion.save()
-        return Response({'mensaje': 'Check-in realizado correctamente.'})
+        return self._transicion(pk, 'checkin')
 
     @action(detail=True, methods=['post'])
     def checkout(self, request, pk=None):
-        reserva = self.get_object()
-        if reserva.estado != 'activa':
-            return Response({'error': 'Solo se puede hacer check-out si la reserva está activa.'},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        reserva.estado = 'finalizada'
-        reserva.save()
-        reserva.habitacion.estado = 'disponible'
-        reserva.habitacion.save()
-        return Response({'mensaje': 'Check-out realizado correctamente.'})
+        return self._transicion(pk, 'checkout')
+
+    def _transicion(self, pk, accion):
+        """Transición de una reserva sin cargarla: 409 si ya no está en el estado requerido."""
+        try:
+            reservas = self.get_queryset().filter(pk=int(pk))
+        except (TypeError, ValueError):
+            raise Http404
+        if transicionar(reservas, accion):
+            return Response({'mensaje': MENSAJES_TRANSICION[accion]})
+        if not reservas.exists():
+            raise Http404
+        return Response({'error': ERRORES_TRANSICION[accion]}, status=status.HTTP_409_CONFLICT)
+
+    @extend_schema(
+        request={'application/json': {
+            'type': 'object',
+            'properties': {
+                'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                'fecha_fin': {'type': 'string', 'description': 'YYYY-MM-DD: reservas activas que terminan ese día o antes'},
+            },
+        }},
+    )
+    @action(detail=False, methods=['post'], url_path='checkout-masivo')
+    def checkout_masivo(self, request):
+        """
+        Check-out de varias reservas en una sola transacción (cierre del día):
+        por `ids` o todas las activas con `fecha_fin` hasta la fecha indicada.
+        Las que no estaban activas se devuelven en `rechazadas`.
+        """
+        ids = request.data.get('ids')
+        fecha_fin = request.data.get('fecha_fin')
+        if ids is None and not fecha_fin:
+            return Response({'error': 'Debe indicar ids o fecha_fin.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        reservas = self.get_queryset()
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+                return Response({'error': 'ids debe ser una lista de enteros.'}, status=status.HTTP_400_BAD_REQUEST)
+            maximo = getattr(settings, 'CARGA_MASIVA_MAXIMO', 10000)
+            if len(ids) > maximo:
+                return Response({'error': f'Se admiten como máximo {maximo} reservas.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            reservas = reservas.filter(pk__in=ids)
+        if fecha_fin:
+            try:
+                reservas = reservas.filter(fecha_fin__lte=date.fromisoformat(fecha_fin))
+            except (TypeError, ValueError):
+                return Response({'error': 'Formato de fecha inválido. Use YYYY-MM-DD'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        finalizadas = transicionar(reservas, 'checkout')
+        respuesta = {'finalizadas': sorted(finalizadas)}
+        if ids is not None:
+            respuesta['rechazadas'] = sorted(set(ids) - set(finalizadas))
+        return Response(respuesta)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdministrador])
+    def contencion(self, request):
+        """Métricas de contención del flujo de reserva en este proceso."""
+        return Response(metricas.resumen())
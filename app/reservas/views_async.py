@@ -0,0 +1,32 @@
+from backend.asincrono import respuesta_json, vista_async
+from backend.paginacion import PaginacionCursor
+from .filters import ReservaFilter
+from .models import Reserva
+
+# Mismas claves que ReservaSerializer (las FK como id)
+CAMPOS_RESERVA = {
+    'id': 'id',
+    'cliente': 'cliente_id',
+    'habitacion': 'habitacion_id',
+    'pago': 'pago_id',
+    'fecha_inicio': 'fecha_inicio',
+    'fecha_fin': 'fecha_fin',
+    'estado': 'estado',
+}
+
+
+@vista_async()
+async def listar_reservas(request):
+    """
+    Versión async de GET /api/reservas/: mismos filtros (ReservaFilter),
+    orden y paginación por cursor; no admite ?search=.
+    """
+    filtro = ReservaFilter(request.GET, queryset=Reserva.objects.order_by('-fecha_inicio'))
+    if not filtro.is_valid():
+        return respuesta_json({campo: list(errores) for campo, errores in filtro.errors.items()}, status=400)
+
+    reservas = filtro.qs.values(*CAMPOS_RESERVA.values())
+    paginador = PaginacionCursor()
+    filas = await paginador.apaginate_queryset(reservas, request)
+    datos = [{clave: fila[campo] for clave, campo in CAMPOS_RESERVA.items()} for fila in filas]
+    return respuesta_json(datos, headers=paginador.cabeceras())
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.usuarios'
+
+    def ready(self):
+        from . import signals  # noqa: F401
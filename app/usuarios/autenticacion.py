@@ -0,0 +1,88 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .models import Usuario
+
+# Campos del usuario que se guardan por token, en el orden del modelo (from_db)
+CAMPOS = ('id', 'is_superuser', 'is_staff', 'is_active', 'rol')
+
+
+def _ttl():
+    return getattr(settings, 'TOKEN_CACHE_TTL', 0)
+
+
+def _clave(token):
+    # El token no va en claro a una caché que puede ser compartida
+    return 'token:' + hashlib.sha256(token.encode()).hexdigest()
+
+
+def _consulta(token):
+    return Token.objects.filter(key=token).values_list(*(f'user__{campo}' for campo in CAMPOS))
+
+
+def _usuario(fila):
+    """
+    Usuario con solo CAMPOS cargados: los permisos leen el rol sin consultar la
+    base; cualquier otro campo se carga al accederlo.
+    """
+    return Usuario.from_db(router.db_for_read(Usuario), CAMPOS, fila)
+
+
+def _resolver(token, fila):
+    if fila is None:
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+    usuario = _usuario(fila)
+    if not usuario.is_active:
+        raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+    return usuario, Token(key=token, user=usuario)
+
+
+def usuario_de_token(token):
+    """(usuario, token) de una clave de API, desde la caché o con una consulta."""
+    ttl = _ttl()
+    fila = cache.get(_clave(token)) if ttl else None
+    if fila is None:
+        fila = _consulta(token).first()
+        if fila is not None and ttl:
+            cache.set(_clave(token), fila, ttl)
+    return _resolver(token, fila)
+
+
+async def ausuario_de_token(token):
+    """Versión async de usuario_de_token()."""
+    ttl = _ttl()
+    fila = await cache.aget(_clave(token)) if ttl else None
+    if fila is None:
+        fila = await _consulta(token).afirst()
+        if fila is not None and ttl:
+            await cache.aset(_clave(token), fila, ttl)
+    return _resolver(token, fila)
+
+
+def olvidar_tokens(*tokens):
+    """Borra los tokens de la caché ahora y al confirmar la transacción en curso."""
+    claves = [_clave(token) for token in tokens]
+    if claves:
+        cache.delete_many(claves)
+        transaction.on_commit(lambda: cache.delete_many(claves))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication que guarda token -> (id, rol, is_active, is_superuser,
+    is_staff) en la caché durante TOKEN_CACHE_TTL segundos: una petición
+    autenticada no consulta la base. Las entradas se borran al eliminar el
+    token (logout) y al guardar el usuario (ver signals.py). Necesita una caché
+    compartida entre workers: con locmem el TTL es 0 por defecto y cada
+    petición consulta la base.
+    """
+
+    def authenticate_credentials(self, key):
+        return usuario_de_token(key)
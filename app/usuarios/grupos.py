@@ -0,0 +1,32 @@
+from django.contrib.auth.models import Group
+
+# rol -> id del Group, resuelto una vez por proceso (ver signals.py para la invalidación)
+_ids = {}
+
+
+def grupo_de_rol(rol):
+    """Id del grupo con el nombre del rol, o None si no existe."""
+    if rol not in _ids:
+        _ids[rol] = Group.objects.filter(name=rol).values_list('id', flat=True).first()
+    return _ids[rol]
+
+
+def olvidar():
+    _ids.clear()
+
+
+def asignar_grupos(usuarios, reemplazar=False):
+    """
+    Deja a cada usuario en el grupo de su rol con un solo bulk_create en la
+    tabla intermedia. Con `reemplazar` primero borra los grupos que tenían.
+    """
+    from .models import Usuario
+
+    Intermedia = Usuario.groups.through
+    if reemplazar:
+        Intermedia.objects.filter(usuario_id__in=[u.pk for u in usuarios]).delete()
+    Intermedia.objects.bulk_create([
+        Intermedia(usuario_id=usuario.pk, group_id=grupo)
+        for usuario in usuarios
+        if usuario.rol and (grupo := grupo_de_rol(usuario.rol)) is not None
+    ], ignore_conflicts=True)
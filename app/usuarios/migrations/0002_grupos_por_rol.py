@@ -0,0 +1,29 @@
+from django.db import migrations
+
+ROLES = ('administrador', 'recepcionista', 'gerente')
+
+
+def crear_grupos(apps, schema_editor):
+    """Un grupo por rol y cada usuario existente en el de su rol."""
+    Group = apps.get_model('auth', 'Group')
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    Intermedia = Usuario.groups.through
+
+    for rol in ROLES:
+        grupo, _ = Group.objects.get_or_create(name=rol)
+        Intermedia.objects.bulk_create([
+            Intermedia(usuario_id=usuario_id, group_id=grupo.id)
+            for usuario_id in Usuario.objects.filter(rol=rol).values_list('id', flat=True)
+        ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_grupos, migrations.RunPython.noop),
+    ]
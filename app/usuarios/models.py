@@ -1,7 +1,8 @@
 # usuarios/models.py
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.contrib.auth.models import Group
+
+from . import grupos
 
 class Usuario(AbstractUser):
     ROLES = (
@@ -11,7 +12,14 @@ class Usuario(AbstractUser):
     )
     rol = models.CharField(max_length=20, choices=ROLES)
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        usuario = super().from_db(db, field_names, values)
+        # Rol leído de la base: save() solo vuelve a asignar el grupo si cambia
+        usuario._rol_guardado = usuario.__dict__.get('rol')
+        return usuario
+
+    def aplicar_rol(self):
         # Asignación automática de permisos
         if self.rol == 'administrador':
             self.is_staff = True
@@ -20,13 +28,15 @@ class Usuario(AbstractUser):
             self.is_staff = True
             self.is_superuser = False
 
+    def save(self, *args, **kwargs):
+        self.aplicar_rol()
+
         # Guardar el usuario
         super().save(*args, **kwargs)
 
-        # Asignar grupo correspondiente
-        if self.rol:
-            try:
-                grupo = Group.objects.get(name=self.rol)
+        # Asignar grupo correspondiente (no en cada login ni en guardados sin cambio de rol)
+        if self.rol and self.rol != getattr(self, '_rol_guardado', None):
+            grupo = grupos.grupo_de_rol(self.rol)
+            if grupo is not None:
                 self.groups.set([grupo])
-            except Group.DoesNotExist:
-                pass
\ No newline at end of file
+        self._rol_guardado = self.rol
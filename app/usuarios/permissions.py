@@ -1,5 +1,8 @@
 from rest_framework import permissions
 
+# Solo leen rol e is_superuser, que CachedTokenAuthentication trae de la caché:
+# comprobar permisos no consulta la base.
+
 class IsAdministrador(permissions.BasePermission):
     def has_permission(self, request, view):
         return bool(
@@ -1,3 +1,4 @@
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
 from .models import Usuario
 
@@ -14,3 +15,15 @@ class UsuarioSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+class UsuarioCargaMasivaSerializer(UsuarioSerializer):
+    """
+    Para POST /api/usuarios/bulk/: la unicidad del username se resuelve por
+    lote en UsuarioViewSet.resolver_lote y la contraseña es opcional (sin ella
+    el usuario no puede iniciar sesión hasta que se le asigne una).
+    """
+    password = serializers.CharField(write_only=True, required=False)
+
+    class Meta(UsuarioSerializer.Meta):
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
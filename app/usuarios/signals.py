@@ -0,0 +1,27 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import grupos
+from .autenticacion import olvidar_tokens
+from .models import Usuario
+
+
+@receiver(post_save, sender=Usuario)
+def olvidar_tokens_del_usuario(sender, instance, raw=False, update_fields=None, **kwargs):
+    # El login solo actualiza last_login, que no está en la caché
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    olvidar_tokens(*Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+
+
+@receiver(post_delete, sender=Token)
+def olvidar_token_eliminado(sender, instance, **kwargs):
+    olvidar_tokens(instance.key)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def olvidar_grupos(sender, **kwargs):
+    grupos.olvidar()
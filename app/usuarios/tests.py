@@ -1,9 +1,11 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from .models import Usuario
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import Group
+from . import grupos
 
 class UsuarioAPITestCase(APITestCase):
     def setUp(self):
@@ -105,3 +107,79 @@ class UsuarioAPITestCase(APITestCase):
         url = reverse('usuario-detail', args=[self.admin.id])
         response = self.client.patch(url, {'first_name': 'Denegado'}, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(TOKEN_CACHE_TTL=300)
+class CachedTokenAuthenticationTestCase(APITestCase):
+    url = '/api/monitoreo/perfil/'
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username='cacheado', password='x', rol='administrador')
+        self.token = Token.objects.create(user=self.usuario)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_rol_en_cache_sin_consultas(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_guardar_usuario_invalida_el_rol(self):
+        self.client.get(self.url)
+        self.usuario.rol = 'recepcionista'
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.usuario.is_active = False
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_CACHE_TTL=0)
+    def test_sin_ttl_consulta_la_base(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_logout_revoca_el_token(self):
+        self.client.get(self.url)
+        response = self.client.post('/api/usuarios/logout/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class GruposPorRolTestCase(APITestCase):
+    def setUp(self):
+        grupos.olvidar()
+
+    def test_grupo_solo_se_sincroniza_si_cambia_el_rol(self):
+        usuario = Usuario.objects.create_user(username='rol', password='x', rol='recepcionista')
+        self.assertEqual(list(usuario.groups.values_list('name', flat=True)), ['recepcionista'])
+
+        usuario = Usuario.objects.get(pk=usuario.pk)
+        with self.assertNumQueries(1):
+            usuario.save(update_fields=['last_login'])
+
+        usuario.rol = 'gerente'
+        usuario.save()
+        self.assertEqual(list(usuario.groups.values_list('name', flat=True)), ['gerente'])
+
+    def test_carga_masiva_asigna_grupos(self):
+        admin = Usuario.objects.create_user(username='admin', password='x', rol='administrador')
+        self.client.force_authenticate(admin)
+        filas = [
+            {'username': 'recep1', 'password': 'clave-1', 'rol': 'recepcionista'},
+            {'username': 'gerente1', 'rol': 'gerente'},
+            {'username': 'admin', 'password': 'x', 'rol': 'gerente'},
+        ]
+        # SAVEPOINT/RELEASE, usernames existentes, INSERT de usuarios, un SELECT por grupo e INSERT en la intermedia
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/usuarios/bulk/', filas, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['creados'], 2)
+        self.assertEqual(response.data['errores'][0]['fila'], 2)
+
+        recep = Usuario.objects.get(username='recep1')
+        self.assertTrue(recep.check_password('clave-1'))
+        self.assertTrue(recep.is_staff)
+        self.assertEqual(list(recep.groups.values_list('name', flat=True)), ['recepcionista'])
+        self.assertFalse(Usuario.objects.get(username='gerente1').has_usable_password())
@@ -1,6 +1,14 @@
-from rest_framework import viewsets, permissions, filters
+from django.contrib.auth.hashers import make_password
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from backend.campos import CamposMixin
+from backend.carga_masiva import CargaMasivaMixin
+from . import grupos
+from .autenticacion import olvidar_tokens
 from .models import Usuario
-from .serializers import UsuarioSerializer
+from .serializers import UsuarioSerializer, UsuarioCargaMasivaSerializer
 from rest_framework.permissions import AllowAny
 from drf_spectacular.utils import extend_schema
 
@@ -13,12 +21,57 @@ class IsAdminUserOnly(permissions.BasePermission):
         return bool(user and user.is_authenticated and (user.is_superuser or getattr(user, 'rol', None) == 'administrador'))
 
 @extend_schema(tags=['Usuarios'])
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(CamposMixin, CargaMasivaMixin, viewsets.ModelViewSet):
     queryset = Usuario.objects.all().order_by('username')
     serializer_class = UsuarioSerializer
+    bulk_serializer_class = UsuarioCargaMasivaSerializer
 
     def get_permissions(self):
         permission_classes = [permissions.IsAuthenticated]
         if self.action == 'create':
             permission_classes = [AllowAny]
+        elif self.action == 'bulk':
+            permission_classes = [permissions.IsAuthenticated, IsAdminUserOnly]
         return [perm() for perm in permission_classes]
+
+    def resolver_lote(self, validas, resultado):
+        """
+        Un username usado por otro usuario (en la base o antes en la carga) es
+        error. Las contraseñas se guardan con hash y el rol fija is_staff e
+        is_superuser como en Usuario.save.
+        """
+        usernames = {datos['username'] for _, _, datos in validas if 'username' in datos}
+        duenos = dict(Usuario.objects.filter(username__in=usernames).values_list('username', 'id'))
+        aceptadas, vistos = [], set()
+        for fila, pk, datos in validas:
+            username = datos.get('username')
+            if username in vistos or duenos.get(username, pk) != pk:
+                error = {'username': ['Ya existe un usuario con este username.']}
+                resultado['errores'].append({'fila': fila, 'errores': error})
+                continue
+            vistos.add(username)
+            if 'password' in datos or pk is None:
+                datos = {**datos, 'password': make_password(datos.get('password'))}
+            aceptadas.append((fila, pk, datos))
+
+        nuevos, actualizados, campos = super().resolver_lote(aceptadas, resultado)
+        for usuario in (*nuevos, *actualizados):
+            usuario.aplicar_rol()
+        if 'rol' in campos:
+            campos = sorted({*campos, 'is_staff', 'is_superuser'})
+        return nuevos, actualizados, campos
+
+    def despues_del_lote(self, nuevos, actualizados, campos):
+        # bulk_create/bulk_update no pasan por Usuario.save ni sus señales
+        grupos.asignar_grupos(nuevos)
+        if actualizados:
+            if 'rol' in campos:
+                grupos.asignar_grupos(actualizados, reemplazar=True)
+            olvidar_tokens(*Token.objects.filter(user__in=actualizados).values_list('key', flat=True))
+
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """Revoca el token con el que se autenticó la petición (y su entrada en caché)."""
+        if request.auth is not None:
+            Token.objects.filter(key=request.auth.key).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,60 @@
+import functools
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from rest_framework import exceptions, permissions
+from rest_framework.utils.encoders import JSONEncoder
+
+from app.usuarios.autenticacion import ausuario_de_token
+
+
+def respuesta_json(datos, status=200, headers=None):
+    """JsonResponse con el mismo codificador que los renderers de DRF."""
+    return JsonResponse(datos, status=status, headers=headers, encoder=JSONEncoder, safe=False,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+async def autenticar_token(request):
+    """
+    Equivalente async de CachedTokenAuthentication: `Authorization: Token <clave>`.
+    Devuelve el usuario o None si no hay cabecera; lanza AuthenticationFailed
+    si el token no es válido.
+    """
+    partes = request.headers.get('Authorization', '').split()
+    if not partes or partes[0].lower() != 'token':
+        return None
+    if len(partes) != 2:
+        raise exceptions.AuthenticationFailed('Cabecera de token inválida.')
+    usuario, _ = await ausuario_de_token(partes[1])
+    return usuario
+
+
+def vista_async(*permission_classes):
+    """
+    Decorador para vistas async de solo lectura (Django puro, sin DRF): autentica
+    por token y aplica las mismas clases de permiso que las vistas DRF.
+    """
+    permisos = permission_classes or (permissions.IsAuthenticated,)
+
+    def decorador(vista):
+        @functools.wraps(vista)
+        async def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return respuesta_json({'detail': f'Método "{request.method}" no permitido.'}, status=405)
+            try:
+                usuario = await autenticar_token(request)
+            except exceptions.AuthenticationFailed as exc:
+                return respuesta_json({'detail': str(exc.detail)}, status=401)
+            # Solo token: el usuario de sesión de AuthenticationMiddleware se resuelve
+            # con una consulta síncrona
+            request.user = usuario or AnonymousUser()
+
+            for permiso in permisos:
+                if not permiso().has_permission(request, None):
+                    if not request.user.is_authenticated:
+                        return respuesta_json({'detail': 'Las credenciales de autenticación no se proveyeron.'},
+                                              status=401)
+                    return respuesta_json({'detail': 'No tiene permiso para realizar esta acción.'}, status=403)
+            return await vista(request, *args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,155 @@
+import functools
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+from backend import senales
+
+# Cabeceras de la respuesta original que se guardan junto con los datos
+CABECERAS_CACHEADAS = ('Link', 'X-Total-Count')
+
+_estadisticas = {'aciertos': 0, 'fallos': 0, 'invalidaciones': 0}
+_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPUESTAS_CACHE_ALIAS', 'default')]
+
+
+def _sumar(clave):
+    with _lock:
+        _estadisticas[clave] += 1
+
+
+def estadisticas():
+    with _lock:
+        return dict(_estadisticas)
+
+
+# Versiones por modelo
+
+def _clave_version(modelo):
+    return f'respuestas:version:{modelo._meta.label_lower}'
+
+
+def versiones(*modelos):
+    """
+    Versión actual de cada modelo. Si la clave no existe (caché vacía o
+    desalojada) se inicializa con la hora actual para no reutilizar nunca una
+    versión anterior.
+    """
+    cache = _cache()
+    claves = [_clave_version(m) for m in modelos]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, time.time_ns(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def _clave_modificado(modelo):
+    return f'respuestas:modificado:{modelo._meta.label_lower}'
+
+
+def modificados(*modelos):
+    """
+    Momento (time.time()) de la última escritura en cada modelo. Si no se
+    conoce (caché vacía o desalojada) se toma el actual.
+    """
+    cache = _cache()
+    claves = [_clave_modificado(m) for m in modelos]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, time.time(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def invalidar(*modelos):
+    """Incrementa la versión de los modelos: invalida toda respuesta que dependa de ellos."""
+    cache = _cache()
+    for modelo in modelos:
+        clave = _clave_version(modelo)
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.set(clave, time.time_ns(), timeout=None)
+        cache.set(_clave_modificado(modelo), time.time(), timeout=None)
+        _sumar('invalidaciones')
+
+
+def invalidar_al_confirmar(*modelos):
+    """
+    Invalida ahora y otra vez al confirmar la transacción: una lectura
+    concurrente entre la escritura y el commit podría haber guardado los datos
+    viejos con la versión nueva.
+    """
+    invalidar(*modelos)
+    transaction.on_commit(lambda: invalidar(*modelos))
+
+
+def _invalidar_por_senal(sender, **kwargs):
+    if senales.suspendidas():
+        return
+    invalidar_al_confirmar(sender)
+
+
+def conectar_invalidacion(*modelos):
+    """Invalida las respuestas dependientes en cada post_save/post_delete del modelo."""
+    for modelo in modelos:
+        uid = f'respuestas-cache-{modelo._meta.label_lower}'
+        post_save.connect(_invalidar_por_senal, sender=modelo, dispatch_uid=uid)
+        post_delete.connect(_invalidar_por_senal, sender=modelo, dispatch_uid=uid)
+
+
+# Decorador para acciones de ViewSet
+
+def clave_respuesta(request, modelos):
+    usuario = request.user
+    rol = 'superusuario' if getattr(usuario, 'is_superuser', False) else getattr(usuario, 'rol', '') or ''
+    parametros = sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k))
+    partes = [request.path, repr(parametros), rol, *map(str, versiones(*modelos))]
+    return 'respuestas:' + hashlib.sha1('|'.join(partes).encode()).hexdigest()
+
+
+def cache_respuesta(*modelos):
+    """
+    Guarda en caché los datos de una acción GET de un ViewSet. La clave combina
+    la ruta, los parámetros normalizados, el rol del usuario y la versión de
+    cada modelo del que depende la respuesta, así que una escritura en esos
+    modelos (ver `conectar_invalidacion`) deja de servir las entradas viejas.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            timeout = getattr(settings, 'RESPUESTAS_CACHE_TIMEOUT', 300)
+            if not timeout:
+                return metodo(self, request, *args, **kwargs)
+
+            cache = _cache()
+            clave = clave_respuesta(request, modelos)
+            guardada = cache.get(clave)
+            if guardada is not None:
+                _sumar('aciertos')
+                datos, cabeceras = guardada
+                respuesta = Response(datos, headers=cabeceras)
+                respuesta['X-Cache'] = 'HIT'
+                return respuesta
+
+            _sumar('fallos')
+            respuesta = metodo(self, request, *args, **kwargs)
+            if respuesta.status_code == 200 and isinstance(respuesta, Response):
+                cabeceras = {c: respuesta[c] for c in CABECERAS_CACHEADAS if respuesta.has_header(c)}
+                cache.set(clave, (respuesta.data, cabeceras), timeout)
+            respuesta['X-Cache'] = 'MISS'
+            return respuesta
+        return envoltura
+    return decorador
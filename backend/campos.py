@@ -0,0 +1,94 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from backend.relaciones import IdInversoField
+
+
+def _lista(valor):
+    return [nombre.strip() for nombre in (valor or '').split(',') if nombre.strip()]
+
+
+class CamposMixin:
+    """
+    Mixin para ViewSets: en las lecturas, `?fields=a,b` devuelve solo esos
+    campos y `?exclude=c` todos menos esos. Además de recortar el serializer,
+    la consulta pide con .only() solo las columnas que usan los campos que
+    quedan: viajan menos datos desde la base, se construyen objetos más
+    livianos y la respuesta pesa menos.
+    """
+
+    def campos_visibles(self):
+        """Nombres de los campos pedidos, o None si la petición no los filtra."""
+        if getattr(self, 'request', None) is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        if not hasattr(self, '_campos_visibles'):
+            self._campos_visibles = self._leer_campos()
+        return self._campos_visibles
+
+    def _campos_serializer(self):
+        if not hasattr(self, '_campos_del_serializer'):
+            self._campos_del_serializer = self.get_serializer_class()().fields
+        return self._campos_del_serializer
+
+    def _leer_campos(self):
+        incluir = _lista(self.request.query_params.get('fields'))
+        excluir = _lista(self.request.query_params.get('exclude'))
+        if not incluir and not excluir:
+            return None
+        disponibles = [nombre for nombre, campo in self._campos_serializer().items() if not campo.write_only]
+        desconocidos = (set(incluir) | set(excluir)) - set(disponibles)
+        if desconocidos:
+            raise serializers.ValidationError(
+                {'fields': [f'Campos desconocidos: {", ".join(sorted(desconocidos))}.']}
+            )
+        return [nombre for nombre in disponibles if (not incluir or nombre in incluir) and nombre not in excluir]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        visibles = self.campos_visibles()
+        if visibles is not None:
+            campos = serializer.child.fields if isinstance(serializer, serializers.ListSerializer) else serializer.fields
+            for nombre in [nombre for nombre in campos if nombre not in visibles]:
+                campos.pop(nombre)
+        return serializer
+
+    def get_queryset(self):
+        return self.proyectar(super().get_queryset())
+
+    def proyectar(self, queryset):
+        """Aplica .only() con las columnas de los campos visibles (también para acciones propias)."""
+        visibles = self.campos_visibles()
+        columnas = visibles is not None and self._columnas(queryset.model, visibles)
+        if not columnas:
+            return queryset
+        relaciones = queryset.query.select_related
+        if isinstance(relaciones, dict):
+            # Una relación diferida no se puede traer con select_related
+            necesarias = [relacion for relacion in relaciones if relacion in columnas]
+            queryset = queryset.select_related(None)
+            if necesarias:
+                queryset = queryset.select_related(*necesarias)
+        return queryset.only(*columnas)
+
+    def _columnas(self, modelo, visibles):
+        """
+        Campos del modelo que leen los campos visibles, o None si alguno no se
+        puede deducir (p. ej. un SerializerMethodField): entonces no se proyecta.
+        """
+        campos = self._campos_serializer()
+        columnas = {modelo._meta.pk.name}
+        for nombre in visibles:
+            campo = campos[nombre]
+            if isinstance(campo, IdInversoField):
+                # Anotación de RelacionesMixin, no es una columna
+                continue
+            if campo.source == '*':
+                return None
+            try:
+                campo_modelo = modelo._meta.get_field(campo.source.split('.')[0])
+            except FieldDoesNotExist:
+                return None
+            if not campo_modelo.concrete or campo_modelo.many_to_many:
+                return None
+            columnas.add(campo_modelo.name)
+        return columnas
@@ -0,0 +1,131 @@
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.response import Response
+
+from backend.cache import invalidar_al_confirmar
+
+
+class NDJSONParser(BaseParser):
+    """
+    Un objeto JSON por línea. El texto se lee línea a línea, pero las filas se
+    acumulan en una lista: la lectura se corta con un error apenas se supera
+    CARGA_MASIVA_MAXIMO, sin decodificar el resto de una carga demasiado grande.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        maximo = getattr(settings, 'CARGA_MASIVA_MAXIMO', 10000)
+        filas = []
+        for numero, linea in enumerate(stream, start=1):
+            linea = linea.decode(encoding).strip()
+            if not linea:
+                continue
+            if len(filas) >= maximo:
+                raise ParseError(f'La carga admite como máximo {maximo} filas.')
+            try:
+                filas.append(json.loads(linea))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON inválido en la línea {numero}: {exc}')
+        return filas
+
+
+class CargaMasivaMixin:
+    """
+    Agrega `POST <recurso>/bulk/` a un ModelViewSet: recibe una lista JSON o
+    NDJSON, valida cada fila con el serializer del recurso por lotes y escribe
+    con bulk_create/bulk_update dentro de una transacción.
+
+    Las filas con `id` actualizan el registro existente. La respuesta informa
+    cuántos registros se crearon/actualizaron y los errores por fila (índice
+    dentro de la carga).
+    """
+    bulk_serializer_class = None
+    tamano_lote = 1000
+
+    def get_bulk_serializer_class(self):
+        return self.bulk_serializer_class or self.get_serializer_class()
+
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        filas = request.data
+        if not isinstance(filas, list):
+            return Response({'error': 'Se esperaba una lista JSON o un flujo NDJSON de objetos.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        maximo = getattr(settings, 'CARGA_MASIVA_MAXIMO', 10000)
+        if len(filas) > maximo:
+            return Response({'error': f'La carga admite como máximo {maximo} filas.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        modelo = self.get_queryset().model
+        resultado = {'creados': 0, 'actualizados': 0, 'omitidos': 0, 'errores': []}
+        try:
+            with transaction.atomic():
+                for inicio in range(0, len(filas), self.tamano_lote):
+                    lote = enumerate(filas[inicio:inicio + self.tamano_lote], start=inicio)
+                    validas = self.validar_lote(lote, resultado['errores'])
+                    nuevos, actualizados, campos = self.resolver_lote(validas, resultado)
+
+                    modelo.objects.bulk_create(nuevos, batch_size=self.tamano_lote)
+                    if actualizados:
+                        modelo.objects.bulk_update(actualizados, campos, batch_size=self.tamano_lote)
+                    self.despues_del_lote(nuevos, actualizados, campos)
+                    resultado['creados'] += len(nuevos)
+                    resultado['actualizados'] += len(actualizados)
+                # bulk_create/bulk_update no emiten señales
+                if resultado['creados'] or resultado['actualizados']:
+                    invalidar_al_confirmar(modelo)
+        except IntegrityError:
+            return Response({'error': 'Conflicto con datos escritos en paralelo. Reintente la carga.'},
+                            status=status.HTTP_409_CONFLICT)
+
+        resultado['errores'].sort(key=lambda e: e['fila'])
+        escritos = resultado['creados'] + resultado['actualizados'] + resultado['omitidos']
+        codigo = status.HTTP_400_BAD_REQUEST if resultado['errores'] and not escritos else status.HTTP_200_OK
+        return Response(resultado, status=codigo)
+
+    def validar_lote(self, lote, errores):
+        serializer_class = self.get_bulk_serializer_class()
+        contexto = self.get_serializer_context()
+        validas = []
+        for fila, datos in lote:
+            if not isinstance(datos, dict):
+                errores.append({'fila': fila, 'errores': {'non_field_errors': ['Se esperaba un objeto.']}})
+                continue
+            serializer = serializer_class(data=datos, context=contexto)
+            if serializer.is_valid():
+                validas.append((fila, datos.get('id'), serializer.validated_data))
+            else:
+                errores.append({'fila': fila, 'errores': serializer.errors})
+        return validas
+
+    def resolver_lote(self, validas, resultado):
+        """
+        Decide qué filas válidas se crean y cuáles actualizan un registro.
+        Devuelve (nuevos, actualizados, campos a actualizar).
+        """
+        modelo = self.get_queryset().model
+        existentes = modelo.objects.in_bulk([pk for _, pk, _ in validas if pk is not None])
+        nuevos, actualizados, campos = [], [], set()
+        for fila, pk, datos in validas:
+            if pk is None:
+                nuevos.append(modelo(**datos))
+                continue
+            objeto = existentes.get(pk) if isinstance(pk, int) else None
+            if objeto is None:
+                resultado['errores'].append({'fila': fila, 'errores': {'id': [f'No existe el registro {pk}.']}})
+                continue
+            for campo, valor in datos.items():
+                setattr(objeto, campo, valor)
+            campos.update(datos)
+            actualizados.append(objeto)
+        return nuevos, actualizados, sorted(campos)
+
+    def despues_del_lote(self, nuevos, actualizados, campos):
+        """Escrituras relacionadas de un lote ya guardado (p. ej. tablas intermedias)."""
@@ -0,0 +1,108 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from backend.cache import modificados, versiones
+
+
+def _activo():
+    return getattr(settings, 'RESPUESTAS_CONDICIONALES', False)
+
+
+def _sin_debil(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _segundo_cerrado(modificado):
+    """
+    Last-Modified (en segundos, redondeado hacia arriba) o None si el segundo
+    de la última escritura todavía no terminó: otra escritura en ese mismo
+    segundo no cambiaría la fecha y el cliente recibiría un 304 con datos viejos.
+    """
+    segundos = math.ceil(modificado)
+    return segundos if time.time() >= segundos else None
+
+
+class CondicionalMixin:
+    """
+    Mixin para ViewSets: GET condicional en list y retrieve. El ETag (fuerte)
+    resume la ruta, los parámetros del listado, el formato y la versión de cada
+    modelo de `modelos_condicionales` (backend/cache.py); Last-Modified es la
+    última escritura en esos modelos. Si el cliente ya tiene la versión actual
+    (If-None-Match o If-Modified-Since) se responde 304 antes de consultar la
+    base o serializar. En PUT/PATCH, If-Match con otro ETag responde 412.
+
+    El ETag del detalle no incluye los parámetros: es el mismo con o sin
+    ?fields=, y sirve para If-Match. Las versiones son por modelo, no por
+    fila: cualquier escritura en la colección cambia el ETag de todos sus
+    detalles.
+    """
+    modelos_condicionales = ()
+
+    def get_modelos_condicionales(self):
+        return self.modelos_condicionales or (self.queryset.model,)
+
+    def validadores(self, request, con_parametros=True):
+        """(ETag, momento de la última modificación) de la representación pedida."""
+        modelos = self.get_modelos_condicionales()
+        parametros = (sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k))
+                      if con_parametros else [])
+        formato = getattr(getattr(request, 'accepted_renderer', None), 'format', '')
+        partes = [request.path, repr(parametros), formato, *map(str, versiones(*modelos))]
+        etag = '"' + hashlib.sha1('|'.join(partes).encode()).hexdigest() + '"'
+        return etag, max(modificados(*modelos))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validadores = None
+        if not _activo() or request.method not in ('GET', 'HEAD') or self.action not in ('list', 'retrieve'):
+            return
+        etag, modificado = self.validadores(request, con_parametros=self.action == 'list')
+        self._validadores = etag, segundos = etag, _segundo_cerrado(modificado)
+        if self._no_modificado(request, etag, segundos):
+            # dispatch() busca el handler después de initial(): no se ejecuta la acción
+            setattr(self, request.method.lower(), self.no_modificado)
+
+    @staticmethod
+    def _no_modificado(request, etag, segundos):
+        if 'If-None-Match' in request.headers:
+            pedidos = parse_etags(request.headers['If-None-Match'])
+            return '*' in pedidos or etag in map(_sin_debil, pedidos)
+        desde = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return desde is not None and segundos is not None and segundos <= desde
+
+    def no_modificado(self, request, *args, **kwargs):
+        return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validadores = getattr(self, '_validadores', None)
+        if validadores and response.status_code in (200, 304):
+            etag, segundos = validadores
+            response['ETag'] = etag
+            if segundos is not None:
+                response['Last-Modified'] = http_date(segundos)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        if not _activo() or 'If-Match' not in request.headers:
+            return super().update(request, *args, **kwargs)
+        with transaction.atomic():
+            # Con la fila bloqueada, dos escrituras con el mismo ETag no pueden pasar ambas:
+            # la segunda lee la versión que incrementó la primera
+            lookup = self.lookup_url_kwarg or self.lookup_field
+            bloqueadas = self.queryset.model._default_manager.select_for_update()
+            list(bloqueadas.filter(**{self.lookup_field: kwargs[lookup]}).values_list('pk', flat=True))
+            pedidos = parse_etags(request.headers['If-Match'])
+            if '*' not in pedidos and self.validadores(request, con_parametros=False)[0] not in pedidos:
+                return Response(
+                    {'error': 'El recurso cambió desde la última lectura (If-Match).'},
+                    status=status.HTTP_412_PRECONDITION_FAILED
+                )
+            return super().update(request, *args, **kwargs)
@@ -0,0 +1,258 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _campo_modelo(modelo, ruta):
+    """
+    (campo del modelo al final de `ruta` a__b, True si el valor puede ser NULL).
+    Para una anotación u otra expresión: (None, True).
+    """
+    campo, anulable = None, False
+    try:
+        for parte in ruta.split('__'):
+            if modelo is None:
+                return None, True
+            campo = modelo._meta.get_field(parte)
+            anulable = anulable or campo.null
+            modelo = campo.related_model
+    except FieldDoesNotExist:
+        return None, True
+    return campo, anulable
+
+
+def _a_json(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+class PaginacionCursor(BasePagination):
+    """
+    Paginación por conjunto de claves (keyset) sobre el orden del queryset de
+    cada ViewSet (`-fecha_inicio`, `-fecha`, `nombre`, ...) con desempate por `id`.
+
+    La posición viaja en un cursor opaco y se traduce en un WHERE sobre las
+    columnas del orden, así que la página 1000 cuesta lo mismo que la primera.
+    El cuerpo sigue siendo una lista; los enlaces van en la cabecera `Link`
+    (rel="next"/"prev") y el total solo se calcula con `?count=true`
+    (cabecera `X-Total-Count`).
+
+    Los parámetros se leen de `request.GET` para aceptar tanto el Request de
+    DRF como el HttpRequest de las vistas async.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE or 100
+        self.max_page_size = getattr(settings, 'PAGINACION_MAXIMA', 1000)
+
+    # Orden
+
+    def get_ordering(self, queryset):
+        ordering = [
+            'id' if campo == 'pk' else '-id' if campo == '-pk' else campo
+            for campo in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(campo, str)
+        ]
+        if not ordering:
+            return ['id']
+        if 'id' not in ordering and '-id' not in ordering:
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+    def _orden(self, campo, anulable):
+        descendente = campo.startswith('-') != self.reverso
+        nombre = campo.lstrip('-')
+        if not anulable:
+            return f'-{nombre}' if descendente else nombre
+        # Cada base ordena los NULL distinto: se fijan al final del recorrido hacia adelante
+        nulos = {'nulls_first': True} if self.reverso else {'nulls_last': True}
+        return F(nombre).desc(**nulos) if descendente else F(nombre).asc(**nulos)
+
+    def _atributo(self, campo, campo_modelo):
+        ruta = campo.lstrip('-').split('__')
+        if campo_modelo is not None and campo_modelo.is_relation and campo_modelo.concrete:
+            ruta[-1] = campo_modelo.attname
+        return attrgetter('.'.join(ruta))
+
+    def _posicion(self, fila):
+        if isinstance(fila, dict):
+            return [_a_json(fila[campo.lstrip('-')]) for campo in self.ordering]
+        posicion = []
+        for campo, (campo_modelo, _) in zip(self.ordering, self.campos):
+            try:
+                valor = self._atributo(campo, campo_modelo)(fila)
+            except AttributeError:
+                # Relación intermedia en NULL
+                valor = None
+            posicion.append(_a_json(valor))
+        return posicion
+
+    def _filtro(self, posicion, reverso):
+        # (a > x) OR (a = x AND b > y) OR ... respetando el sentido de cada columna.
+        # En las columnas anulables los NULL van después de todo valor (ver _orden).
+        condiciones = Q()
+        iguales = Q()
+        for campo, valor, (_, anulable) in zip(self.ordering, posicion, self.campos):
+            nombre = campo.lstrip('-')
+            lookup = 'gt' if campo.startswith('-') == reverso else 'lt'
+            if valor is None:
+                paso = Q(**{f'{nombre}__isnull': False}) if reverso else None
+                igual = Q(**{f'{nombre}__isnull': True})
+            else:
+                paso = Q(**{f'{nombre}__{lookup}': valor})
+                if anulable and not reverso:
+                    paso |= Q(**{f'{nombre}__isnull': True})
+                igual = Q(**{nombre: valor})
+            if paso is not None:
+                condiciones |= iguales & paso
+            iguales &= igual
+        return condiciones
+
+    # Cursor
+
+    def encode_cursor(self, posicion, reverso):
+        datos = json.dumps({'p': posicion, 'r': int(reverso)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(datos.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.GET.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            datos = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            posicion, reverso = datos['p'], bool(datos['r'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound('Cursor inválido')
+        if not isinstance(posicion, list) or len(posicion) != len(self.ordering):
+            raise NotFound('Cursor inválido')
+        # Un cursor alterado puede traer valores que la base rechazaría (500)
+        try:
+            posicion = [self._convertir(campo, valor) for campo, valor in zip(self.campos, posicion)]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound('Cursor inválido')
+        return posicion, reverso
+
+    @staticmethod
+    def _convertir(campo, valor):
+        """Valor del cursor como lo espera la columna del orden (to_python)."""
+        campo_modelo, anulable = campo
+        if valor is None:
+            if not anulable:
+                raise ValueError('NULL en una columna que no lo admite')
+            return None
+        if campo_modelo is None:
+            # Anotación u otra expresión: el valor se usa tal cual
+            return valor
+        if campo_modelo.is_relation:
+            campo_modelo = campo_modelo.target_field
+        return campo_modelo.to_python(valor)
+
+    def get_page_size(self, request):
+        try:
+            tamano = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(tamano, self.max_page_size))
+
+    # API de DRF
+
+    def paginate_queryset(self, queryset, request, view=None):
+        consulta = self.preparar(queryset, request)
+        if self.contar:
+            self.count = queryset.count()
+        return self.recortar(list(consulta))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Versión para vistas async: mismas reglas, consultas con el ORM asíncrono."""
+        consulta = self.preparar(queryset, request)
+        if self.contar:
+            self.count = await queryset.acount()
+        return self.recortar([fila async for fila in consulta])
+
+    def preparar(self, queryset, request):
+        """Lee cursor y tamaño de página y devuelve la consulta de la página (sin ejecutar)."""
+        self.request = request
+        # Los enlaces no arrastran ?count=: las páginas siguientes no cuentan
+        self.base_url = remove_query_param(
+            remove_query_param(request.build_absolute_uri(), self.cursor_query_param),
+            self.count_query_param
+        )
+        self.ordering = self.get_ordering(queryset)
+        self.campos = [_campo_modelo(queryset.model, campo.lstrip('-')) for campo in self.ordering]
+        self.page_size = self.get_page_size(request)
+        self.posicion, self.reverso = self.decode_cursor(request)
+        self.contar = request.GET.get(self.count_query_param) in ('1', 'true')
+        self.count = None
+
+        if self.posicion is not None:
+            queryset = queryset.filter(self._filtro(self.posicion, self.reverso))
+        orden = [self._orden(campo, anulable) for campo, (_, anulable) in zip(self.ordering, self.campos)]
+        return queryset.order_by(*orden)[:self.page_size + 1]
+
+    def recortar(self, resultados):
+        hay_mas = len(resultados) > self.page_size
+        resultados = resultados[:self.page_size]
+        if self.reverso:
+            resultados.reverse()
+
+        hay_siguiente = hay_mas if not self.reverso else self.posicion is not None
+        hay_anterior = hay_mas if self.reverso else self.posicion is not None
+        self.siguiente = self._posicion(resultados[-1]) if resultados and hay_siguiente else None
+        self.anterior = self._posicion(resultados[0]) if resultados and hay_anterior else None
+        return resultados
+
+    def get_next_link(self):
+        return self.encode_cursor(self.siguiente, False) if self.siguiente else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.anterior, True) if self.anterior else None
+
+    def cabeceras(self):
+        enlaces = []
+        siguiente, anterior = self.get_next_link(), self.get_previous_link()
+        if siguiente:
+            enlaces.append(f'<{siguiente}>; rel="next"')
+        if anterior:
+            enlaces.append(f'<{anterior}>; rel="prev"')
+
+        headers = {}
+        if enlaces:
+            headers['Link'] = ', '.join(enlaces)
+        if self.count is not None:
+            headers['X-Total-Count'] = str(self.count)
+        return headers
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.cabeceras())
+
+    def get_paginated_response_schema(self, schema):
+        return schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': self.cursor_query_param, 'required': False, 'in': 'query',
+             'description': 'Cursor opaco tomado de la cabecera Link', 'schema': {'type': 'string'}},
+            {'name': self.page_size_query_param, 'required': False, 'in': 'query',
+             'description': f'Tamaño de página (máximo {self.max_page_size})', 'schema': {'type': 'integer'}},
+            {'name': self.count_query_param, 'required': False, 'in': 'query',
+             'description': 'true para incluir el total en X-Total-Count', 'schema': {'type': 'boolean'}},
+        ]
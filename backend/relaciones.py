@@ -0,0 +1,58 @@
+from django.db.models import OuterRef, Subquery
+from rest_framework import serializers
+
+
+class IdInversoField(serializers.Field):
+    """
+    Id del primer objeto de `modelo` que apunta al objeto serializado a través
+    de la FK `campo` (relación inversa).
+
+    Las vistas con RelacionesMixin lo traen como anotación en la misma consulta;
+    si el objeto no viene anotado (p. ej. recién creado) se consulta aparte.
+    """
+
+    def __init__(self, modelo, campo, **kwargs):
+        self.modelo = modelo
+        self.campo = campo
+        kwargs['read_only'] = True
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def subquery(self):
+        return Subquery(
+            self.modelo.objects.filter(**{self.campo: OuterRef('pk')}).order_by('pk').values('pk')[:1]
+        )
+
+    def to_representation(self, obj):
+        if self.field_name in obj.__dict__:
+            return obj.__dict__[self.field_name]
+        return self.modelo.objects.filter(**{self.campo: obj}).order_by('pk').values_list('pk', flat=True).first()
+
+
+def anotar_relaciones(queryset, serializer_class, nombres=None):
+    """Anota en el queryset cada IdInversoField declarado en el serializer (o solo los de `nombres`)."""
+    anotaciones = {
+        nombre: campo.subquery()
+        for nombre, campo in serializer_class._declared_fields.items()
+        if isinstance(campo, IdInversoField) and (nombres is None or nombre in nombres)
+    }
+    return queryset.annotate(**anotaciones) if anotaciones else queryset
+
+
+class RelacionesMixin:
+    """
+    Mixin para ViewSets que trae las relaciones que usa el serializer en la
+    misma consulta del listado, evitando una consulta extra por fila.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        # Con CamposMixin solo se anotan los campos pedidos
+        nombres = self.campos_visibles() if hasattr(self, 'campos_visibles') else None
+        return anotar_relaciones(queryset, self.get_serializer_class(), nombres)
@@ -0,0 +1,24 @@
+import threading
+from contextlib import contextmanager
+
+_estado = threading.local()
+
+
+@contextmanager
+def suspender():
+    """
+    Desactiva, en el hilo actual, los receptores que mantienen datos derivados
+    (caché de respuestas, proyección de habitaciones, ingresos diarios). Lo usan
+    los procesos en bloque que mueven filas sin cambiar su significado, como el
+    archivado, y que actualizan lo derivado una vez por lote.
+    """
+    anterior = suspendidas()
+    _estado.suspendidas = True
+    try:
+        yield
+    finally:
+        _estado.suspendidas = anterior
+
+
+def suspendidas():
+    return getattr(_estado, 'suspendidas', False)
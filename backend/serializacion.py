@@ -0,0 +1,167 @@
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend.relaciones import IdInversoField
+
+try:
+    import orjson
+except ImportError:  # opcional: sin orjson se usa el JSONRenderer de DRF
+    orjson = None
+
+# Campos cuyo to_representation devuelve el valor leído de la base tal cual
+IDENTIDAD = (serializers.CharField, serializers.ChoiceField, serializers.IntegerField, serializers.BooleanField)
+
+
+def _ruta(modelo, atributos):
+    """Ruta de .values() para la fuente de un campo, o None si no es una columna (o cruza una relación múltiple)."""
+    for posicion, atributo in enumerate(atributos):
+        try:
+            campo = modelo._meta.get_field(atributo)
+        except FieldDoesNotExist:
+            return None
+        if campo.many_to_many or campo.one_to_many:
+            return None
+        if posicion < len(atributos) - 1:
+            if not campo.is_relation:
+                return None
+            modelo = campo.related_model
+        elif not campo.concrete and not campo.one_to_one:
+            return None
+    return '__'.join(atributos)
+
+
+def _conversor(campo):
+    """Función valor -> representación equivalente a campo.to_representation (None si es la identidad)."""
+    if isinstance(campo, (IdInversoField, serializers.PrimaryKeyRelatedField)):
+        return None if getattr(campo, 'pk_field', None) is None else campo.pk_field.to_representation
+    if type(campo) in IDENTIDAD or isinstance(campo, (serializers.EmailField, serializers.SlugField)):
+        return None
+    if isinstance(campo, serializers.DecimalField) and _decimal_simple(campo):
+        # La base ya devuelve el Decimal con decimal_places: solo falta el texto
+        exponente = -campo.decimal_places
+        to_representation = campo.to_representation
+        return lambda valor: (format(valor, 'f') if isinstance(valor, Decimal) and valor.as_tuple().exponent == exponente
+                              else to_representation(valor))
+    if isinstance(campo, serializers.DateField) and not isinstance(campo, serializers.DateTimeField):
+        if (getattr(campo, 'format', api_settings.DATE_FORMAT) or '').lower() == 'iso-8601':
+            return lambda valor: valor.isoformat()
+    return campo.to_representation
+
+
+def _decimal_simple(campo):
+    return (getattr(campo, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            and campo.decimal_places is not None and not campo.localize
+            and not getattr(campo, 'normalize_output', False))
+
+
+class SerializadorCompilado:
+    """
+    Versión de solo lectura de un ModelSerializer para listados grandes: lee
+    filas de .values() y arma cada dict con un conversor por campo calculado
+    una sola vez, sin instanciar modelos ni recorrer los campos del serializer
+    por fila. La salida es la misma que `serializer.data`.
+    """
+
+    def __init__(self, columnas):
+        # (nombre en la respuesta, clave en la fila de .values(), conversor o None)
+        self.columnas = columnas
+        self.rutas = list(dict.fromkeys(ruta for _, ruta, _ in columnas))
+
+    def consulta(self, queryset):
+        """values() con las columnas del serializer y las del orden (las usa la paginación)."""
+        orden = [campo.lstrip('-') for campo in queryset.query.order_by if isinstance(campo, str)]
+        extra = [campo for campo in (queryset.model._meta.pk.name, *orden) if campo not in self.rutas and campo != 'pk']
+        return queryset.values(*self.rutas, *dict.fromkeys(extra))
+
+    def representar(self, filas):
+        columnas = self.columnas
+        return [
+            {
+                nombre: valor if conversor is None or valor is None else conversor(valor)
+                for nombre, ruta, conversor in columnas
+                for valor in (fila[ruta],)
+            }
+            for fila in filas
+        ]
+
+
+def compilar(serializer):
+    """SerializadorCompilado para una instancia de ModelSerializer, o None si algún campo no se puede compilar."""
+    modelo = serializer.Meta.model
+    columnas = []
+    for nombre, campo in serializer.fields.items():
+        if campo.write_only:
+            continue
+        if isinstance(campo, IdInversoField):
+            # Anotación de RelacionesMixin con el mismo nombre que el campo
+            columnas.append((nombre, nombre, None))
+            continue
+        if campo.source == '*' or isinstance(campo, (serializers.BaseSerializer, serializers.ManyRelatedField,
+                                                      serializers.SerializerMethodField)):
+            return None
+        ruta = _ruta(modelo, campo.source_attrs)
+        if ruta is None:
+            return None
+        columnas.append((nombre, ruta, _conversor(campo)))
+    return SerializadorCompilado(columnas)
+
+
+# clave -> SerializadorCompilado (o None), por proceso
+_compilados = {}
+
+
+def obtener_compilado(clave, crear_serializer):
+    """compilar() una sola vez por `clave` (p. ej. clase del serializer y campos pedidos)."""
+    if clave not in _compilados:
+        _compilados[clave] = compilar(crear_serializer())
+    return _compilados[clave]
+
+
+class ListadoRapidoMixin:
+    """
+    Mixin para ViewSets: `list` usa el SerializadorCompilado del serializer de
+    la vista (con los campos de CamposMixin, si aplica). Si el serializer no se
+    puede compilar se usa el camino normal de DRF.
+    """
+
+    def get_serializador_compilado(self):
+        visibles = self.campos_visibles() if hasattr(self, 'campos_visibles') else None
+        clave = (self.get_serializer_class(), tuple(visibles) if visibles is not None else None)
+        return obtener_compilado(clave, lambda: self.get_serializer(many=True).child)
+
+    def list(self, request, *args, **kwargs):
+        compilado = self.get_serializador_compilado()
+        if compilado is None:
+            return super().list(request, *args, **kwargs)
+        filas = compilado.consulta(self.filter_queryset(self.get_queryset()))
+        pagina = self.paginate_queryset(filas)
+        if pagina is not None:
+            return self.get_paginated_response(compilado.representar(pagina))
+        return Response(compilado.representar(filas))
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """
+    JSONRenderer que codifica con orjson si está instalado. Escribe el mismo
+    JSON que el de DRF (compacto, UTF-8): fechas, Decimal y demás tipos que
+    orjson escribiría distinto pasan por el codificador de DRF. Con indentación
+    (API navegable, ?indent) o si orjson rechaza el dato, usa el de DRF.
+    """
+    _codificador = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            contenido = orjson.dumps(data, default=self._codificador.default,
+                                     option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Igual que DRF: separadores de línea y párrafo escapados (JSON embebido en JavaScript)
+        return contenido.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import dj_database_url
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'app.reportes',
     'app.reservas',
     'app.usuarios',
+    'app.monitoreo',
     'rest_framework',
     'drf_yasg',
     'corsheaders',
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'app.monitoreo.middleware.PerfiladoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -90,6 +92,12 @@ CORS_ALLOW_METHODS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Cabeceras de paginación legibles desde el frontend
+CORS_EXPOSE_HEADERS = [
+    "link",
+    "x-total-count",
+]
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -112,16 +120,44 @@ AUTH_USER_MODEL = 'usuarios.Usuario'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'app.usuarios.autenticacion.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend']
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson si está instalado (ver backend/serializacion.py); la API navegable sigue disponible
+    'DEFAULT_RENDERER_CLASSES': [
+        'backend.serializacion.JSONRapidoRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'backend.paginacion.PaginacionCursor',
+    'PAGE_SIZE': config('PAGE_SIZE', default=100, cast=int),
 }
 
+# Tamaño máximo que un cliente puede pedir con ?page_size=
+PAGINACION_MAXIMA = config('PAGINACION_MAXIMA', default=1000, cast=int)
+
+# Reintentos del flujo de reserva ante bloqueos o fallos de serialización (app/reservas/servicios.py)
+RESERVAS_MAX_INTENTOS = config('RESERVAS_MAX_INTENTOS', default=5, cast=int)
+RESERVAS_ESPERA_BASE = config('RESERVAS_ESPERA_BASE', default=0.02, cast=float)
+
+# Archivo frío (app/reservas/archivo.py): `archivar_historicos` mueve a ReservaHistorica y
+# PagoHistorico lo que terminó hace más de ARCHIVO_DIAS días
+ARCHIVO_DIAS = config('ARCHIVO_DIAS', default=730, cast=int)
+
+# Filas admitidas por petición en los endpoints /bulk/
+CARGA_MASIVA_MAXIMO = config('CARGA_MASIVA_MAXIMO', default=10000, cast=int)
+
+# Resultados máximos de ?search= en clientes cuando se usa el índice en memoria (sin pg_trgm)
+BUSQUEDA_CLIENTES_MAXIMO = config('BUSQUEDA_CLIENTES_MAXIMO', default=200, cast=int)
+# Sin caché compartida, cada worker recarga ese índice cada BUSQUEDA_INDICE_TTL segundos:
+# es lo que tarda en aparecer un cliente creado en otro worker. Con caché compartida se
+# recarga al cambiar la versión de Cliente.
+BUSQUEDA_INDICE_TTL = config('BUSQUEDA_INDICE_TTL', default=60, cast=int)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'API Sistema Reserva Hotel',
     'DESCRIPTION': 'Documentación de la API REST',
@@ -145,20 +181,106 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
 
 LOGIN_URL = '/admin/login/'
 
+# Correos de reservas: se encolan en Notificacion y los envía `manage.py enviar_notificaciones`
+NOTIFICACIONES_DESTINATARIOS = config(
+    'NOTIFICACIONES_DESTINATARIOS', default='jloorm2003@gmail.com,jloorm4@gmail.com', cast=Csv()
+)
+NOTIFICACIONES_LOTE = config('NOTIFICACIONES_LOTE', default=50, cast=int)
+NOTIFICACIONES_MAX_INTENTOS = config('NOTIFICACIONES_MAX_INTENTOS', default=5, cast=int)
+NOTIFICACIONES_ESPERA_BASE = config('NOTIFICACIONES_ESPERA_BASE', default=60, cast=int)
+NOTIFICACIONES_ESPERA_MAXIMA = config('NOTIFICACIONES_ESPERA_MAXIMA', default=3600, cast=int)
+# Segundos que un worker se reserva un lote mientras lo envía; si muere, vuelve a la cola
+NOTIFICACIONES_ARRIENDO = config('NOTIFICACIONES_ARRIENDO', default=600, cast=int)
+
+# Motor de disponibilidad en memoria (app/habitaciones/disponibilidad.py).
+# Cada worker mantiene su propio índice. Con caché compartida lo recarga cuando otro
+# proceso escribe una reserva; con locmem solo cada DISPONIBILIDAD_TTL segundos, y hasta
+# entonces /disponibles puede ofrecer habitaciones que otro worker ya reservó
+# (crear_reserva las rechaza igual al revalidar con bloqueo).
+DISPONIBILIDAD_EN_MEMORIA = config('DISPONIBILIDAD_EN_MEMORIA', default=False, cast=bool)
+DISPONIBILIDAD_TTL = config('DISPONIBILIDAD_TTL', default=300, cast=int)
+
+# Rango máximo (días) de /api/habitaciones/ocupacion/
+OCUPACION_MAXIMO_DIAS = config('OCUPACION_MAXIMO_DIAS', default=731, cast=int)
+
+# Caché. CACHE_BACKEND acepta 'locmem', 'file' o la ruta de cualquier backend de Django
+# (p. ej. django.core.cache.backends.redis.RedisCache con CACHE_LOCATION=redis://...).
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+# locmem es por proceso: cada worker de gunicorn (y cada comando de cron) tiene su
+# propia caché y no ve las invalidaciones de los demás. Lo que debe ser coherente
+# entre procesos se desactiva por defecto sin una caché compartida (file, redis...).
+CACHE_COMPARTIDA = CACHE_BACKEND != 'locmem'
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        'LOCATION': config(
+            'CACHE_LOCATION',
+            default=str(BASE_DIR / '.cache') if CACHE_BACKEND == 'file' else 'hotel'
+        ),
+    }
+}
+
+# Perfilado de peticiones (app/monitoreo): latencia y consultas SQL por endpoint.
+# Desactivado, el middleware se descarta al arrancar.
+PERFILADO_ACTIVO = config('PERFILADO_ACTIVO', default=False, cast=bool)
+PERFILADO_TAMANO = config('PERFILADO_TAMANO', default=5000, cast=int)
+PERFILADO_ARCHIVO = config('PERFILADO_ARCHIVO', default='')
+
+# Respuestas de catálogo en caché (backend/cache.py). 0 desactiva la caché de respuestas.
+# Con locmem un worker seguiría sirviendo listados viejos tras una escritura en otro.
+RESPUESTAS_CACHE_TIMEOUT = config('RESPUESTAS_CACHE_TIMEOUT', default=300 if CACHE_COMPARTIDA else 0, cast=int)
+
+# GET condicional (ETag / Last-Modified, backend/condicional.py) en habitaciones, reservas
+# y clientes. Las versiones viven en la caché: con locmem un worker podría responder 304
+# con datos viejos.
+RESPUESTAS_CONDICIONALES = config('RESPUESTAS_CONDICIONALES', default=CACHE_COMPARTIDA, cast=bool)
+
+# Segundos que CachedTokenAuthentication (app/usuarios/autenticacion.py) recuerda
+# el usuario y el rol de cada token. 0 consulta la base en cada petición. Con locmem
+# un logout o un cambio de rol solo se vería en el worker que lo atendió.
+TOKEN_CACHE_TTL = config('TOKEN_CACHE_TTL', default=300 if CACHE_COMPARTIDA else 0, cast=int)
+
 WSGI_APPLICATION = 'backend.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Pool de conexiones nativo de Django 5 (psycopg 3 + psycopg_pool), uno por proceso.
+# Cada worker de gunicorn atiende GUNICORN_THREADS peticiones a la vez, así que
+# DB_POOL_MAX no necesita ser mayor; el total en el servidor es
+# WEB_CONCURRENCY * DB_POOL_MAX y debe quedar por debajo de max_connections.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN = config('DB_POOL_MIN', default=2, cast=int)
+DB_POOL_MAX = config('DB_POOL_MAX', default=config('GUNICORN_THREADS', default=4, cast=int), cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+DB_POOL_MAX_IDLE = config('DB_POOL_MAX_IDLE', default=300, cast=float)
+DB_POOL_MAX_LIFETIME = config('DB_POOL_MAX_LIFETIME', default=3600, cast=float)
+
 DATABASES = {
     'default': dj_database_url.config(
         default=config('DATABASE_URL'),
-        conn_max_age=600,
-        ssl_require=True
+        # Con pool las conexiones no se mantienen por hilo (Django lo exige)
+        conn_max_age=0 if DB_POOL else config('DB_CONN_MAX_AGE', default=600, cast=int),
+        # Verifica la conexión antes de reutilizarla (también al tomarla del pool)
+        conn_health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        ssl_require=config('DB_SSL_REQUIRE', default=True, cast=bool)
     )
 }
 
+if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': DB_POOL_MIN,
+        'max_size': DB_POOL_MAX,
+        'timeout': DB_POOL_TIMEOUT,
+        'max_idle': DB_POOL_MAX_IDLE,
+        'max_lifetime': DB_POOL_MAX_LIFETIME,
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
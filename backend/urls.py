@@ -18,6 +18,9 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from rest_framework.authtoken.views import obtain_auth_token
+from app.habitaciones import views_async as habitaciones_async
+from app.reservas import views_async as reservas_async
+from app.reportes import views_async as reportes_async
 
 
 urlpatterns = [
@@ -34,6 +37,13 @@ urlpatterns = [
     path('api/pagos/', include('app.pagos.urls')),
     path('api/usuarios/', include('app.usuarios.urls')),
     path('api/reportes/', include('app.reportes.urls')),
+    path('api/monitoreo/', include('app.monitoreo.urls')),
+
+    # Lecturas async (ASGI, p. ej. uvicorn backend.asgi:application)
+    path('api/async/habitaciones/disponibles/', habitaciones_async.disponibles),
+    path('api/async/reservas/', reservas_async.listar_reservas),
+    path('api/async/reportes/reservas/', reportes_async.reporte_reservas),
+    path('api/async/reportes/ingresos/', reportes_async.reporte_ingresos),
 
     # Login token
     path('api/api-token-auth/', obtain_auth_token, name='api_token_auth'),
@@ -0,0 +1,28 @@
+# Configuración de gunicorn: `gunicorn backend.wsgi` la toma de este archivo.
+# Los mismos valores dimensionan el pool de conexiones (ver DB_POOL_* en backend/settings.py).
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recicla los workers de a poco para no reiniciarlos todos a la vez
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# Sin preload: cada worker crea su propio pool después del fork y nunca
+# comparte sockets de PostgreSQL con el proceso maestro.
+preload_app = False
+
+
+def worker_exit(server, worker):
+    # Cierra el pool del worker para liberar las conexiones en el servidor
+    from django.db import connections
+
+    for conexion in connections.all(initialized_only=True):
+        if getattr(conexion, 'pool', None):
+            conexion.close_pool()